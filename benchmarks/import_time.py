@@ -0,0 +1,106 @@
+"""
+Benchmark for the time to import :mod:`msdss_base_database` and its classes.
+
+Each import is timed in a new Python process, so that modules cached by earlier imports do not hide the cost, and the median time of the repeated runs is reported.
+An import fails the benchmark if it loads a module that should only be imported on first use, such as ``pandas``, or if its median time is above ``--max-seconds``.
+
+Examples
+--------
+Run the import benchmarks::
+
+    python benchmarks/import_time.py
+
+Fail if any import takes longer than half a second::
+
+    python benchmarks/import_time.py --max-seconds 0.5
+
+Author
+------
+Richard Wen <rrwen.dev@gmail.com>
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+IMPORT_STATEMENTS = {
+    'package': ('import msdss_base_database', ['pandas', 'sqlalchemy', 'msdss_base_dotenv']),
+    'Database': ('from msdss_base_database import Database', ['pandas', 'sqlalchemy.ext.asyncio', 'msdss_base_dotenv']),
+    'AsyncDatabase': ('from msdss_base_database import AsyncDatabase', ['pandas', 'msdss_base_dotenv']),
+    'DatabaseDotEnv': ('from msdss_base_database import DatabaseDotEnv', ['pandas', 'sqlalchemy']),
+    'ShardedDatabase': ('from msdss_base_database import ShardedDatabase', ['pandas', 'sqlalchemy'])
+}
+IMPORT_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+print(json.dumps(dict(seconds=seconds, loaded=[m for m in {forbidden} if m in sys.modules])))
+'''
+
+def measure(statement, forbidden, repeat):
+    """
+    Time an import statement in new Python processes.
+
+    Parameters
+    ----------
+    statement : str
+        Import statement to run.
+    forbidden : list(str)
+        Names of modules that should not be loaded by the statement.
+    repeat : int
+        Number of runs.
+
+    Returns
+    -------
+    dict
+        Dictionary with the ``median``, ``min``, and ``max`` seconds of the runs, and the ``loaded`` forbidden modules.
+    """
+    script = IMPORT_SCRIPT.format(statement=statement, forbidden=repr(forbidden))
+    times = []
+    loaded = set()
+    for _ in range(repeat):
+        result = json.loads(subprocess.run([sys.executable, '-c', script], check=True, capture_output=True, text=True).stdout)
+        times.append(result['seconds'])
+        loaded.update(result['loaded'])
+    out = dict(median=statistics.median(times), min=min(times), max=max(times), loaded=sorted(loaded))
+    return out
+
+def main(argv=None):
+    """
+    Run the import benchmarks from the command line.
+
+    Parameters
+    ----------
+    argv : list(str) or None
+        Command line arguments. If ``None``, uses ``sys.argv``.
+
+    Returns
+    -------
+    int
+        Exit status, which is ``1`` if any import loaded a forbidden module or took longer than ``--max-seconds``, and ``0`` otherwise.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the import time of msdss-base-database.')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs of each import')
+    parser.add_argument('--max-seconds', type=float, help='median seconds that an import can take before it fails')
+    args = parser.parse_args(argv)
+
+    # (main_run) Run and display the import benchmarks
+    out = 0
+    for name, (statement, forbidden) in IMPORT_STATEMENTS.items():
+        result = measure(statement, forbidden, args.repeat)
+        print(name + ': median ' + str(round(result['median'], 4)) + 's, min ' + str(round(result['min'], 4)) + 's, max ' + str(round(result['max'], 4)) + 's')
+
+        # (main_check) Fail on forbidden modules or slow imports
+        if len(result['loaded']) > 0:
+            print('  loaded ' + ', '.join(result['loaded']) + ' on import')
+            out = 1
+        if args.max_seconds is not None and result['median'] > args.max_seconds:
+            print('  slower than ' + str(args.max_seconds) + 's')
+            out = 1
+    return out
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,345 @@
+"""
+Benchmarks for the insert, select, update, and delete paths of :class:`msdss_base_database.core.Database`.
+
+Each benchmark is run on tables of each size for each database target, and the median time of the repeated runs is reported.
+Results can be saved as JSON and compared against a baseline file from a previous run to find regressions.
+
+Examples
+--------
+Run the default benchmarks against SQLite files and in-memory databases::
+
+    python benchmarks/run.py
+
+Save results as a baseline, then compare a later run against it::
+
+    python benchmarks/run.py --sizes 1000 100000 --output baseline.json
+    python benchmarks/run.py --sizes 1000 100000 --baseline baseline.json --tolerance 0.2
+
+Include the local PostgreSQL test database (see ``DEVELOPER.md``)::
+
+    python benchmarks/run.py --targets sqlite_file sqlite_memory postgresql
+
+Author
+------
+Richard Wen <rrwen.dev@gmail.com>
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas
+import sqlalchemy
+
+from msdss_base_database import Database
+from msdss_base_database.defaults import DEFAULT_SUPPORTED_OPERATORS
+
+BENCHMARK_TABLE = 'msdss_benchmark'
+BENCHMARK_SINGLE_TABLE = 'msdss_benchmark_single'
+BENCHMARK_COLUMNS = [
+    dict(name='id', type_='Integer', primary_key=True),
+    ('column_one', 'String'),
+    ('column_two', 'Integer'),
+    ('column_three', 'Float')
+]
+BENCHMARK_SIZES = [1000, 100000, 1000000]
+BENCHMARK_SINGLE_ROWS = 500
+BENCHMARK_TARGETS = ['sqlite_file', 'sqlite_memory']
+BENCHMARK_WHERE = {
+    '=': ('column_two', '=', 500),
+    '!=': ('column_two', '!=', 500),
+    '>': ('column_two', '>', 900),
+    '>=': ('column_two', '>=', 900),
+    '<': ('column_two', '<', 100),
+    '<=': ('column_two', '<=', 100),
+    'LIKE': ('column_one', 'LIKE', 'value_1%'),
+    'NOTLIKE': ('column_one', 'NOTLIKE', 'value_1%'),
+    'ILIKE': ('column_one', 'ILIKE', 'VALUE_1%'),
+    'NOTILIKE': ('column_one', 'NOTILIKE', 'VALUE_1%'),
+    'CONTAINS': ('column_one', 'CONTAINS', '_1'),
+    'STARTSWITH': ('column_one', 'STARTSWITH', 'value_1'),
+    'ENDSWITH': ('column_one', 'ENDSWITH', '9')
+}
+
+def get_data(start, stop):
+    """
+    Get benchmark rows with ids from ``start`` up to but not including ``stop``.
+
+    Parameters
+    ----------
+    start : int
+        First id.
+    stop : int
+        Id after the last id.
+
+    Returns
+    -------
+    dict
+        Dictionary of column names and lists of values.
+    """
+    ids = range(start, stop)
+    out = {
+        'id': list(ids),
+        'column_one': ['value_' + str(i % 100) for i in ids],
+        'column_two': [i % 1000 for i in ids],
+        'column_three': [i / 7 for i in ids]
+    }
+    return out
+
+def get_database(target, directory):
+    """
+    Connect to a database target.
+
+    Parameters
+    ----------
+    target : str
+        One of ``sqlite_file``, ``sqlite_memory``, or ``postgresql``. The ``postgresql`` target uses the default connection settings and environment variables of :class:`msdss_base_database.core.Database`.
+    directory : str
+        Directory for the ``sqlite_file`` database.
+
+    Returns
+    -------
+    :class:`msdss_base_database.core.Database`
+        Database for the target.
+    """
+    sqlite = dict(driver='sqlite', user=None, password=None, host=None, port=None, load_env=False)
+    if target == 'sqlite_file':
+        path = os.path.join(directory, 'benchmark.db')
+        if os.path.exists(path):
+            os.remove(path)
+        out = Database(database=path, **sqlite)
+    elif target == 'sqlite_memory':
+        out = Database(database=':memory:', **sqlite)
+    elif target == 'postgresql':
+        out = Database()
+    else:
+        raise ValueError(str(target) + ' is not supported')
+    return out
+
+def measure(func, repeat):
+    """
+    Time the runs of a function.
+
+    Parameters
+    ----------
+    func : func
+        Function that takes the run number starting at ``0`` and returns the number of rows processed or ``None``.
+    repeat : int
+        Number of runs.
+
+    Returns
+    -------
+    dict
+        Dictionary with the ``median``, ``min``, and ``max`` seconds of the runs, and the ``rows`` of the last run.
+    """
+    times = []
+    for run in range(repeat):
+        start = time.perf_counter()
+        rows = func(run)
+        times.append(time.perf_counter() - start)
+    out = dict(median=statistics.median(times), min=min(times), max=max(times), rows=rows)
+    return out
+
+def run_size(db, size, repeat):
+    """
+    Run the benchmarks for one table size.
+
+    Parameters
+    ----------
+    db : :class:`msdss_base_database.core.Database`
+        Database to run the benchmarks on.
+    size : int
+        Number of rows in the benchmark table.
+    repeat : int
+        Number of runs of each benchmark.
+
+    Returns
+    -------
+    dict
+        Dictionary of benchmark names and timing results from :func:`measure`.
+    """
+    out = {}
+
+    # (run_size_insert_single) Insert single rows into an empty table
+    single = min(size, BENCHMARK_SINGLE_ROWS)
+    for table in [BENCHMARK_SINGLE_TABLE, BENCHMARK_TABLE]:
+        if db.has_table(table):
+            db.drop_table(table)
+    db.create_table(BENCHMARK_SINGLE_TABLE, BENCHMARK_COLUMNS)
+    def insert_single(run):
+        for i in range(run * single, (run + 1) * single):
+            db.insert(BENCHMARK_SINGLE_TABLE, get_data(i, i + 1))
+        return single
+    out['insert_single'] = measure(insert_single, repeat)
+    db.drop_table(BENCHMARK_SINGLE_TABLE)
+
+    # (run_size_insert_bulk) Insert all rows at once into a new table
+    data = get_data(0, size)
+    def insert_bulk(run):
+        if db.has_table(BENCHMARK_TABLE):
+            db.drop_table(BENCHMARK_TABLE)
+        db.create_table(BENCHMARK_TABLE, BENCHMARK_COLUMNS)
+        return db.insert(BENCHMARK_TABLE, data)['rows']
+    out['insert_bulk'] = measure(insert_bulk, repeat)
+
+    # (run_size_select) Select all rows and filtered rows for each operator
+    out['select_all'] = measure(lambda run: len(db.select(BENCHMARK_TABLE)), repeat)
+    for operator in dict.fromkeys(DEFAULT_SUPPORTED_OPERATORS):
+        where = BENCHMARK_WHERE[operator]
+        out['select_where_' + operator.lower()] = measure(lambda run: len(db.select(BENCHMARK_TABLE, where=where)), repeat)
+    out['select_group_by'] = measure(lambda run: len(db.select(
+        BENCHMARK_TABLE,
+        select='column_one',
+        group_by='column_one',
+        aggregate=['column_two', 'column_three'],
+        aggregate_func=['sum', 'avg']
+    )), repeat)
+
+    # (run_size_update) Update the same rows in each run
+    def update(run):
+        db.update(BENCHMARK_TABLE, where=('column_two', '<', 100), values={'column_one': 'updated_' + str(run)})
+    out['update'] = measure(update, repeat)
+
+    # (run_size_delete) Delete a different slice of rows in each run, up to a tenth of the rows in total
+    chunk = max(1, size // (10 * repeat))
+    def delete(run):
+        db.delete(BENCHMARK_TABLE, where=[('id', '>=', run * chunk), ('id', '<', (run + 1) * chunk)])
+        return chunk
+    out['delete'] = measure(delete, repeat)
+    db.drop_table(BENCHMARK_TABLE)
+    return out
+
+def run(targets=BENCHMARK_TARGETS, sizes=BENCHMARK_SIZES, repeat=3):
+    """
+    Run the benchmarks for each target and size.
+
+    Parameters
+    ----------
+    targets : list(str)
+        List of database targets. See :func:`get_database`.
+    sizes : list(int)
+        List of benchmark table sizes.
+    repeat : int
+        Number of runs of each benchmark.
+
+    Returns
+    -------
+    dict
+        Dictionary with keys ``meta`` for the environment and ``results`` for a list of dicts with keys ``target``, ``size``, ``benchmark``, ``median``, ``min``, ``max``, and ``rows``.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for target in targets:
+
+            # (run_connect) Skip targets that cannot be connected to
+            try:
+                db = get_database(target, directory)
+                db.has_table(BENCHMARK_TABLE)
+            except (ImportError, sqlalchemy.exc.OperationalError) as error:
+                print('Skipping ' + target + ': ' + str(error).splitlines()[0], file=sys.stderr)
+                continue
+
+            # (run_sizes) Run benchmarks for each size
+            for size in sizes:
+                print('Running ' + target + ' with ' + str(size) + ' rows', file=sys.stderr)
+                for benchmark, timing in run_size(db, size, repeat).items():
+                    results.append(dict(target=target, size=size, benchmark=benchmark, **timing))
+            db._connection.dispose()
+
+    # (run_return) Add environment details to the results
+    meta = dict(
+        created=datetime.datetime.now().isoformat(),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        pandas=pandas.__version__,
+        sqlalchemy=sqlalchemy.__version__,
+        repeat=repeat
+    )
+    out = dict(meta=meta, results=results)
+    return out
+
+def compare(results, baseline, tolerance=0.2):
+    """
+    Compare benchmark results against a baseline.
+
+    Parameters
+    ----------
+    results : dict
+        Results from :func:`run`.
+    baseline : dict
+        Results from a previous :func:`run`.
+    tolerance : float
+        Fraction that the median time can increase by before it is a regression.
+
+    Returns
+    -------
+    list(dict)
+        List of comparisons for benchmarks in both results, with keys ``target``, ``size``, ``benchmark``, ``baseline``, ``median``, ``ratio``, and ``regression``.
+    """
+    previous = {(r['target'], r['size'], r['benchmark']):r['median'] for r in baseline['results']}
+    out = []
+    for r in results['results']:
+        key = (r['target'], r['size'], r['benchmark'])
+        if key in previous:
+            ratio = r['median'] / previous[key] if previous[key] > 0 else None
+            out.append(dict(target=key[0], size=key[1], benchmark=key[2], baseline=previous[key], median=r['median'], ratio=ratio, regression=ratio is not None and ratio > 1 + tolerance))
+    return out
+
+def main(argv=None):
+    """
+    Run the benchmarks from the command line.
+
+    Parameters
+    ----------
+    argv : list(str) or None
+        Command line arguments. If ``None``, uses ``sys.argv``.
+
+    Returns
+    -------
+    int
+        Exit status, which is ``1`` if any benchmark regressed from the baseline and ``0`` otherwise.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark msdss-base-database insert, select, update, and delete paths.')
+    parser.add_argument('--targets', nargs='+', default=BENCHMARK_TARGETS, choices=['sqlite_file', 'sqlite_memory', 'postgresql'], help='database targets to run')
+    parser.add_argument('--sizes', nargs='+', type=int, default=BENCHMARK_SIZES, help='number of rows in the benchmark table')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs of each benchmark')
+    parser.add_argument('--output', help='path of a JSON file to save the results to')
+    parser.add_argument('--baseline', help='path of a JSON file of previous results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='fraction that a median time can increase by before it is a regression')
+    args = parser.parse_args(argv)
+
+    # (main_run) Run and display the benchmarks
+    results = run(targets=args.targets, sizes=args.sizes, repeat=args.repeat)
+    table = pandas.DataFrame(results['results'])
+    if len(table) > 0:
+        table['rows_per_second'] = table['rows'] / table['median']
+    print(table.to_string(index=False))
+
+    # (main_output) Save the results
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    # (main_compare) Compare with the baseline and report regressions
+    out = 0
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        comparison = pandas.DataFrame(compare(results, baseline, tolerance=args.tolerance))
+        if len(comparison) > 0:
+            print('\nComparison with ' + args.baseline + ':\n')
+            print(comparison.to_string(index=False))
+            regressions = comparison[comparison['regression']]
+            if len(regressions) > 0:
+                print('\n' + str(len(regressions)) + ' benchmarks are slower than the baseline by more than ' + str(args.tolerance * 100) + '%')
+                out = 1
+    return out
+
+if __name__ == '__main__':
+    sys.exit(main())
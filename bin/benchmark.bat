@@ -0,0 +1,2 @@
+call bin\activate
+call python benchmarks/run.py %*
\ No newline at end of file
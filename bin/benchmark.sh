@@ -0,0 +1,2 @@
+source bin/activate.sh
+python benchmarks/run.py "$@"
\ No newline at end of file
@@ -8,4 +8,5 @@ chmod +x ./bin/remove_docs.sh
 chmod +x ./bin/install_package.sh
 chmod +x ./bin/uninstall_package.sh
 chmod +x ./bin/reinstall_package.sh
+chmod +x ./bin/benchmark.sh
 source bin/install_package.sh
\ No newline at end of file
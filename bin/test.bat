@@ -0,0 +1,2 @@
+call bin\activate
+call python -m pytest tests %*
\ No newline at end of file
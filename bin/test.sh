@@ -0,0 +1,2 @@
+source bin/activate.sh
+python -m pytest tests "$@"
\ No newline at end of file
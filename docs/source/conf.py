@@ -53,6 +53,7 @@ extensions = [
 ]
 intersphinx_mapping = {
     'pandas': ('https://pandas.pydata.org/pandas-docs/stable/', None),
+    'pyarrow': ('https://arrow.apache.org/docs/', None),
     'python': ('https://docs.python.org/3/', None),
     'sqlalchemy': ('https://docs.sqlalchemy.org/en/14/', None),
     'msdss_base_dotenv': ('https://rrwen.github.io/msdss-base-dotenv/', None)
@@ -1,2 +1,70 @@
-from .core import *
-from .env import DatabaseDotEnv
\ No newline at end of file
+import importlib
+
+__all__ = [
+    'AsyncDatabase',
+    'DEFAULT_DOTENV_KWARGS',
+    'DEFAULT_SUPPORTED_OPERATORS',
+    'Database',
+    'DatabaseDotEnv',
+    'DotEnv',
+    'Param',
+    'ShardedDatabase',
+    'core',
+    'defaults',
+    'env',
+    'get_database_url',
+    'pandas',
+    'sqlalchemy',
+    'tools'
+]
+
+_LAZY_MODULES = dict(
+    AsyncDatabase='.async_core',
+    DEFAULT_DOTENV_KWARGS='.defaults',
+    DEFAULT_SUPPORTED_OPERATORS='.defaults',
+    Database='.core',
+    DatabaseDotEnv='.env',
+    DotEnv='.env',
+    Param='.prepared',
+    ShardedDatabase='.sharded',
+    core='.core',
+    defaults='.defaults',
+    env='.env',
+    get_database_url='.tools',
+    pandas='pandas',
+    sqlalchemy='sqlalchemy',
+    tools='.tools'
+)
+
+def __getattr__(name):
+    """
+    Import the module of a package attribute on first use, so that importing the package does not import ``sqlalchemy``, ``pandas``, or the environment packages until needed.
+
+    Names other than those in ``__all__`` are looked up in :mod:`msdss_base_database.core`, as they were available from the package before.
+    Names of modules in ``__all__``, such as ``core`` and ``pandas``, return the module itself.
+
+    Author
+    ------
+    Richard Wen <rrwen.dev@gmail.com>
+    """
+    if name.startswith('_'):
+        raise AttributeError('module ' + __name__ + ' has no attribute ' + name)
+
+    # (init_getattr_module) Import the module for the name
+    module = importlib.import_module(_LAZY_MODULES.get(name, '.core'), __name__)
+    if name in globals(): # submodules imported with the module
+        return globals()[name]
+    if module.__name__.rpartition('.')[2] == name:
+        out = module
+    elif hasattr(module, name):
+        out = getattr(module, name)
+    else:
+        raise AttributeError('module ' + __name__ + ' has no attribute ' + name)
+
+    # (init_getattr_return) Keep the attribute on the package for later use
+    globals()[name] = out
+    return out
+
+def __dir__():
+    out = sorted(set(globals()) | set(_LAZY_MODULES))
+    return out
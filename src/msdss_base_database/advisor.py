@@ -0,0 +1,245 @@
+import threading
+
+from .defaults import *
+
+class IndexAdvisor:
+    """
+    Class for recording the columns that queries filter and sort by, to suggest indexes for them.
+
+    Each query pattern is identified by its query cache key (see :meth:`msdss_base_database.core.Database._prepare_query`), and has the candidate index columns:
+
+    * ``where`` columns compared with ``=``, which can be in any order in an index
+    * followed by the first ``where`` column compared with a range operator such as ``>`` or ``startswith``, since an index can only be searched by one range
+    * or if there is no range, followed by the ``group_by`` or ``order_by`` columns, so that rows are read from the index in order without sorting
+
+    Columns compared with operators that cannot use an index, such as ``!=``, ``contains``, or ``endswith``, are not included.
+
+    Parameters
+    ----------
+    max_patterns : int or None
+        Maximum number of query patterns to keep, where the least recently used pattern is removed first. If ``None``, all patterns are kept.
+
+    Attributes
+    ----------
+    max_patterns : int or None
+        Same as parameter ``max_patterns``.
+    _patterns : dict
+        Dictionary of query cache keys and dicts with keys ``table``, ``columns`` (candidate index columns), ``uses`` (number of queries), ``sql`` and ``params`` (the statement and parameter values of the most recent query).
+    _lock : :class:`threading.Lock`
+        Lock for updating the patterns across threads.
+
+    Author
+    ------
+    Richard Wen <rrwen.dev@gmail.com>
+
+    Example
+    -------
+    .. jupyter-execute::
+
+        from msdss_base_database.advisor import IndexAdvisor
+
+        advisor = IndexAdvisor()
+
+        # Record the columns of queries
+        advisor.record('key_a', 'test_table', where=[('column_one', '=', 'a'), ('column_two', '>', 2)])
+        advisor.record('key_a', 'test_table', where=[('column_one', '=', 'b'), ('column_two', '>', 4)])
+        advisor.record('key_b', 'test_table', order_by='column_two')
+
+        # Display candidate indexes
+        print(advisor.candidates())
+    """
+    def __init__(self, max_patterns=DEFAULT_ADVISOR_MAX_PATTERNS):
+        self.max_patterns = max_patterns
+        self._patterns = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_columns(where=None, group_by=None, order_by=None):
+        """
+        Get the candidate index columns for the filters and sorts of a query.
+
+        Parameters
+        ----------
+        where : list of list or list of tuple or None
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database._build_query`.
+        group_by : str or list(str) or None
+            See parameter ``group_by`` in :meth:`msdss_base_database.core.Database._build_query`.
+        order_by : str or list(str) or None
+            See parameter ``order_by`` in :meth:`msdss_base_database.core.Database._build_query`.
+
+        Returns
+        -------
+        tuple(str)
+            Candidate index columns in order, which is empty if an index would not help the query.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.advisor import IndexAdvisor
+
+            columns = IndexAdvisor._get_columns(where=[('column_two', '>', 2), ('column_one', '=', 'a')], order_by='id')
+            print(columns)
+        """
+        where = [where] if where is not None and not any(isinstance(w, list) or isinstance(w, tuple) for w in where) else where
+        group_by = [group_by] if isinstance(group_by, str) else group_by
+        order_by = [order_by] if isinstance(order_by, str) else order_by
+
+        # (IndexAdvisor_get_columns_where) Split where columns into equality and range comparisons
+        equal = []
+        ranges = []
+        for column, operator, _ in (where if where is not None else []):
+            operator = operator.lower()
+            if operator in DEFAULT_ADVISOR_EQUAL_OPERATORS and column not in equal:
+                equal.append(column)
+            elif operator in DEFAULT_ADVISOR_RANGE_OPERATORS and column not in ranges:
+                ranges.append(column)
+
+        # (IndexAdvisor_get_columns_order) Add one range column, or the grouped or sorted columns
+        if len(ranges) > 0:
+            after = [ranges[0]]
+        else:
+            after = group_by if group_by is not None else order_by if order_by is not None else []
+        out = tuple(equal + [c for c in after if c not in equal])
+        return out
+
+    def candidates(self, table=None, min_uses=1):
+        """
+        Get the candidate indexes of the recorded queries.
+
+        Parameters
+        ----------
+        table : str or None
+            Name of the table to get candidates for. If ``None``, candidates for all tables are returned.
+        min_uses : int
+            Minimum number of queries that would use a candidate index.
+
+        Returns
+        -------
+        list(dict)
+            List of candidates from most to least used, where each candidate is a dict with keys ``table``, ``columns``, ``uses``, and ``sql`` and ``params`` of the most recent query that would use it.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.advisor import IndexAdvisor
+
+            advisor = IndexAdvisor()
+            advisor.record('key_a', 'test_table', where=('column_one', '=', 'a'))
+            advisor.record('key_b', 'test_table', where=('column_one', '=', 'a'), order_by='id')
+            advisor.record('key_c', 'test_table', where=('column_one', 'contains', 'a'))
+            print(advisor.candidates(min_uses=2))
+        """
+        with self._lock:
+            patterns = list(self._patterns.values())
+
+        # (IndexAdvisor_candidates_group) Combine patterns with the same candidate columns
+        grouped = {}
+        for pattern in patterns:
+            if len(pattern['columns']) == 0 or (table is not None and pattern['table'] != table):
+                continue
+            key = (pattern['table'], pattern['columns'])
+            if key not in grouped:
+                grouped[key] = dict(table=pattern['table'], columns=pattern['columns'], uses=0, sql=None, params=None)
+            grouped[key]['uses'] += pattern['uses']
+            grouped[key].update(sql=pattern['sql'], params=pattern['params'])
+
+        # (IndexAdvisor_candidates_cover) Count the uses of candidates that are the leading columns of a longer one for the longer one
+        candidates = sorted(grouped.values(), key=lambda c: len(c['columns']))
+        covered = set()
+        for i, candidate in enumerate(candidates):
+            covering = [o for o in candidates[i + 1:] if o['table'] == candidate['table'] and len(o['columns']) > len(candidate['columns']) and o['columns'][:len(candidate['columns'])] == candidate['columns']]
+            if len(covering) > 0:
+                max(covering, key=lambda o: o['uses'])['uses'] += candidate['uses']
+                covered.add(i)
+
+        # (IndexAdvisor_candidates_return) Return candidates with enough uses from most to least used
+        out = [c for i, c in enumerate(candidates) if i not in covered and c['uses'] >= min_uses]
+        out = sorted(out, key=lambda c: -c['uses'])
+        return out
+
+    def record(self, key, table, where=None, group_by=None, order_by=None, sql=None, params=None):
+        """
+        Record a query.
+
+        The candidate index columns are only found the first time a query cache key is recorded, so recording queries with the same structure only counts them.
+
+        Parameters
+        ----------
+        key : tuple or str
+            Query cache key identifying the structure of the query.
+        table : str
+            Name of the table queried.
+        where : list of list or list of tuple or None
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database._build_query`.
+        group_by : str or list(str) or None
+            See parameter ``group_by`` in :meth:`msdss_base_database.core.Database._build_query`.
+        order_by : str or list(str) or None
+            See parameter ``order_by`` in :meth:`msdss_base_database.core.Database._build_query`.
+        sql : :class:`sqlalchemy:sqlalchemy.sql.expression.Select` or None
+            Statement of the query, used to check its plan with :meth:`msdss_base_database.core.Database._explain_query`.
+        params : dict or None
+            Parameter values of the statement.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.advisor import IndexAdvisor
+
+            advisor = IndexAdvisor()
+            advisor.record('key_a', 'test_table', where=('column_one', '=', 'a'))
+            print(advisor.candidates())
+        """
+        with self._lock:
+            pattern = self._patterns.pop(key, None)
+            if pattern is None:
+                pattern = dict(table=table, columns=self._get_columns(where=where, group_by=group_by, order_by=order_by), uses=0)
+            pattern.update(uses=pattern['uses'] + 1, sql=sql, params=params)
+            self._patterns[key] = pattern
+            if self.max_patterns is not None and len(self._patterns) > self.max_patterns:
+                del self._patterns[next(iter(self._patterns))]
+
+    def reset(self, table=None):
+        """
+        Remove the recorded queries.
+
+        Parameters
+        ----------
+        table : str or None
+            Name of the table to remove queries for, such as after creating an index. If ``None``, queries for all tables are removed.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.advisor import IndexAdvisor
+
+            advisor = IndexAdvisor()
+            advisor.record('key_a', 'test_table', where=('column_one', '=', 'a'))
+            advisor.reset('test_table')
+            print(advisor.candidates())
+        """
+        with self._lock:
+            if table is None:
+                self._patterns.clear()
+            else:
+                for key in [k for k, p in self._patterns.items() if p['table'] == table]:
+                    del self._patterns[key]
@@ -0,0 +1,1048 @@
+import contextlib
+import contextvars
+import sqlalchemy
+import time
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from .cache import *
+from .core import Database
+from .defaults import *
+from .prepared import *
+from .tools import *
+
+def _unsupported(name):
+    """
+    Create a method that raises an error for a :class:`msdss_base_database.core.Database` method that :class:`msdss_base_database.async_core.AsyncDatabase` does not support.
+
+    Parameters
+    ----------
+    name : str
+        Name of the method.
+
+    Returns
+    -------
+    func
+        Method that raises a ``NotImplementedError``, instead of calling the method of :class:`msdss_base_database.core.Database` with coroutines it does not await.
+
+    Author
+    ------
+    Richard Wen <rrwen.dev@gmail.com>
+    """
+    def method(self, *args, **kwargs):
+        raise NotImplementedError(name + ' is not supported for AsyncDatabase, use Database instead')
+    method.__name__ = name
+    method.__qualname__ = 'AsyncDatabase.' + name
+    method.__doc__ = 'Not supported. Use :meth:`msdss_base_database.core.Database.' + name + '` with a :class:`msdss_base_database.core.Database` instead.'
+    return method
+
+class AsyncDatabase(Database):
+    """
+    Class for MSDSS database management with ``asyncio``.
+
+    * Extends :class:`msdss_base_database.core.Database`
+    * Uses an :class:`sqlalchemy:sqlalchemy.ext.asyncio.AsyncEngine`, so that concurrent queries share one connection pool without blocking the event loop
+    * Methods that query the database are coroutines with the same parameters as :class:`msdss_base_database.core.Database`
+    * Methods of :class:`msdss_base_database.core.Database` that are not coroutines here, such as ``upsert``, ``select_in``, and ``explain``, raise a ``NotImplementedError``
+
+    Parameters
+    ----------
+    driver : str
+        The driver name of the database connection. If an async driver is not specified (e.g. ``postgresql`` instead of ``postgresql+asyncpg``), then one is chosen from:
+
+        .. jupyter-execute::
+            :hide-code:
+
+            from msdss_base_database.defaults import DEFAULT_ASYNC_DRIVERS
+            print('<driver> = <async driver>\\n')
+            for k, v in DEFAULT_ASYNC_DRIVERS.items():
+                print(k + ' = ' + v)
+
+    user : str
+        User name for the connection.
+    password : str
+        Password for the user.
+    host : str
+        Host address of the connection.
+    port : str
+        Port number of the connection.
+    database : str
+        Database name of the connection.
+    load_env : bool
+        Whether to load the environmental variables using parameter ``env`` or not.  The environment will only be loaded if the ``env_file`` exists.
+    env : :class:`msdss_base_database.env.DatabaseDotEnv` or None
+        An object to set environment variables related to database configuration. See :class:`msdss_base_database.core.Database`.
+    table_cache_size : int or None
+        See :class:`msdss_base_database.core.Database`.
+    table_cache_ttl : int or float or None
+        See :class:`msdss_base_database.core.Database`.
+    query_cache_size : int or None
+        See :class:`msdss_base_database.core.Database`.
+    pool : str or dict
+        See :class:`msdss_base_database.core.Database`.
+    *args, **kwargs
+        Additional arguments passed to :func:`sqlalchemy:sqlalchemy.ext.asyncio.create_async_engine`.
+
+    Attributes
+    ----------
+    _advisor : None
+        Queries are not recorded for index suggestions for async queries.
+    _connection : :class:`sqlalchemy:sqlalchemy.ext.asyncio.AsyncEngine`
+        The async database engine object from `sqlalchemy <https://www.sqlalchemy.org/>`_.
+    _literal_limit : bool
+        See :class:`msdss_base_database.core.Database`.
+    _metadata : :class:`sqlalchemy.schema.MetaData`
+        The metadata object from `sqlalchemy <https://www.sqlalchemy.org/>`_.
+    _pool_counters : dict
+        See :class:`msdss_base_database.core.Database`.
+    _pool_lock : :class:`threading.Lock`
+        See :class:`msdss_base_database.core.Database`.
+    _query_cache : :class:`msdss_base_database.cache.LRUCache`
+        See :class:`msdss_base_database.core.Database`.
+    _replicas : list
+        Read replicas are not used for async queries, so this is empty.
+    _result_cache : None
+        Query results are not cached for async queries.
+    _stats : None
+        Query stats are not recorded for async queries.
+    _table_cache : :class:`msdss_base_database.cache.LRUCache`
+        See :class:`msdss_base_database.core.Database`.
+    _transaction_connection : :class:`contextvars.ContextVar`
+        Context variable for the connection bound by :meth:`msdss_base_database.async_core.AsyncDatabase.transaction`.
+
+    Author
+    ------
+    Richard Wen <rrwen.dev@gmail.com>
+
+    Example
+    -------
+    .. jupyter-execute::
+
+        import asyncio
+        from msdss_base_database import AsyncDatabase
+
+        async def main():
+
+            # Initiate a connection with the default test user and database
+            db = AsyncDatabase()
+
+            # Check if the table exists and drop if it does
+            if await db.has_table("test_table"):
+                await db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            await db.create_table('test_table', columns)
+
+            # Write sample data
+            data = {
+                'id': [1, 2, 3],
+                'column_one': ['a', 'b', 'c'],
+                'column_two': [2, 4, 6]
+            }
+            await db.insert('test_table', data)
+
+            # Run queries concurrently
+            df, df_where = await asyncio.gather(
+                db.select('test_table'),
+                db.select('test_table', where=('column_two', '>', 2))
+            )
+
+            # Update and delete rows
+            await db.update('test_table', where=('id', '>', 1), values={'column_one': 'AA'})
+            await db.delete('test_table', where=('id', '=', 1))
+            df_update = await db.select('test_table')
+
+            # Stream rows in chunks
+            async for chunk in db.select_iter('test_table', chunksize=1):
+                print(chunk)
+
+            # Close connections
+            await db.dispose()
+
+            # Display results
+            print('\\ndf:\\n')
+            print(df)
+            print('\\ndf_where:\\n')
+            print(df_where)
+            print('\\ndf_update:\\n')
+            print(df_update)
+
+        asyncio.run(main())
+    """
+    def __init__(
+        self,
+        driver=DEFAULT_DOTENV_KWARGS['defaults']['driver'],
+        user=DEFAULT_DOTENV_KWARGS['defaults']['user'],
+        password=DEFAULT_DOTENV_KWARGS['defaults']['password'],
+        host=DEFAULT_DOTENV_KWARGS['defaults']['host'],
+        port=DEFAULT_DOTENV_KWARGS['defaults']['port'],
+        database=DEFAULT_DOTENV_KWARGS['defaults']['database'],
+        load_env=True,
+        env=None,
+        table_cache_size=DEFAULT_TABLE_CACHE_SIZE,
+        table_cache_ttl=DEFAULT_TABLE_CACHE_TTL,
+        query_cache_size=DEFAULT_QUERY_CACHE_SIZE,
+        pool=DEFAULT_POOL_PROFILE,
+        *args, **kwargs):
+
+        # (AsyncDatabase_connect_str) Build connection str from parameters
+        connection_str = get_database_url(
+            driver=driver,
+            user=user,
+            password=password,
+            host=host,
+            port=port,
+            database=database,
+            load_env=load_env,
+            env=env
+        )
+
+        # (AsyncDatabase_connect_driver) Use an async driver if one is not specified
+        url = sqlalchemy.engine.make_url(connection_str)
+        if '+' not in url.drivername and url.drivername in DEFAULT_ASYNC_DRIVERS:
+            url = url.set(drivername=DEFAULT_ASYNC_DRIVERS[url.drivername])
+
+        # (AsyncDatabase_connect_pool) Get pool settings, where create_async_engine kwargs take priority
+        kwargs = {**get_pool_kwargs(pool=pool, load_env=load_env, env=env), **kwargs}
+
+        # (AsyncDatabase_attr) Create attributes for database obj
+        self._connection = create_async_engine(url, *args, **kwargs)
+        self._listen_pool(self._connection.sync_engine)
+        self._listen_stats(self._connection.sync_engine, stats=False)
+        self._transaction_connection = contextvars.ContextVar('transaction_connection', default=None)
+        self._metadata = sqlalchemy.MetaData()
+        self._table_cache = LRUCache(max_size=table_cache_size, ttl=table_cache_ttl)
+        self._query_cache = LRUCache(max_size=query_cache_size)
+        self._literal_limit = self._connection.dialect.name in ('mssql', 'oracle')
+        self._set_result_cache(None)
+        self._advisor = None
+        self._replicas = []
+        self._read_your_writes = None
+        self._last_write = None
+
+    @contextlib.asynccontextmanager
+    async def _connect(self):
+        """
+        Get a connection from the connection pool in a transaction.
+
+        See :meth:`msdss_base_database.core.Database._connect`. If a transaction was started with :meth:`msdss_base_database.async_core.AsyncDatabase.transaction` in the current context, its connection is used instead.
+
+        Yields
+        ------
+        :class:`sqlalchemy:sqlalchemy.ext.asyncio.AsyncConnection`
+            A connection in a transaction.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import asyncio
+            import sqlalchemy
+            from msdss_base_database import AsyncDatabase
+
+            async def main():
+                db = AsyncDatabase()
+                async with db._connect() as connection:
+                    cursor = await connection.execute(sqlalchemy.text('SELECT 1'))
+                    print(cursor.scalar())
+                await db.dispose()
+
+            asyncio.run(main())
+        """
+
+        # (AsyncDatabase_connect_bound) Use the connection of the current transaction if available
+        connection = self._transaction_connection.get()
+        if connection is not None:
+            yield connection
+            return
+
+        # (AsyncDatabase_connect_wait) Check out a connection and record the wait
+        start = time.perf_counter()
+        connection = await self._connection.connect().start()
+        wait = time.perf_counter() - start
+        with self._pool_lock:
+            self._pool_counters['waits'] += 1
+            self._pool_counters['wait_seconds_total'] += wait
+            self._pool_counters['wait_seconds_max'] = max(self._pool_counters['wait_seconds_max'], wait)
+
+        # (AsyncDatabase_connect_yield) Yield the connection in a transaction
+        try:
+            async with connection.begin():
+                yield connection
+        finally:
+            await connection.close()
+
+    async def _execute_query(self, sql, *args, **kwargs):
+        """
+        Executes a query statement.
+
+        See :meth:`msdss_base_database.core.Database._execute_query`.
+
+        Parameters
+        ----------
+        sql : str or :class:`sqlalchemy:sqlalchemy.sql.expression.Executable`
+            Statement representing the query to execute.
+        *args, **kwargs
+            Additional parameters passed to :meth:`sqlalchemy:sqlalchemy.ext.asyncio.AsyncConnection.execute`.
+
+        Returns
+        -------
+        :class:`sqlalchemy:sqlalchemy.engine.CursorResult`
+            Buffered cursor result from query.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import asyncio
+            import sqlalchemy
+            from msdss_base_database import AsyncDatabase
+
+            async def main():
+                db = AsyncDatabase()
+                cursor = await db._execute_query(sqlalchemy.text('SELECT 1'))
+                print(cursor.scalar())
+                await db.dispose()
+
+            asyncio.run(main())
+        """
+        sql = sqlalchemy.text(sql) if isinstance(sql, str) else sql
+        async with self._connect() as connection:
+            out = await connection.execute(sql, *args, **kwargs)
+            return out
+
+    async def _get_table(self, table, *args, **kwargs):
+        """
+        Get a table object from the database.
+
+        See :meth:`msdss_base_database.core.Database._get_table`.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table.
+        *args, **kwargs
+            Additional arguments passed to :class:`sqlalchemy.schema.Table`. If any are given, the table cache is not used.
+
+        Return
+        ------
+        :class:`sqlalchemy.schema.Table`
+            A ``Table`` object from ``sqlalchemy``.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import asyncio
+            from msdss_base_database import AsyncDatabase
+
+            async def main():
+                db = AsyncDatabase()
+                if not await db.has_table('test_table'):
+                    await db.create_table('test_table', [('id', 'Integer')])
+                tb = await db._get_table('test_table')
+                print(str(tb))
+                await db.dispose()
+
+            asyncio.run(main())
+        """
+        use_cache = len(args) == 0 and len(kwargs) == 0
+
+        # (AsyncDatabase_get_table_cache) Return the cached table if available
+        if use_cache:
+            out = self._table_cache.get(table)
+            if out is not None:
+                return out
+
+        # (AsyncDatabase_get_table_reflect) Reflect the table, replacing stale metadata
+        if use_cache and table in self._metadata.tables:
+            self._metadata.remove(self._metadata.tables[table])
+        async with self._connect() as connection:
+            out = await connection.run_sync(lambda c: sqlalchemy.Table(table, self._metadata, autoload_with=c, *args, **kwargs))
+
+        # (AsyncDatabase_get_table_return) Cache and return the table
+        if use_cache:
+            self._table_cache.set(table, out)
+        return out
+
+    async def _prepare_query(self, table, *args, **kwargs):
+        """
+        Get a reusable SQL statement and its parameter values.
+
+        See :meth:`msdss_base_database.core.Database._prepare_query`.
+
+        Parameters
+        ----------
+        table : str
+            Name of the database table.
+        *args, **kwargs
+            Additional arguments passed to :meth:`msdss_base_database.core.Database._prepare_query`.
+
+        Returns
+        -------
+        tuple
+            A tuple of the statement and a dict of its parameter values.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import asyncio
+            from msdss_base_database import AsyncDatabase
+
+            async def main():
+                db = AsyncDatabase()
+                if not await db.has_table('test_table'):
+                    await db.create_table('test_table', [('id', 'Integer')])
+                sql, params = await db._prepare_query('test_table', where=('id', '=', 1))
+                print(str(sql))
+                print(params)
+                await db.dispose()
+
+            asyncio.run(main())
+        """
+        target = await self._get_table(table)
+        out = super()._prepare_query(target, *args, **kwargs)
+        return out
+
+    async def columns(self, table):
+        """
+        Get number of columns for a table.
+
+        See :meth:`msdss_base_database.core.Database.columns`.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to get columns for.
+
+        Returns
+        -------
+        int
+            Number of columns in the table.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import asyncio
+            from msdss_base_database import AsyncDatabase
+
+            async def main():
+                db = AsyncDatabase()
+                if not await db.has_table('test_table'):
+                    await db.create_table('test_table', [('id', 'Integer')])
+                print(await db.columns('test_table'))
+                await db.dispose()
+
+            asyncio.run(main())
+        """
+        table = await self._get_table(table)
+        out = len(table.c)
+        return out
+
+    async def create_table(self, table, columns):
+        """
+        Create a table in the database.
+
+        See :meth:`msdss_base_database.core.Database.create_table`.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to create.
+        columns : list(dict) or list(list)
+            List of dict (kwargs) or lists (positional args) that are passed to :class:`sqlalchemy.schema.Column`. Data types can also be specified as str.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import asyncio
+            from msdss_base_database import AsyncDatabase
+
+            async def main():
+                db = AsyncDatabase()
+                if await db.has_table('test_table'):
+                    await db.drop_table('test_table')
+                columns = [
+                    dict(name='id', type_='Integer', primary_key=True),
+                    dict(name='column_one', type_='String'),
+                    dict(name='column_two', type_='Integer')
+                ]
+                await db.create_table('test_table', columns)
+                print(await db.select('test_table'))
+                await db.dispose()
+
+            asyncio.run(main())
+        """
+        self.invalidate(table)
+        columns = self._list_to_columns(columns)
+        tb = sqlalchemy.Table(table, self._metadata, *columns, extend_existing=True)
+        async with self._connect() as connection:
+            await connection.run_sync(tb.create)
+        self._table_cache.set(table, tb)
+
+    async def delete(self, table, where, where_boolean='AND', *args, **kwargs):
+        """
+        Remove rows from a table in the database.
+
+        See :meth:`msdss_base_database.core.Database.delete`.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to remove rows from.
+        where : list of list or list of tuple or None
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database.delete`.
+        where_boolean : str
+            One of ``AND`` or ``OR`` to combine ``where`` statements with.
+        *args, **kwargs
+            Additional arguments passed to :meth:`msdss_base_database.async_core.AsyncDatabase._execute_query`.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import asyncio
+            from msdss_base_database import AsyncDatabase
+
+            async def main():
+                db = AsyncDatabase()
+                if await db.has_table('test_table'):
+                    await db.drop_table('test_table')
+                await db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True)])
+                await db.insert('test_table', {'id': [1, 2, 3]})
+                await db.delete('test_table', where=('id', '=', 1))
+                print(await db.select('test_table'))
+                await db.dispose()
+
+            asyncio.run(main())
+        """
+        sql, params = await self._prepare_query(table=table, where=where, where_boolean=where_boolean, delete=True)
+        cursor = await self._execute_query(sql, params, *args, **kwargs)
+
+    async def dispose(self):
+        """
+        Close all connections in the connection pool.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import asyncio
+            from msdss_base_database import AsyncDatabase
+
+            async def main():
+                db = AsyncDatabase()
+                await db.dispose()
+
+            asyncio.run(main())
+        """
+        await self._connection.dispose()
+
+    async def drop_table(self, table, *args, **kwargs):
+        """
+        Remove a table from the database.
+
+        See :meth:`msdss_base_database.core.Database.drop_table`.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to remove.
+        *args, **kwargs
+            Additional arguments passed to :meth:`sqlalchemy.schema.Table.drop`.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import asyncio
+            from msdss_base_database import AsyncDatabase
+
+            async def main():
+                db = AsyncDatabase()
+                if not await db.has_table('test_table'):
+                    await db.create_table('test_table', [('id', 'Integer')])
+                await db.drop_table('test_table')
+                print(await db.has_table('test_table'))
+                await db.dispose()
+
+            asyncio.run(main())
+        """
+        tb = await self._get_table(table)
+        async with self._connect() as connection:
+            await connection.run_sync(lambda c: tb.drop(c, *args, **kwargs))
+        self.invalidate(table)
+
+    async def has_table(self, table, *args, **kwargs):
+        """
+        Check if a table exists.
+
+        See :meth:`msdss_base_database.core.Database.has_table`.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to check.
+        *args, **kwargs
+            Additional arguments passed to :meth:`sqlalchemy.engine.reflection.Inspector.has_table`.
+
+        Return
+        ------
+        bool
+            Returns ``True`` if the table exists and ``False`` otherwise.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import asyncio
+            from msdss_base_database import AsyncDatabase
+
+            async def main():
+                db = AsyncDatabase()
+                print(await db.has_table('test_table'))
+                await db.dispose()
+
+            asyncio.run(main())
+        """
+        async with self._connect() as connection:
+            out = await connection.run_sync(lambda c: sqlalchemy.inspect(c).has_table(table, *args, **kwargs))
+        return out
+
+    async def insert(self, table, data, method='auto', batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Insert additional data to an existing table in the database.
+
+        See :meth:`msdss_base_database.core.Database.insert`.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to insert additional data to.
+        data : dict or list or :class:`pandas:pandas.DataFrame`
+            Data to insert. See :meth:`msdss_base_database.core.Database._get_records`.
+        method : str
+            One of ``auto``, ``values``, or ``executemany`` (see :meth:`msdss_base_database.core.Database._bulk_insert`).
+        batch_size : int
+            Number of rows to insert with each statement.
+
+        Returns
+        -------
+        dict
+            Dictionary with keys ``rows``, ``seconds``, ``rows_per_second``, and ``method`` (see :meth:`msdss_base_database.core.Database.insert`).
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import asyncio
+            from msdss_base_database import AsyncDatabase
+
+            async def main():
+                db = AsyncDatabase()
+                if await db.has_table('test_table'):
+                    await db.drop_table('test_table')
+                await db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True)])
+                stats = await db.insert('test_table', {'id': [1, 2, 3]})
+                print(stats)
+                await db.dispose()
+
+            asyncio.run(main())
+        """
+        start = time.perf_counter()
+        target = await self._get_table(table)
+        records = self._get_records(data)
+        if len(records) > 0:
+            async with self._connect() as connection:
+                method = await connection.run_sync(self._bulk_insert, target, records, method, batch_size)
+        seconds = time.perf_counter() - start
+        out = dict(rows=len(records), seconds=seconds, rows_per_second=len(records) / seconds if seconds > 0 else None, method=method)
+        return out
+
+    async def prepare(self, table, *args, **kwargs):
+        """
+        Prepare a select query to run many times with different values.
+
+        See :meth:`msdss_base_database.core.Database.prepare`. The ``asyncpg`` driver prepares statements on the server itself, so the ``server`` parameter is not used.
+
+        Parameters
+        ----------
+        table : str
+            Name of the database table to query from.
+        *args, **kwargs
+            Additional arguments passed to :meth:`msdss_base_database.core.Database.prepare`.
+
+        Returns
+        -------
+        :class:`msdss_base_database.prepared.AsyncPreparedQuery`
+            Callable that takes the values of each :class:`msdss_base_database.prepared.Param` as keyword arguments and returns a coroutine of the queried data.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import asyncio
+            from msdss_base_database import AsyncDatabase, Param
+
+            async def main():
+                db = AsyncDatabase()
+                if await db.has_table('test_table'):
+                    await db.drop_table('test_table')
+                await db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True), ('column_one', 'String')])
+                await db.insert('test_table', {'id': [1, 2, 3], 'column_one': ['a', 'b', 'c']})
+                lookup = await db.prepare('test_table', where=[('id', '=', Param('id'))])
+                for i in [1, 3]:
+                    print(await lookup(id=i))
+                await db.dispose()
+
+            asyncio.run(main())
+        """
+        target = await self._get_table(table)
+        query = super().prepare(target, *args, **{**kwargs, 'server': False})
+        out = AsyncPreparedQuery(self, query.table, query.sql, query.params, output=query.output)
+        return out
+
+    async def rows(self, table):
+        """
+        Get number of rows for a table.
+
+        See :meth:`msdss_base_database.core.Database.rows`.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to get rows for.
+
+        Returns
+        -------
+        int
+            Number of rows in the table.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import asyncio
+            from msdss_base_database import AsyncDatabase
+
+            async def main():
+                db = AsyncDatabase()
+                if not await db.has_table('test_table'):
+                    await db.create_table('test_table', [('id', 'Integer')])
+                print(await db.rows('test_table'))
+                await db.dispose()
+
+            asyncio.run(main())
+        """
+        table = await self._get_table(table)
+        sql = sqlalchemy.select([sqlalchemy.func.count()]).select_from(table)
+        cursor = await self._execute_query(sql)
+        out = cursor.scalar()
+        return out
+
+    async def select(self, table, *args, output='pandas', dtype_backend=None, **kwargs):
+        """
+        Query data from a table in the database.
+
+        See :meth:`msdss_base_database.core.Database.select`.
+
+        Parameters
+        ----------
+        table : str
+            Name of the database table to query from.
+        output : str
+            One of ``pandas`` to return a :class:`pandas:pandas.DataFrame` or ``arrow`` to return a :class:`pyarrow:pyarrow.Table`. See parameter ``output`` in :meth:`msdss_base_database.core.Database.select`.
+        dtype_backend : str or None
+            See parameter ``dtype_backend`` in :meth:`msdss_base_database.core.Database.select`. Values other than ``'pyarrow'`` are passed to :meth:`pandas:pandas.DataFrame.convert_dtypes`.
+        *args, **kwargs
+            Additional arguments passed to :meth:`msdss_base_database.core.Database._prepare_query`, such as ``select``, ``where``, ``group_by``, ``aggregate``, ``aggregate_func``, ``order_by``, ``order_by_sort``, ``limit``, ``offset``, ``where_boolean``, and ``after``.
+
+        Returns
+        -------
+        :class:`pandas:pandas.DataFrame` or :class:`pyarrow:pyarrow.Table`
+            pandas dataframe or arrow table containing the queried data.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import asyncio
+            from msdss_base_database import AsyncDatabase
+
+            async def main():
+                db = AsyncDatabase()
+                if await db.has_table('test_table'):
+                    await db.drop_table('test_table')
+                await db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True), ('column_one', 'String')])
+                await db.insert('test_table', {'id': [1, 2, 3], 'column_one': ['a', 'b', 'c']})
+                df = await db.select('test_table', select='column_one', where=('id', '>', 1), order_by='id', order_by_sort='desc')
+                print(df)
+                await db.dispose()
+
+            asyncio.run(main())
+        """
+
+        # (AsyncDatabase_select_output) Check the output before querying
+        if output not in ('pandas', 'arrow'):
+            raise ValueError(str(output) + ' is not supported')
+        sql, params = await self._prepare_query(table, *args, **kwargs)
+        cursor = await self._execute_query(sql, params)
+        rows = cursor.fetchall()
+        columns = list(cursor.keys())
+
+        # (AsyncDatabase_select_arrow) Build an arrow table from the rows
+        if output == 'arrow' or (output == 'pandas' and dtype_backend == 'pyarrow'):
+            types = [get_arrow_type(c.type) for c in sql.selected_columns]
+            out = get_arrow_table([get_arrow_batch(rows, columns, types)])
+            if output == 'pandas':
+                import pandas
+                out = out.to_pandas(types_mapper=pandas.ArrowDtype)
+
+        # (AsyncDatabase_select_pandas) Build a dataframe from the rows
+        else:
+            import pandas
+            out = pandas.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+            if dtype_backend is not None:
+                out = out.convert_dtypes(dtype_backend=dtype_backend)
+        return out
+
+    async def select_iter(self, table, *args, chunksize=DEFAULT_CHUNKSIZE, output='pandas', **kwargs):
+        """
+        Query data from a table in the database in chunks with an async iterator.
+
+        See :meth:`msdss_base_database.core.Database.select_iter`.
+
+        Parameters
+        ----------
+        table : str
+            Name of the database table to query from.
+        chunksize : int
+            Number of rows in each chunk.
+        output : str
+            One of ``pandas`` to yield :class:`pandas:pandas.DataFrame` chunks or ``rows`` to yield lists of rows that behave like named tuples.
+        *args, **kwargs
+            Additional arguments passed to :meth:`msdss_base_database.core.Database._prepare_query`, such as ``select``, ``where``, ``order_by``, and ``limit``.
+
+        Yields
+        ------
+        :class:`pandas:pandas.DataFrame` or list(:class:`sqlalchemy:sqlalchemy.engine.Row`)
+            A chunk of the queried data with at most ``chunksize`` rows.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import asyncio
+            from msdss_base_database import AsyncDatabase
+
+            async def main():
+                db = AsyncDatabase()
+                if await db.has_table('test_table'):
+                    await db.drop_table('test_table')
+                await db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True)])
+                await db.insert('test_table', {'id': [1, 2, 3]})
+                async for df in db.select_iter('test_table', chunksize=2):
+                    print(df)
+                await db.dispose()
+
+            asyncio.run(main())
+        """
+
+        # (AsyncDatabase_select_iter_output) Check the output before querying
+        if output not in ('pandas', 'rows'):
+            raise ValueError(str(output) + ' is not supported')
+        sql, params = await self._prepare_query(table, *args, **kwargs)
+        async with self._connect() as connection:
+            result = await connection.stream(sql, params)
+            columns = list(result.keys())
+            async for rows in result.partitions(chunksize):
+                if output == 'pandas':
+                    import pandas
+                    out = pandas.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+                else:
+                    out = rows
+                yield out
+
+    @contextlib.asynccontextmanager
+    async def transaction(self):
+        """
+        Run a group of operations in a single transaction.
+
+        See :meth:`msdss_base_database.core.Database.transaction`. Operations in the transaction share one connection, so they should be awaited one at a time rather than concurrently.
+
+        Yields
+        ------
+        :class:`msdss_base_database.async_core.AsyncDatabase`
+            This object.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import asyncio
+            from msdss_base_database import AsyncDatabase
+
+            async def main():
+                db = AsyncDatabase()
+                if await db.has_table('test_table'):
+                    await db.drop_table('test_table')
+                await db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True), ('column_one', 'String')])
+                async with db.transaction() as tx:
+                    for i in range(10):
+                        await tx.insert('test_table', [dict(id=i, column_one=str(i))])
+                    await tx.update('test_table', where=('id', '>', 5), values={'column_one': 'AA'})
+                print(await db.select('test_table'))
+                await db.dispose()
+
+            asyncio.run(main())
+        """
+        connection = self._transaction_connection.get()
+
+        # (AsyncDatabase_transaction_nested) Use a savepoint if already in a transaction
+        if connection is not None:
+            async with connection.begin_nested():
+                yield self
+            return
+
+        # (AsyncDatabase_transaction_bind) Bind a connection for this context until the transaction ends
+        async with self._connect() as connection:
+            token = self._transaction_connection.set(connection)
+            try:
+                yield self
+            finally:
+                self._transaction_connection.reset(token)
+
+    async def update(self, table, where, values, where_boolean='AND', *args, **kwargs):
+        """
+        Update a table from the database.
+
+        See :meth:`msdss_base_database.core.Database.update`.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to update.
+        where : list of list or list of tuple or None
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database.update`.
+        values : dict
+            Dictionary representing values to update if they match the ``where`` parameter requirements.
+        where_boolean : str
+            See parameter ``where_boolean`` in :meth:`msdss_base_database.core.Database.update`.
+        *args, **kwargs
+            Additional arguments passed to :meth:`msdss_base_database.async_core.AsyncDatabase._execute_query`.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import asyncio
+            from msdss_base_database import AsyncDatabase
+
+            async def main():
+                db = AsyncDatabase()
+                if await db.has_table('test_table'):
+                    await db.drop_table('test_table')
+                await db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True), ('column_one', 'String')])
+                await db.insert('test_table', {'id': [1, 2, 3], 'column_one': ['a', 'b', 'c']})
+                await db.update('test_table', where=('id', '>', 1), values={'column_one': 'AA'})
+                print(await db.select('test_table'))
+                await db.dispose()
+
+            asyncio.run(main())
+        """
+        sql, params = await self._prepare_query(table=table, where=where, where_boolean=where_boolean, values=values, update=True)
+        cursor = await self._execute_query(sql, params, *args, **kwargs)
+
+    # (AsyncDatabase_unsupported) Methods of Database that need a sync connection
+    create_change_log = _unsupported('create_change_log')
+    create_index = _unsupported('create_index')
+    delete_many = _unsupported('delete_many')
+    drop_change_log = _unsupported('drop_change_log')
+    drop_index = _unsupported('drop_index')
+    explain = _unsupported('explain')
+    get_watermark = _unsupported('get_watermark')
+    list_indexes = _unsupported('list_indexes')
+    paginate = _unsupported('paginate')
+    select_changes = _unsupported('select_changes')
+    select_in = _unsupported('select_in')
+    select_parallel = _unsupported('select_parallel')
+    set_watermark = _unsupported('set_watermark')
+    suggest_indexes = _unsupported('suggest_indexes')
+    update_many = _unsupported('update_many')
+    upsert = _unsupported('upsert')
@@ -0,0 +1,531 @@
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+
+from collections import OrderedDict
+
+class LRUCache:
+    """
+    Class for a least recently used (LRU) cache with optional time to live (TTL) expiry.
+
+    Parameters
+    ----------
+    max_size : int or None
+        Maximum number of entries to keep in the cache. The least recently used entry is removed when this is exceeded. If ``None``, the cache is unbounded.
+    ttl : int or float or None
+        Number of seconds before an entry expires. If ``None``, entries never expire.
+    max_bytes : int or None
+        Maximum total size in bytes of the entries, using the ``size`` given to :meth:`msdss_base_database.cache.LRUCache.set`. The least recently used entries are removed when this is exceeded. If ``None``, the size is not limited.
+
+    Attributes
+    ----------
+    hits : int
+        Number of successful lookups.
+    misses : int
+        Number of lookups that did not find an entry or found an expired entry.
+    max_size : int or None
+        Same as parameter ``max_size``.
+    ttl : int or float or None
+        Same as parameter ``ttl``.
+    max_bytes : int or None
+        Same as parameter ``max_bytes``.
+    _bytes : int
+        Total size in bytes of the entries.
+    _entries : :class:`collections.OrderedDict`
+        Dictionary of keys and ``(value, created, size, group)`` tuples ordered from least to most recently used.
+    _groups : dict
+        Dictionary of groups and the set of keys in each group, so that a group can be removed without scanning all keys.
+    _lock : :class:`threading.RLock`
+        Lock for safe access to the cache across threads.
+
+    Author
+    ------
+    Richard Wen <rrwen.dev@gmail.com>
+
+    Example
+    -------
+    .. jupyter-execute::
+
+        from msdss_base_database.cache import LRUCache
+
+        # Create a cache with 2 entries that expire after 60 seconds
+        cache = LRUCache(max_size=2, ttl=60)
+
+        # Add entries, removing the least recently used entry "a"
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.set('c', 3)
+
+        # Get entries
+        a = cache.get('a')
+        b = cache.get('b')
+
+        # Remove an entry
+        cache.invalidate('b')
+
+        # Add entries to a group and remove the group
+        cache.set(('test_table', 1), 4, group='test_table')
+        cache.set(('test_table', 2), 5, group='test_table')
+        cache.invalidate_group('test_table')
+
+        # Display results
+        print('a: ' + str(a))
+        print('b: ' + str(b))
+        print('info: ' + str(cache.info()))
+    """
+    def __init__(self, max_size=128, ttl=None, max_bytes=None):
+        self.hits = 0
+        self.misses = 0
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._bytes = 0
+        self._entries = OrderedDict()
+        self._groups = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _get_value(self, key, entry):
+        """
+        Get the value of an entry. This can be overridden to load values stored elsewhere.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the entry.
+        entry : any
+            Stored entry for the key.
+
+        Returns
+        -------
+        any
+            Value of the entry.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        """
+        return entry
+
+    def _remove(self, key):
+        """
+        Remove an entry if it exists. This can be overridden to clean up values stored elsewhere.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the entry to remove.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        """
+        if key in self._entries:
+            _, _, size, group = self._entries.pop(key)
+            self._bytes -= size
+            if group is not None:
+                self._groups[group].discard(key)
+                if len(self._groups[group]) == 0:
+                    del self._groups[group]
+
+    def _set_value(self, key, value):
+        """
+        Get the entry to store for a value. This can be overridden to store values elsewhere.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the entry.
+        value : any
+            Value to store.
+
+        Returns
+        -------
+        any
+            Entry to store for the key.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        """
+        return value
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.cache import LRUCache
+
+            cache = LRUCache()
+            cache.set('a', 1)
+            cache.clear()
+            print(len(cache))
+        """
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def close(self):
+        """
+        Remove all entries and release the resources of the cache.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.cache import LRUCache
+
+            cache = LRUCache()
+            cache.set('a', 1)
+            cache.close()
+            print(len(cache))
+        """
+        self.clear()
+
+    def get(self, key, default=None):
+        """
+        Get an entry from the cache.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the entry.
+        default : any
+            Value to return if the entry does not exist or has expired.
+
+        Return
+        ------
+        any
+            The cached value or ``default``.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.cache import LRUCache
+
+            cache = LRUCache()
+            cache.set('a', 1)
+            print(cache.get('a'))
+            print(cache.get('b', 'missing'))
+        """
+        with self._lock:
+
+            # (LRUCache_get_miss) Count a miss if the key does not exist
+            if key not in self._entries:
+                self.misses += 1
+                return default
+
+            # (LRUCache_get_expire) Remove the entry and count a miss if expired
+            entry, created = self._entries[key][:2]
+            if self.ttl is not None and time.monotonic() - created > self.ttl:
+                self._remove(key)
+                self.misses += 1
+                return default
+
+            # (LRUCache_get_hit) Mark the entry as most recently used and count a hit
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._get_value(key, entry)
+
+    def info(self):
+        """
+        Get usage counters for the cache.
+
+        Return
+        ------
+        dict
+            Dictionary with keys ``hits``, ``misses``, ``size``, ``max_size``, ``ttl``, ``bytes``, and ``max_bytes``.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.cache import LRUCache
+
+            cache = LRUCache()
+            cache.set('a', 1)
+            cache.get('a')
+            cache.get('b')
+            print(cache.info())
+        """
+        with self._lock:
+            out = dict(hits=self.hits, misses=self.misses, size=len(self._entries), max_size=self.max_size, ttl=self.ttl, bytes=self._bytes, max_bytes=self.max_bytes)
+            return out
+
+    def invalidate(self, key):
+        """
+        Remove an entry from the cache if it exists.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the entry to remove.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.cache import LRUCache
+
+            cache = LRUCache()
+            cache.set('a', 1)
+            cache.invalidate('a')
+            print('a' in cache)
+        """
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_group(self, group):
+        """
+        Remove all entries of a group from the cache.
+
+        Parameters
+        ----------
+        group : hashable
+            Group given to :meth:`msdss_base_database.cache.LRUCache.set` for the entries to remove.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.cache import LRUCache
+
+            cache = LRUCache()
+            cache.set(('test_table', 1), 1, group='test_table')
+            cache.set(('other_table', 1), 2, group='other_table')
+            cache.invalidate_group('test_table')
+            print(cache.keys())
+        """
+        with self._lock:
+            for key in list(self._groups.get(group, [])):
+                self._remove(key)
+
+    def keys(self):
+        """
+        Get the keys of the entries in the cache, including expired entries that have not been removed yet.
+
+        Return
+        ------
+        list
+            List of keys ordered from least to most recently used.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.cache import LRUCache
+
+            cache = LRUCache()
+            cache.set('a', 1)
+            cache.set('b', 2)
+            print(cache.keys())
+        """
+        with self._lock:
+            out = list(self._entries)
+            return out
+
+    def set(self, key, value, size=0, group=None):
+        """
+        Add or replace an entry in the cache.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the entry.
+        value : any
+            Value to cache.
+        size : int
+            Size of the value in bytes, counted towards ``max_bytes``. Values larger than ``max_bytes`` are not cached.
+        group : hashable or None
+            Group of the entry, such as the table of a query result, so that the entries of the group can be removed together with :meth:`msdss_base_database.cache.LRUCache.invalidate_group`.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.cache import LRUCache
+
+            cache = LRUCache(max_size=1)
+            cache.set('a', 1)
+            cache.set('b', 2)
+            print(list(cache._entries))
+        """
+        with self._lock:
+
+            # (LRUCache_set_add) Replace the entry and skip values that could never fit
+            self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = (self._set_value(key, value), time.monotonic(), size, group)
+            self._bytes += size
+            if group is not None:
+                self._groups.setdefault(group, set()).add(key)
+
+            # (LRUCache_set_evict) Remove least recently used entries until within the limits
+            while (self.max_size is not None and len(self._entries) > self.max_size) or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+
+class DiskCache(LRUCache):
+    """
+    Class for a least recently used (LRU) cache that stores values as pickle files in a directory.
+
+    Entries are tracked in memory, so the files are only reused by the same cache object, while values are loaded from disk on each lookup.
+    See :class:`msdss_base_database.cache.LRUCache` for the shared behaviour.
+
+    Parameters
+    ----------
+    directory : str or None
+        Path of the directory to store the files in, which is created if it does not exist. If ``None``, a new temporary directory is used, which is removed when the cache is closed or garbage collected.
+    *args, **kwargs
+        Additional arguments passed to :class:`msdss_base_database.cache.LRUCache`, such as ``max_size``, ``ttl``, and ``max_bytes``.
+
+    Attributes
+    ----------
+    directory : str
+        Path of the directory storing the files.
+    _finalizer : :class:`weakref.finalize` or None
+        Finalizer that removes the temporary directory if the cache created it, or ``None`` if parameter ``directory`` was given.
+
+    Author
+    ------
+    Richard Wen <rrwen.dev@gmail.com>
+
+    Example
+    -------
+    .. jupyter-execute::
+
+        from msdss_base_database.cache import DiskCache
+
+        # Create a cache on disk with entries that expire after 60 seconds
+        cache = DiskCache(ttl=60)
+
+        # Add and get an entry
+        cache.set(('test_table', 1), {'a': [1, 2, 3]})
+        value = cache.get(('test_table', 1))
+
+        # Display results
+        print('value: ' + str(value))
+        print('info: ' + str(cache.info()))
+
+        # Remove the files and the temporary directory
+        cache.close()
+    """
+    def __init__(self, directory=None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.directory = directory if directory is not None else tempfile.mkdtemp(prefix='msdss_cache_')
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, ignore_errors=True) if directory is None else None
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _get_path(self, key):
+        """
+        Get the file path for a key.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the entry, which must be supported by :mod:`pickle`.
+
+        Returns
+        -------
+        str
+            Path of the pickle file for the entry.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        """
+        name = hashlib.sha256(pickle.dumps(key)).hexdigest()
+        out = os.path.join(self.directory, name + '.pkl')
+        return out
+
+    def _get_value(self, key, entry):
+        with open(entry, 'rb') as file:
+            out = pickle.load(file)
+        return out
+
+    def _remove(self, key):
+        if key in self._entries:
+            path = self._entries[key][0]
+            super()._remove(key)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _set_value(self, key, value):
+        out = self._get_path(key)
+        with open(out, 'wb') as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        return out
+
+    def close(self):
+        """
+        Remove all entries and their files, and remove the directory if it is a temporary directory created by the cache. The cache should not be used after it is closed.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import os
+            from msdss_base_database.cache import DiskCache
+
+            cache = DiskCache()
+            cache.set('a', 1)
+            cache.close()
+            print(os.path.exists(cache.directory))
+        """
+        with self._lock:
+            self.clear()
+            if self._finalizer is not None:
+                self._finalizer()
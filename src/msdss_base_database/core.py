@@ -1,8 +1,20 @@
-import pandas
+import concurrent.futures
+import contextlib
+import datetime
+import io
+import itertools
+import json
+import re
 import sqlalchemy
+import threading
+import time
+import uuid
 
+from .advisor import *
+from .cache import *
 from .defaults import *
-from .env import *
+from .prepared import *
+from .stats import *
 from .tools import *
 
 class Database:
@@ -25,9 +37,10 @@ class Database:
         Database name of the connection.
     load_env : bool
         Whether to load the environmental variables using parameter ``env`` or not.  The environment will only be loaded if the ``env_file`` exists.
-    env : :class:`msdss_base_database.env.DatabaseDotEnv` or bool
+    env : :class:`msdss_base_database.env.DatabaseDotEnv` or None
         An object to set environment variables related to database configuration.
         These environment variables will overwrite the parameters above if they exist.
+        If ``None``, a :class:`msdss_base_database.env.DatabaseDotEnv` with the default settings is created when the environment is loaded.
 
         By default, the parameters above are assigned to each of the environment variables below:
 
@@ -40,17 +53,95 @@ class Database:
             for k, v in defaults.items():
                 print(k + ' = ' + v)
 
+    table_cache_size : int or None
+        Maximum number of reflected table objects to keep in the table cache. If ``None``, the cache is unbounded.
+    table_cache_ttl : int or float or None
+        Number of seconds before a cached table object is reflected again. If ``None``, cached tables only expire with :meth:`msdss_base_database.core.Database.invalidate`.
+    query_cache_size : int or None
+        Maximum number of reusable statements to keep in the query cache (see :meth:`msdss_base_database.core.Database._prepare_query`). If ``None``, the cache is unbounded.
+    pool : str or dict
+        Name of a connection pool profile or a dict of pool settings such as ``pool_size``, ``max_overflow``, ``pool_pre_ping``, ``pool_recycle``, ``pool_timeout``, and ``pool_use_lifo``.
+        These can be overwritten by the ``MSDSS_DATABASE_POOL*`` environment variables if ``load_env`` is ``True``, or by ``kwargs``. See :func:`msdss_base_database.tools.get_pool_kwargs`.
+    result_cache : str or :class:`msdss_base_database.cache.LRUCache` or None
+        Cache for the results of :meth:`msdss_base_database.core.Database.select`, which are reused for calls with the same arguments until the table is written to by this object.
+
+        * If ``None``, results are not cached
+        * If ``'memory'``, results are kept in a :class:`msdss_base_database.cache.LRUCache`
+        * If ``'disk'``, results are kept as files in a :class:`msdss_base_database.cache.DiskCache`
+        * Otherwise, a cache object to use directly
+
+    result_cache_ttl : int or float or None
+        Number of seconds before a cached result expires, so that changes made outside of this object are seen. If ``None``, results only expire when the table is written to.
+    result_cache_max_bytes : int or None
+        Maximum total size in bytes of the cached results, where the least recently used results are removed first. If ``None``, the size is not limited.
+    result_cache_dir : str or None
+        Path of the directory for the ``'disk'`` result cache. If ``None``, a new temporary directory is used.
+    stats : bool or :class:`msdss_base_database.stats.QueryStats`
+        Whether to record the time spent building, compiling, executing, fetching, and creating dataframes for each query (see :meth:`msdss_base_database.core.Database.query_stats`).
+        Stats are not recorded by default, so that queries do not pay for the bookkeeping unless it is used.
+        If a :class:`msdss_base_database.stats.QueryStats`, records are added to it, such as to share one across several objects.
+    slow_query_threshold : int or float or None
+        Number of seconds at or above which a query is written to the slow query log if ``stats`` is ``True``. If ``None``, the slow query log is not used.
+    slow_query_log : str or :class:`logging.Logger` or None
+        File path or logger for the slow query log. See parameter ``slow_query_log`` in :class:`msdss_base_database.stats.QueryStats`.
+    index_advisor : bool or :class:`msdss_base_database.advisor.IndexAdvisor`
+        Whether to record the columns that queries filter and sort by, to suggest indexes with :meth:`msdss_base_database.core.Database.suggest_indexes`.
+        Queries are not recorded by default, so that they do not pay for the bookkeeping unless indexes are suggested.
+        If a :class:`msdss_base_database.advisor.IndexAdvisor`, queries are recorded to it, such as to share one across several objects.
+    replicas : list(str) or list(dict) or None
+        List of urls, or dicts of the parameters of :func:`msdss_base_database.tools.get_database_url`, for read replicas of the database.
+        Reads from :meth:`msdss_base_database.core.Database.select` (and the other select methods), :meth:`msdss_base_database.core.Database.rows`, and prepared queries are sent to a replica,
+        while writes, schema changes, and queries in a :meth:`msdss_base_database.core.Database.transaction` are sent to the primary database of the other connection parameters.
+        If connecting to a replica fails, the read is sent to the primary database. Can be overwritten by the ``MSDSS_DATABASE_REPLICAS`` environment variable if ``load_env`` is ``True``. See :func:`msdss_base_database.tools.get_replica_kwargs`.
+    replica_balance : str
+        One of ``round_robin`` to send reads to each replica in turn, or ``least_loaded`` to send reads to the replica with the fewest reads running.
+    read_your_writes : int or float or None
+        Number of seconds after a write by this object to send reads to the primary database, so that the write is seen before it is copied to the replicas. If ``None``, reads are always sent to a replica.
     *args, **kwargs
         Additional arguments passed to :func:`sqlalchemy:sqlalchemy.create_engine`.
 
     Attributes
     ----------
+    _advisor : :class:`msdss_base_database.advisor.IndexAdvisor` or None
+        Records of the columns that queries filter and sort by, or ``None`` if not recorded.
+    _last_write : float or None
+        Time from :func:`time.monotonic` of the last write by this object, or ``None`` if nothing was written.
+    _read_your_writes : float or None
+        Same as parameter ``read_your_writes``.
+    _replicas : list(:class:`sqlalchemy.engine.base.Engine`)
+        Database engine objects for the read replicas.
+    _replica_balance : str
+        Same as parameter ``replica_balance``.
+    _replica_counters : list(dict)
+        Counters of the reads, running reads, connection errors, and connection waits of each replica, used by :meth:`msdss_base_database.core.Database.pool_stats`.
+    _replica_lock : :class:`threading.Lock`
+        Lock for choosing replicas and updating ``_replica_counters`` across threads.
+    _replica_next : :class:`itertools.count`
+        Counter for choosing replicas in turn.
     _connection : :class:`sqlalchemy.engine.base.Engine`
         The database engine object from `sqlalchemy <https://www.sqlalchemy.org/>`_.
     _inspector: :class:`sqlalchemy.engine.reflection.Inspector`
         The database inspector object from `sqlalchemy <https://www.sqlalchemy.org/>`_.
     _metadata : :class:`sqlalchemy.schema.MetaData`
         The metadata object from `sqlalchemy <https://www.sqlalchemy.org/>`_.
+    _pool_counters : dict
+        Counters of connection pool events used by :meth:`msdss_base_database.core.Database.pool_stats`.
+    _pool_lock : :class:`threading.Lock`
+        Lock for updating ``_pool_counters`` across threads.
+    _local : :class:`threading.local`
+        Thread local storage for the connection bound by :meth:`msdss_base_database.core.Database.transaction` and the query record being measured.
+    _literal_limit : bool
+        Whether the database requires literal values for ``limit`` and ``offset`` instead of bound parameters, such as for ``mssql`` and ``oracle``.
+    _query_cache : :class:`msdss_base_database.cache.LRUCache`
+        Cache of reusable statements keyed by the structure of the query.
+    _result_cache : :class:`msdss_base_database.cache.LRUCache` or None
+        Cache of query results keyed by the table name, the structure of the query, and the parameter values, and grouped by the table name.
+    _result_versions : dict
+        Number of times the cached results of each table were invalidated, used to avoid caching results that were queried before a write finished.
+    _stats : :class:`msdss_base_database.stats.QueryStats` or None
+        Records of the time spent in each phase of the queries, or ``None`` if not recorded.
+    _table_cache : :class:`msdss_base_database.cache.LRUCache`
+        Cache of reflected table objects keyed by table name.
 
     Author
     ------
@@ -135,7 +226,22 @@ class Database:
         port=DEFAULT_DOTENV_KWARGS['defaults']['port'],
         database=DEFAULT_DOTENV_KWARGS['defaults']['database'],
         load_env=True,
-        env=DatabaseDotEnv(),
+        env=None,
+        table_cache_size=DEFAULT_TABLE_CACHE_SIZE,
+        table_cache_ttl=DEFAULT_TABLE_CACHE_TTL,
+        query_cache_size=DEFAULT_QUERY_CACHE_SIZE,
+        pool=DEFAULT_POOL_PROFILE,
+        result_cache=None,
+        result_cache_ttl=DEFAULT_RESULT_CACHE_TTL,
+        result_cache_max_bytes=DEFAULT_RESULT_CACHE_MAX_BYTES,
+        result_cache_dir=None,
+        stats=False,
+        slow_query_threshold=None,
+        slow_query_log=None,
+        index_advisor=False,
+        replicas=None,
+        replica_balance=DEFAULT_REPLICA_BALANCE,
+        read_your_writes=None,
         *args, **kwargs):
         
         # (Database_connect_str) Build connection str from parameters
@@ -150,10 +256,35 @@ class Database:
             env=env
         )
 
+        # (Database_connect_pool) Get pool settings, where create_engine kwargs take priority
+        kwargs = {**get_pool_kwargs(pool=pool, load_env=load_env, env=env), **kwargs}
+
+        # (Database_connect_replicas) Get replica urls and read routing settings
+        replica_kwargs = get_replica_kwargs(replicas=replicas, balance=replica_balance, read_your_writes=read_your_writes, load_env=load_env, env=env)
+
         # (Database_attr) Create attributes for database obj
         self._connection = sqlalchemy.create_engine(connection_str, *args, **kwargs)
+        self._listen_pool(self._connection)
+        self._listen_stats(self._connection, stats=stats, slow_query_threshold=slow_query_threshold, slow_query_log=slow_query_log)
+        self._local = threading.local()
         self._inspector = sqlalchemy.inspect(self._connection)
         self._metadata = sqlalchemy.MetaData(bind=self._connection)
+        self._table_cache = LRUCache(max_size=table_cache_size, ttl=table_cache_ttl)
+        self._query_cache = LRUCache(max_size=query_cache_size)
+        self._literal_limit = self._connection.dialect.name in ('mssql', 'oracle')
+        self._set_result_cache(result_cache, ttl=result_cache_ttl, max_bytes=result_cache_max_bytes, directory=result_cache_dir)
+        self._advisor = index_advisor if isinstance(index_advisor, IndexAdvisor) else IndexAdvisor() if index_advisor else None
+
+        # (Database_attr_replicas) Create an engine for each replica with the same pool settings
+        self._replicas = [sqlalchemy.create_engine(url, *args, **kwargs) for url in replica_kwargs['replicas']]
+        for engine in self._replicas:
+            self._listen_stats(engine, stats=self._stats if self._stats is not None else False)
+        self._replica_balance = replica_kwargs['balance']
+        self._replica_counters = [dict(reads=0, in_flight=0, errors=0, waits=0, wait_seconds_total=0.0, wait_seconds_max=0.0) for _ in self._replicas]
+        self._replica_lock = threading.Lock()
+        self._replica_next = itertools.count()
+        self._read_your_writes = replica_kwargs['read_your_writes']
+        self._last_write = None
     
     def _build_query(
         self,
@@ -168,17 +299,23 @@ class Database:
         limit=None,
         offset=None,
         where_boolean='AND',
+        after=None,
+        having=None,
+        having_boolean='AND',
+        window=None,
+        partition=None,
         update=False,
         delete=False,
         values=None,
+        bind=False,
         *args, **kwargs):
         """
         Get a SQL select statement using sqlalchemy functions.
         
         Parameters
         ----------
-        table : str
-            Name of the database table.
+        table : str or :class:`sqlalchemy.schema.Table`
+            Name of the database table or a table object.
         select : str or list(str) or list(:class:`sqlalchemy:sqlalchemy.schema.Column`) or None
             List of column names or a single column name to filter or select from the table.
             
@@ -202,10 +339,14 @@ class Database:
         
         group_by : str or list(str) or None
             Single or list of column names to group by. This should be used with ``aggregate`` and ``aggregate_func``.
-        aggregate : str or list(str) or None
+        aggregate : str or list(str) or dict or None
             Single or list of column names to aggregate using the ``aggregate_func``. This should be used with ``aggregate_func``.
+            If a dict, then keys are column names and values are a function name or a list of function names for that column, which overrides ``aggregate_func``, such as ``{'column_two': ['sum', 'avg'], 'column_one': 'count_distinct'}``.
+            A column name of ``'*'`` aggregates rows rather than a column, such as ``{'*': 'count'}``.
+            Aggregated columns are named ``<column>_<function>``, or ``<function>`` for ``'*'``.
         aggregate_func : str or list(str)
             Function name (such as 'count' or 'sum') from :class:`sqlalchemy:sqlalchemy.sql.functions.Function` for aggregating records from each ``aggregate`` column.
+            Function names ending with ``_distinct`` (such as 'count_distinct') aggregate the distinct values of the column only.
             If a list of str, then it must have the same number of elements as ``aggregate`` or else only the shortest length list will be used.
         order_by : str or list(str) or None
             Single or list of column names to order or sort by.
@@ -218,12 +359,41 @@ class Database:
             Number of rows to skip for the query.
         where_boolean : str
             One of ``AND`` or ``OR`` to combine ``where`` statements with. Defaults to ``AND`` if not one of ``AND`` or ``OR``.
+        after : dict or None
+            Dictionary of values for each ``order_by`` column from the last row of a previous page, to only get rows after that row in the ``order_by`` order.
+            This is keyset pagination, which is faster than ``offset`` for pages deep into a table as skipped rows are not scanned. The ``order_by`` columns should uniquely identify rows and have no null values.
+        having : list of list or list of tuple or None
+            list of having statements in the form of ``['column_name', 'operator', value]`` to filter groups after aggregation, where ``column_name`` is the name of an aggregated column (such as ``'column_two_sum'``) or a ``group_by`` column.
+            Operators are the same as ``where``. This should be used with ``group_by`` and ``aggregate``.
+        having_boolean : str
+            One of ``AND`` or ``OR`` to combine ``having`` statements with. Defaults to ``AND`` if not one of ``AND`` or ``OR``.
+        window : dict or list(dict) or None
+            Single or list of window functions to add as columns, where each dict has keys:
+
+            * ``func``: function name such as ``row_number``, ``rank``, ``sum``, ``avg``, or ``lag``
+            * ``column`` (optional): name of the column to apply the function to. Not needed for functions such as ``row_number`` and ``rank``
+            * ``args`` (optional): list of additional arguments for the function, such as the offset for ``lag``
+            * ``partition_by`` (optional): single or list of column names to compute the function over separately
+            * ``order_by`` (optional): single or list of column names to order rows by within each partition
+            * ``order_by_sort`` (optional): ``asc`` or ``desc``, or a list of these for each ``order_by`` column
+            * ``label`` (optional): name of the column, which defaults to ``<column>_<func>_over`` or ``<func>_over``
+
+        partition : list or tuple or None
+            Partition of the rows to select in the form of ``['column_name', 'method', values]``, which is combined with the ``where`` statements using ``AND``.
+            Partitions are created by :meth:`msdss_base_database.core.Database._get_partitions` for :meth:`msdss_base_database.core.Database.select_parallel`.
+
+            * If method is ``'range'``, values are ``(lower, upper)`` for rows with ``lower <= column_name < upper``, where a ``None`` bound is not applied and rows with null values are included if ``lower`` is ``None``
+            * If method is ``'modulo'``, values are ``(partitions, index)`` for rows where the non-negative remainder of the integer column divided by ``partitions`` equals ``index``, where rows with null values are included if ``index`` is ``0``
+
         update : bool
             Whether to update rows from the table matching the query or not. Overrides the ``select`` parameter.
         delete : bool
             Whether to delete rows from the table matching the query or not. Overrides the ``select`` and ``update`` parameters.
         values : dict
             A dictionary of values to use for update if the ``update`` parameter is ``True`` and not overridden.
+        bind : bool
+            Whether to use named bound parameters instead of the values in ``where``, ``limit``, ``offset``, ``after``, ``partition``, and ``values``, so that the statement can be reused for queries with the same structure.
+            See :meth:`msdss_base_database.core.Database._get_query_params` for the parameter values.
         *args, **kwargs
             Additional arguments to accept any extra parameters passed through.
         
@@ -279,6 +449,20 @@ class Database:
                 order_by=['column_one', 'column_two'],
                 order_by_sort=['asc', 'desc']
             )
+
+            # Select rows after the last row of a previous page
+            sql_after = db._build_query(
+                'test_table',
+                order_by='id',
+                after={'id': 2},
+                limit=2
+            )
+            
+            # Select a partition of rows by range
+            sql_partition = db._build_query(
+                'test_table',
+                partition=('id', 'range', (2, 4))
+            )
             
             # Select columns, group, and aggregate data
             sql_agg = db._build_query(
@@ -289,6 +473,21 @@ class Database:
                 aggregate_func=['sum', 'count']
             )
 
+            # Aggregate with several functions for each column and filter the groups
+            sql_having = db._build_query(
+                'test_table',
+                select='column_one',
+                group_by='column_one',
+                aggregate={'column_two': ['sum', 'avg'], 'id': 'count_distinct'},
+                having=[('column_two_sum', '>', 2)]
+            )
+
+            # Select a running total with a window function
+            sql_window = db._build_query(
+                'test_table',
+                window=dict(func='sum', column='column_two', partition_by='column_one', order_by='id')
+            )
+
             # Update rows
             sql_update = db._build_query(
                 'test_table',
@@ -309,7 +508,11 @@ class Database:
             print('sql_limit:\\n\\n' + str(sql_limit))
             print('\\nsql_where:\\n\\n' + str(sql_where))
             print('\\nsql_order:\\n\\n' + str(sql_order))
+            print('\\nsql_after:\\n\\n' + str(sql_after))
+            print('\\nsql_partition:\\n\\n' + str(sql_partition))
             print('\\nsql_agg:\\n\\n' + str(sql_agg))
+            print('\\nsql_having:\\n\\n' + str(sql_having))
+            print('\\nsql_window:\\n\\n' + str(sql_window))
             print('\\nsql_update:\\n\\n' + str(sql_update))
             print('\\nsql_delete:\\n\\n' + str(sql_delete))
         """
@@ -319,9 +522,10 @@ class Database:
         group_by = [group_by] if isinstance(group_by, str) else group_by
         aggregate = [aggregate] if isinstance(aggregate, str) else aggregate
         order_by = [order_by] if isinstance(order_by, str) else order_by
+        window = [window] if isinstance(window, dict) else window
                 
         # (Database_build_query_table) Get the table object
-        target = self._get_table(table)
+        target = table if isinstance(table, sqlalchemy.Table) else self._get_table(table)
         
         # (Database_build_query_select) Gather columns to select
         if select is None: # no cols
@@ -331,16 +535,32 @@ class Database:
         else: # specified cols
             select_columns = [target.c[c] for c in select]
         
-        # (Database_build_query_aggregate) Gather aggregation columns to select
+        # (Database_build_query_aggregate) Gather aggregation columns to select, with one or more functions for each column
+        aggregate_columns = []
         if aggregate is not None:
-            aggregate_columns = [target.c[c] for c in aggregate]
-            if isinstance(aggregate_func, list):
-                aggregate_labels = [a + '_' + f for a, f in zip(aggregate, aggregate_func)]
-                aggregate_columns = [getattr(sqlalchemy.func, f.lower())(c).label(l) for c, f, l in zip(aggregate_columns, aggregate_func, aggregate_labels)]
+            if isinstance(aggregate, dict):
+                aggregate_pairs = [(a, f) for a, funcs in aggregate.items() for f in ([funcs] if isinstance(funcs, str) else funcs)]
+            elif isinstance(aggregate_func, list):
+                aggregate_pairs = list(zip(aggregate, aggregate_func))
             else:
-                aggregate_labels = [a + '_' + aggregate_func for a in aggregate]
-                aggregate_columns = [getattr(sqlalchemy.func, aggregate_func)(c).label(l) for c, l in zip(aggregate_columns, aggregate_labels)]
+                aggregate_pairs = [(a, aggregate_func) for a in aggregate]
+            aggregate_columns = [self._get_function(target, a, f).label(f if a == '*' else a + '_' + f) for a, f in aggregate_pairs]
             select_columns = select_columns + aggregate_columns
+
+        # (Database_build_query_window) Gather window function columns to select
+        if window is not None:
+            for w in window:
+                w_partition = [w['partition_by']] if isinstance(w.get('partition_by'), str) else w.get('partition_by')
+                w_order = [w['order_by']] if isinstance(w.get('order_by'), str) else w.get('order_by')
+                w_sort = w.get('order_by_sort', 'asc')
+                over = {}
+                if w_partition is not None:
+                    over['partition_by'] = [target.c[c] for c in w_partition]
+                if w_order is not None:
+                    w_sort = w_sort if isinstance(w_sort, list) else [w_sort] * len(w_order)
+                    over['order_by'] = [getattr(target.c[c], s.lower())() for c, s in zip(w_order, w_sort)]
+                w_label = w.get('label', (w['column'] + '_' if w.get('column') is not None else '') + w['func'] + '_over')
+                select_columns.append(self._get_function(target, w.get('column'), w['func'], *w.get('args', [])).over(**over).label(w_label))
             
         # (Database_build_query_operation) Add select, update, or delete statement
         if delete:
@@ -359,51 +579,74 @@ class Database:
             
             # (Database_build_query_where_convert) Convert list to where clauses
             where_clauses = []
-            for clause_list in where:
+            for i, clause_list in enumerate(where):
 
                 # (Database_build_query_where_convert_vars) Get clause parts from list
                 clause_col = clause_list[0]
                 clause_op = clause_list[1]
                 clause_val = clause_list[2]
+                if bind and clause_val is not None:
+                    clause_val = sqlalchemy.bindparam('msdss_where_' + str(i))
 
                 # (Database_build_query_where_convert_op) Convert to clause based on operator
-                if clause_op in ('=', '=='):
-                    clause = target.c[clause_col] == clause_val
-                elif clause_op in ('!=', '!=='):
-                    clause = target.c[clause_col] != clause_val
-                elif clause_op == '>':
-                    clause = target.c[clause_col] > clause_val
-                elif clause_op == '>=':
-                    clause = target.c[clause_col] >= clause_val
-                elif clause_op == '<':
-                    clause = target.c[clause_col] < clause_val
-                elif clause_op == '<=':
-                    clause = target.c[clause_col] <= clause_val
-                elif clause_op.lower() == 'like':
-                    clause = target.c[clause_col].like(clause_val)
-                elif clause_op.lower() == 'notlike':
-                    clause = target.c[clause_col].notlike(clause_val)
-                elif clause_op.lower() == 'ilike':
-                    clause = target.c[clause_col].ilike(clause_val)
-                elif clause_op.lower() == 'notilike':
-                    clause = target.c[clause_col].notilike(clause_val)
-                elif clause_op.lower() == 'contains':
-                    clause = target.c[clause_col].contains(clause_val)
-                elif clause_op.lower() == 'startswith':
-                    clause = target.c[clause_col].startswith(clause_val)
-                elif clause_op.lower() == 'endswith':
-                    clause = target.c[clause_col].endswith(clause_val)
-                else:
-                    raise ValueError(clause_op + ' is not supported')
+                clause = self._get_clause(target.c[clause_col], clause_op, clause_val)
                 where_clauses.append(clause)
 
             # (Database_build_query_where_add) Add where clauses to select query
             out = out.where(where_boolean(*where_clauses))
+
+        # (Database_build_query_after) Add keyset pagination statement for rows after the order by values
+        if after is not None:
+            if order_by is None or any(c not in after for c in order_by):
+                raise ValueError('after must have a value for each order_by column')
+            after_sorts = order_by_sort if isinstance(order_by_sort, list) else [order_by_sort] * len(order_by)
+            after_values = {c:sqlalchemy.bindparam('msdss_after_' + c) if bind else after[c] for c in order_by}
+            after_clauses = []
+            for i, (c, sort) in enumerate(zip(order_by, after_sorts)):
+                equal_clauses = [target.c[e] == after_values[e] for e in order_by[:i]]
+                compare_clause = target.c[c] < after_values[c] if sort.lower() == 'desc' else target.c[c] > after_values[c]
+                after_clauses.append(sqlalchemy.and_(*equal_clauses, compare_clause))
+            out = out.where(sqlalchemy.or_(*after_clauses))
+
+        # (Database_build_query_partition) Add partition statement for a range or modulo of a column, including null values in the first partition
+        if partition is not None:
+            partition_column = target.c[partition[0]]
+            partition_method = partition[1].lower()
+            partition_values = [sqlalchemy.bindparam('msdss_partition_' + str(i)) if bind and v is not None else v for i, v in enumerate(partition[2])]
+            if partition_method == 'range':
+                lower, upper = partition_values
+                partition_clauses = []
+                if lower is not None:
+                    partition_clauses.append(partition_column >= lower)
+                if upper is not None:
+                    partition_clauses.append(partition_column < upper)
+                if lower is None and upper is not None:
+                    partition_clauses = [sqlalchemy.or_(*partition_clauses, partition_column.is_(None))]
+                if len(partition_clauses) > 0:
+                    out = out.where(sqlalchemy.and_(*partition_clauses))
+            elif partition_method == 'modulo':
+                partitions, index = partition_values
+                remainder = (partition_column % partitions + partitions) % partitions # non-negative for negative values
+                out = out.where(sqlalchemy.func.coalesce(remainder, 0) == index)
+            else:
+                raise ValueError(partition[1] + ' is not supported')
             
         # (Database_build_query_group) Add group by statement
         if group_by is not None:
             group_by_columns = [target.c[c] for c in group_by]
             out = out.group_by(*group_by_columns)
+
+        # (Database_build_query_having) Add having statement for aggregated or grouped columns
+        if having is not None:
+            having = [having] if not any(isinstance(h, list) or isinstance(h, tuple) for h in having) else having
+            having_boolean = sqlalchemy.or_ if having_boolean.lower() == 'or' else sqlalchemy.and_
+            having_columns = {c.name:c.element for c in aggregate_columns}
+            having_clauses = []
+            for i, (having_col, having_op, having_val) in enumerate(having):
+                having_column = having_columns[having_col] if having_col in having_columns else target.c[having_col]
+                having_val = sqlalchemy.bindparam('msdss_having_' + str(i)) if bind and having_val is not None else having_val
+                having_clauses.append(self._get_clause(having_column, having_op, having_val))
+            out = out.having(having_boolean(*having_clauses))
             
         # (Database_build_query_order) Add order by statement
         if order_by is not None:
@@ -416,19 +659,251 @@ class Database:
 
         # (Database_build_query_offset) Add offset statement
         if offset is not None:
-            out = out.offset(offset)
+            out = out.offset(sqlalchemy.bindparam('msdss_offset') if bind and not self._literal_limit else offset)
             
         # (Database_build_query_limit) Add limit statement
         if limit is not None:
-            out = out.limit(limit)
+            out = out.limit(sqlalchemy.bindparam('msdss_limit') if bind and not self._literal_limit else limit)
 
         # (Database_build_query_values) Add values statement
         if values is not None and update:
+            values = {k:sqlalchemy.bindparam('msdss_values_' + k) for k in values} if bind else values
             out = out.values(**values)
             
         # (Database_build_query_return) Return the sqlalchemy query
         return out
 
+    def _bulk_insert(self, connection, table, records, method='auto', batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Insert records into an existing table using a bulk loading method.
+        
+        Parameters
+        ----------
+        connection : :class:`sqlalchemy:sqlalchemy.engine.Connection`
+            Connection to insert the records with.
+        table : :class:`sqlalchemy.schema.Table`
+            Table object to insert the records into.
+        records : list(dict)
+            List of records, where each record is a dict of column names and values. All records should have the same keys.
+        method : str
+            One of the following bulk loading methods:
+
+            * ``auto``: use ``copy`` for ``postgresql`` with ``psycopg2``, ``values`` for ``mysql``, and ``executemany`` otherwise (``sqlite`` drivers run ``executemany`` natively, which is faster than compiling multiple rows of ``VALUES``)
+            * ``copy``: use ``COPY ... FROM STDIN`` (``postgresql`` with ``psycopg2`` only)
+            * ``values``: use ``INSERT`` statements with multiple rows of ``VALUES``
+            * ``executemany``: use a single ``INSERT`` statement with many parameter sets, which uses "insertmanyvalues" batching in ``sqlalchemy`` versions that support it
+
+        batch_size : int
+            Number of records to insert with each statement. For the ``values`` method, this is reduced so that each statement stays under the limit of bound parameters (see :meth:`msdss_base_database.core.Database._get_batch_size`).
+
+        Returns
+        -------
+        str
+            The bulk loading method that was used.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+            
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Insert records in batches of 2
+            records = [
+                dict(id=1, column_one='a', column_two=2),
+                dict(id=2, column_one='b', column_two=4),
+                dict(id=3, column_one='c', column_two=6)
+            ]
+            target = db._get_table('test_table')
+            with db._connect() as connection:
+                method = db._bulk_insert(connection, target, records, batch_size=2)
+            
+            # Display results
+            print('method: ' + method)
+            print(db.select('test_table'))
+        """
+        dialect = connection.dialect
+
+        # (Database_bulk_insert_method) Choose a method based on the database
+        if method == 'auto':
+            if dialect.name == 'postgresql' and dialect.driver == 'psycopg2':
+                method = 'copy'
+            elif dialect.name == 'mysql':
+                method = 'values'
+            else:
+                method = 'executemany'
+
+        # (Database_bulk_insert_batch) Keep multi-row statements under the limit of bound parameters
+        if method == 'values':
+            batch_size = self._get_batch_size(batch_size, len(records[0]))
+
+        # (Database_bulk_insert_execute) Insert each batch of records
+        for i in range(0, len(records), batch_size):
+            batch = records[i:i + batch_size]
+            if method == 'copy':
+                self._copy_records(connection, table, batch)
+            elif method == 'values':
+                connection.execute(table.insert().values(batch))
+            elif method == 'executemany':
+                connection.execute(table.insert(), batch)
+            else:
+                raise ValueError(str(method) + ' is not supported')
+        return method
+
+    @contextlib.contextmanager
+    def _connect(self, read=False):
+        """
+        Get a connection from the connection pool in a transaction.
+
+        The transaction is committed when the context exits without an error and rolled back otherwise.
+        The time taken to check out the connection is recorded for :meth:`msdss_base_database.core.Database.pool_stats`.
+        If a transaction was started with :meth:`msdss_base_database.core.Database.transaction` in the current thread, its connection is used instead.
+
+        Parameters
+        ----------
+        read : bool
+            Whether the connection is only used to read, so that it can be from a replica chosen by :meth:`msdss_base_database.core.Database._get_replica`.
+            If connecting to the replica fails, a connection to the primary database is used.
+
+        Yields
+        ------
+        :class:`sqlalchemy:sqlalchemy.engine.Connection`
+            A connection in a transaction.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            
+            # Setup database
+            db = Database()
+
+            # Run a query in a transaction
+            with db._connect() as connection:
+                out = connection.execute('SELECT 1').scalar()
+            print(out)
+        """
+        # (Database_connect_bound) Use the connection of the current transaction if available
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            yield connection
+            return
+
+        # (Database_connect_replica) Check out a connection from a replica for reads, and record the wait for the replica
+        replica = self._get_replica() if read else None
+        if replica is not None:
+            start = time.perf_counter()
+            try:
+                connection = self._replicas[replica].connect()
+            except sqlalchemy.exc.DBAPIError:
+                with self._replica_lock:
+                    self._replica_counters[replica]['in_flight'] -= 1
+                    self._replica_counters[replica]['errors'] += 1
+                replica = None
+            else:
+                wait = time.perf_counter() - start
+                with self._replica_lock:
+                    counters = self._replica_counters[replica]
+                    counters['waits'] += 1
+                    counters['wait_seconds_total'] += wait
+                    counters['wait_seconds_max'] = max(counters['wait_seconds_max'], wait)
+
+        # (Database_connect_primary) Check out a connection from the primary otherwise, and record the wait for the primary
+        if replica is None:
+            start = time.perf_counter()
+            connection = self._connection.connect()
+            wait = time.perf_counter() - start
+            with self._pool_lock:
+                self._pool_counters['waits'] += 1
+                self._pool_counters['wait_seconds_total'] += wait
+                self._pool_counters['wait_seconds_max'] = max(self._pool_counters['wait_seconds_max'], wait)
+
+        # (Database_connect_yield) Yield the connection in a transaction
+        try:
+            with connection.begin():
+                yield connection
+        finally:
+            connection.close()
+            if replica is not None:
+                with self._replica_lock:
+                    self._replica_counters[replica]['in_flight'] -= 1
+
+    def _copy_records(self, connection, table, records):
+        """
+        Insert records into a ``postgresql`` table with ``COPY ... FROM STDIN``.
+
+        Values are sent in csv format, where ``None`` values are sent as ``NULL`` and binary values are sent in the hex format of ``bytea``.
+        
+        Parameters
+        ----------
+        connection : :class:`sqlalchemy:sqlalchemy.engine.Connection`
+            Connection to a ``postgresql`` database using the ``psycopg2`` driver.
+        table : :class:`sqlalchemy.schema.Table`
+            Table object to insert the records into.
+        records : list(dict)
+            List of records, where each record is a dict of column names and values. All records should have the same keys.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. code::
+
+            from msdss_base_database.core import Database
+            db = Database(driver='postgresql')
+
+            # Copy records to an existing table
+            records = [dict(id=1, column_one='a', column_two=2)]
+            with db._connect() as connection:
+                db._copy_records(connection, db._get_table('test_table'), records)
+        """
+
+        # (Database_copy_records_sql) Form the copy statement
+        columns = list(records[0])
+        preparer = connection.dialect.identifier_preparer
+        sql = 'COPY ' + preparer.format_table(table) + ' (' + ', '.join(preparer.quote(c) for c in columns) + ') FROM STDIN WITH (FORMAT csv)'
+
+        # (Database_copy_records_csv) Write records as csv, where unquoted empty values are null and bytes are hex
+        def encode(value):
+            value = '\\x' + bytes(value).hex() if isinstance(value, (bytes, bytearray, memoryview)) else str(value)
+            return '"' + value.replace('"', '""') + '"'
+        buffer = io.StringIO()
+        for record in records:
+            buffer.write(','.join('' if record[c] is None else encode(record[c]) for c in columns) + '\n')
+        buffer.seek(0)
+
+        # (Database_copy_records_execute) Copy the csv with the driver cursor
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(sql, buffer)
+        finally:
+            cursor.close()
+
     def _execute_query(self, sql, *args, **kwargs):
         """
         Executes a query statement.
@@ -480,25 +955,42 @@ class Database:
             cursor = db._execute_query('SELECT * FROM test_table LIMIT 5;')
             cursor = db._execute_query('SELECT column_one, column_two FROM test_table WHERE column_two > 3;')
         """
-        with self._connection.connect() as connection:
-            out = connection.execute(sql, *args, **kwargs)
-            return out
+        with self._measure(None, 'execute') as record:
+            record['statement'] = sql
+            with self._connect() as connection:
+                out = connection.execute(sql, *args, **kwargs)
+                return out
 
-    def _get_table(self, table, *args, **kwargs):
+    def _explain_query(self, sql, params=None, analyze=False):
         """
-        Get a table object from the database.
+        Get the plan of the database for a statement.
+
+        The plan of the dialect is parsed into a list of steps with the same keys for each supported dialect:
 
+        * ``sqlite``: ``EXPLAIN QUERY PLAN`` rows
+        * ``postgresql``: ``EXPLAIN (FORMAT JSON)`` plan nodes
+        * ``mysql``: ``EXPLAIN FORMAT=JSON`` tables and sorts
+        
         Parameters
         ----------
-        table : str
-            Name of the table to remove.
-        *args, **kwargs
-            Additional arguments passed to :class:`sqlalchemy.schema.Table`.
+        sql : :class:`sqlalchemy:sqlalchemy.sql.expression.Executable`
+            Statement to get the plan for, such as from :meth:`msdss_base_database.core.Database._prepare_query`.
+        params : dict or None
+            Values of the bound parameters of the statement.
+        analyze : bool
+            Whether to also run the statement to get the actual rows and times of each step. Only supported for ``postgresql``, where statements that write to tables are also run.
 
-        Return
-        ------
-        :class:`sqlalchemy.schema.Table`
-            A ``Table`` object from ``sqlalchemy``.
+        Returns
+        -------
+        dict
+            Dictionary with keys:
+
+            * ``statement``: the compiled statement that the plan is for
+            * ``plan``: list of dict steps with keys ``id``, ``parent`` (id of the step it is part of or ``None``), ``detail`` (description of the step),
+              ``table`` (table read or ``None``), ``index`` (index used or ``None``), ``full_scan`` (whether every row of the table is read), and ``sort`` (whether rows are sorted in a separate step).
+              Steps for ``postgresql`` also have the keys ``cost`` and ``rows`` (estimated), and ``time`` if ``analyze`` is ``True``
+            * ``full_scans``: list of the names of the tables with every row read
+            * ``raw``: the plan as returned by the database
 
         Author
         ------
@@ -523,31 +1015,116 @@ class Database:
             ]
             db.create_table('test_table', columns)
 
-            # Get the table object
-            tb = db._get_table('test_table')
-            print(str(tb))
+            # Get the plan of a query
+            sql, params = db._prepare_query('test_table', where=('column_one', '=', 'a'))
+            explained = db._explain_query(sql, params)
+            print(explained['plan'])
         """
-        out = sqlalchemy.Table(table, self._metadata, autoload_with=self._connection, *args, **kwargs)
+        dialect = self._connection.dialect
+
+        # (Database_explain_query_compile) Compile the statement and its parameter values for the driver
+        compiled = sql.compile(dialect=dialect)
+        statement = compiled.string
+        values = compiled.construct_params(params if params is not None else {})
+        processors = {name:bind.type.dialect_impl(dialect).bind_processor(dialect) for bind, name in compiled.bind_names.items()}
+        values = {k:processors[k](v) if processors.get(k) is not None else v for k, v in values.items()}
+        values = tuple(values[k] for k in compiled.positiontup) if dialect.positional else values
+
+        # (Database_explain_query_prefix) Get the explain statement of the dialect
+        if analyze and dialect.name != 'postgresql':
+            raise ValueError('analyze for ' + dialect.name + ' is not supported')
+        if dialect.name == 'sqlite':
+            prefix = 'EXPLAIN QUERY PLAN '
+        elif dialect.name == 'postgresql':
+            prefix = 'EXPLAIN (FORMAT JSON' + (', ANALYZE' if analyze else '') + ') '
+        elif dialect.name == 'mysql':
+            prefix = 'EXPLAIN FORMAT=JSON '
+        else:
+            raise ValueError(dialect.name + ' is not supported')
+        with self._connect() as connection:
+            rows = connection.exec_driver_sql(prefix + statement, values).fetchall()
+
+        # (Database_explain_query_sqlite) Parse the tables and indexes from the detail of each row
+        plan = []
+        if dialect.name == 'sqlite':
+            raw = [tuple(row) for row in rows]
+            for row in rows:
+                match = re.match(r'(SCAN|SEARCH)(?: TABLE)? (\w+)(?: AS \w+)?(?: USING (?:COVERING )?INDEX (\w+)| USING (INTEGER PRIMARY KEY))?', row[-1])
+                index = (match.group(3) or match.group(4)) if match is not None else None
+                plan.append(dict(
+                    id=row[0],
+                    parent=row[1] if row[1] != 0 else None,
+                    detail=row[-1],
+                    table=match.group(2) if match is not None else None,
+                    index=index,
+                    full_scan=match is not None and match.group(1) == 'SCAN' and index is None,
+                    sort='TEMP B-TREE' in row[-1]
+                ))
+
+        # (Database_explain_query_json) Parse the nested nodes of the json plan
+        else:
+            raw = rows[0][0] if not isinstance(rows[0][0], str) else json.loads(rows[0][0])
+            stack = [(raw[0]['Plan'], None)] if dialect.name == 'postgresql' else [(raw, None)]
+            while len(stack) > 0:
+                node, parent = stack.pop()
+                if dialect.name == 'postgresql':
+                    step = dict(
+                        id=len(plan),
+                        parent=parent,
+                        detail=node['Node Type'],
+                        table=node.get('Relation Name'),
+                        index=node.get('Index Name'),
+                        full_scan=node['Node Type'] == 'Seq Scan',
+                        sort=node['Node Type'] in ('Sort', 'Incremental Sort'),
+                        cost=node.get('Total Cost'),
+                        rows=node.get('Plan Rows')
+                    )
+                    step.update(dict(time=node.get('Actual Total Time')) if analyze else {})
+                    plan.append(step)
+                    stack += [(n, step['id']) for n in reversed(node.get('Plans', []))]
+                elif isinstance(node, dict):
+                    step = None
+                    if 'table_name' in node or node.get('using_filesort'):
+                        step = dict(
+                            id=len(plan),
+                            parent=parent,
+                            detail=node.get('access_type', 'filesort' if node.get('using_filesort') else None),
+                            table=node.get('table_name'),
+                            index=node.get('key'),
+                            full_scan=node.get('access_type') == 'ALL',
+                            sort=bool(node.get('using_filesort'))
+                        )
+                        plan.append(step)
+                    stack += [(v, step['id'] if step is not None else parent) for v in reversed(list(node.values())) if isinstance(v, (dict, list))]
+                elif isinstance(node, list):
+                    stack += [(v, parent) for v in reversed(node)]
+
+        # (Database_explain_query_return) Return the parsed plan
+        out = dict(statement=statement, plan=plan, full_scans=sorted({s['table'] for s in plan if s['full_scan']}), raw=raw)
         return out
 
-    def _list_to_columns(self, clist):
+    def _fetch_arrow(self, connection, sql, params=None, chunksize=DEFAULT_CHUNKSIZE):
         """
-        Converts a list of dict or list to ``sqlalchemy`` columns.
+        Fetch the results of a query statement as columnar arrow record batches.
 
+        If none of the selected columns need conversion by sqlalchemy (such as dates stored as text in SQLite), rows are fetched directly from the database driver cursor,
+        skipping the creation of a :class:`sqlalchemy:sqlalchemy.engine.Row` for each row. Columns are built with arrow types from the sqlalchemy column types where possible.
+        
         Parameters
         ----------
-        clist : list(dict) or list(list)
-            List of dict (kwargs) or lists (positional args) that are passed to :class:`sqlalchemy.schema.Column`. Data types can also be specified as str.
-            
-            * Example list(dict): ``[dict(name='id', type_='Integer', autoincrement=True, primary_key=True), dict(name='col', type='String')]``
-            * Example list(list): ``[('id', 'Integer'), ('col', 'String')]``
-        *args, **kwargs
-            Additional arguments passed to :class:`sqlalchemy.schema.Table`.
-
-        Return
+        connection : :class:`sqlalchemy:sqlalchemy.engine.Connection`
+            Connection to execute the query statement with.
+        sql : :class:`sqlalchemy:sqlalchemy.sql.expression.Select`
+            Select statement to execute.
+        params : dict or None
+            Bound parameter values for the statement.
+        chunksize : int
+            Number of rows in each record batch.
+        
+        Yields
         ------
-        list(:class:`sqlalchemy.schema.Column`)
-            A list of ``Column`` objects from ``sqlalchemy``.
+        :class:`pyarrow:pyarrow.RecordBatch`
+            Record batch with at most ``chunksize`` rows. A single empty record batch is yielded if there are no rows.
 
         Author
         ------
@@ -560,104 +1137,195 @@ class Database:
             from msdss_base_database.core import Database
             db = Database()
 
-            # Create column definitions
-            clist = [
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+            
+            # Create sample table
+            columns = [
                 dict(name='id', type_='Integer', primary_key=True),
-                dict(name='column_one', type_='String'),
-                dict(name='column_two', type_='Integer')
+                ('column_one', 'String')
             ]
+            db.create_table('test_table', columns)
 
-            # Convert to sqlalchemy column objects
-            columns = db._list_to_columns(clist)
-            print(str(columns))
+            # Write sample data
+            db.insert('test_table', {'id': [1, 2, 3], 'column_one': ['a', 'b', 'c']})
+            
+            # Fetch record batches
+            sql, params = db._prepare_query('test_table', where=('id', '>', 1))
+            with db._connect() as connection:
+                for batch in db._fetch_arrow(connection, sql, params, chunksize=1):
+                    print(batch.to_pydict())
         """
 
-        # (Database_list_to_columns_convert) Convert data types from str
-        clist = [list(c) if isinstance(c, tuple) else c for c in clist] # conv tuples to list
-        for i, c in enumerate(clist):
+        # (Database_fetch_arrow_types) Get arrow types and check if any columns need conversion from the driver values
+        selected = list(sql.selected_columns)
+        types = [get_arrow_type(c.type) for c in selected]
+        raw = all(c.type.result_processor(connection.dialect, None) is None for c in selected)
+
+        # (Database_fetch_arrow_batches) Fetch rows from the driver cursor or sqlalchemy result in chunks and build record batches
+        record = getattr(self._local, 'record', None) or dict(fetch=0.0, frame=0.0)
+        result = connection.execution_options(stream_results=True).execute(sql, params)
+        columns = list(result.keys())
+        empty = True
+        try:
+            if raw: # fetch the first chunk through sqlalchemy to include rows it buffered for streaming
+                first = result.fetchmany(chunksize)
+                rest = iter(lambda: result.cursor.fetchmany(chunksize) if result.cursor is not None else [], [])
+                chunks = itertools.chain([first], rest)
+            else:
+                chunks = result.partitions(chunksize)
+            while True:
+                start = time.perf_counter()
+                rows = next(chunks, [])
+                fetched = time.perf_counter()
+                record['fetch'] += fetched - start
+                if len(rows) == 0:
+                    break
+                empty = False
+                batch = get_arrow_batch(rows, columns, types)
+                record['frame'] += time.perf_counter() - fetched
+                yield batch
+        finally:
+            result.close()
+        if empty:
+            yield get_arrow_batch([], columns, types)
+
+    def _get_batch_size(self, batch_size, variables, reserved=0):
+        """
+        Get the number of rows per statement that keeps the bound parameters of a statement under the limit of the database.
 
-            # (Database_list_to_columns_convert_type) Get data type depending on list or dict
-            if isinstance(c, dict):
-                cidx = 'type_'
-            elif isinstance(c, list):
-                cidx = 1
-            ctype = c[cidx]
-            
-            # (Databse_list_columns_convert_str) Convert to column if str
-            if isinstance(ctype, str):
-                clist[i][cidx] = getattr(sqlalchemy, ctype)
+        The limits of each database are in ``DEFAULT_MAX_VARIABLES`` of :mod:`msdss_base_database.defaults`, where databases without a limit keep the batch size as is.
 
-        # (Database_list_to_columns_return) Return the list of sqlalchemy columns
-        out = [sqlalchemy.Column(*c) if isinstance(c, list) else sqlalchemy.Column(**c) for c in clist]
+        Parameters
+        ----------
+        batch_size : int
+            Number of rows requested per statement.
+        variables : int
+            Number of bound parameters for each row, such as the number of columns of a multi-row insert.
+        reserved : int
+            Number of other bound parameters in the statement, such as the values of a where clause.
+
+        Returns
+        -------
+        int
+            Number of rows per statement, which is at least 1.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            db = Database()
+
+            # Insert 1000 rows of 3 columns per statement
+            print(db._get_batch_size(1000, 3))
+        """
+        limit = DEFAULT_MAX_VARIABLES.get(self._connection.dialect.name)
+        out = batch_size if limit is None else max(1, min(batch_size, (limit - reserved) // max(1, variables)))
         return out
 
-    def _write_data(self, table, data, schema=None, if_exists='append', index=False, *args, **kwargs):
+    def _get_clause(self, column, operator, value):
         """
-        Write data to the database.
-        
+        Get a clause comparing a column to a value with an operator.
+
         Parameters
         ----------
-        table : str
-            Name of the table to write to.
-        data : dict or list or :class:`pandas:pandas.DataFrame`
-            Dataframe with the data to write to the database. If ``dict`` or ``list`` see :class:`pandas:pandas.DataFrame`.
-        schema : str
-            Name of the schema to for the table.
-        if_exists : 'fail' or 'replace' or 'append'
-            String indicating whether to throw an error (fail), replace the data, or append the data to the table if it already exists.
-        index : bool
-            Set to True to include the row indices as a column and False to omit them.
-        *args, **kwargs
-            Additional arguments passed to :class:`pandas:pandas.DataFrame` if parameter ``data`` is ``dict`` or ``list``.
-        
+        column : :class:`sqlalchemy:sqlalchemy.sql.expression.ColumnElement`
+            Column or expression to compare, such as a table column or an aggregate function.
+        operator : str
+            Operator to compare with, which is one of:
+
+            .. jupyter-execute::
+                :hide-code:
+
+                from msdss_base_database.defaults import DEFAULT_SUPPORTED_OPERATORS
+                for operator in DEFAULT_SUPPORTED_OPERATORS:
+                    print(operator)
+
+        value : any
+            Value or bound parameter to compare to.
+
+        Returns
+        -------
+        :class:`sqlalchemy:sqlalchemy.sql.expression.ColumnElement`
+            Clause for a where or having statement.
+
         Author
         ------
         Richard Wen <rrwen.dev@gmail.com>
-        
+
         Example
         -------
         .. jupyter-execute::
 
-            from msdss_base_database import Database
-            
-            # Setup database
+            import sqlalchemy
+            from msdss_base_database.core import Database
             db = Database()
 
-            # Check if the table exists and drop if it does
-            if db.has_table("test_table"):
-                db.drop_table("test_table")
-            
-            # Write data to table
-            data = {
-                'id': [1, 2, 3],
-                'column_one': ['a', 'b', 'c'],
-                'column_two': [2, 4, 6]
-            }
-            db._write_data('test_table', data, if_exists = 'replace')
+            clause = db._get_clause(sqlalchemy.column('column_two'), '>', 2)
+            print(clause)
         """
-        data = pandas.DataFrame(data, *args, **kwargs) if not isinstance(data, pandas.DataFrame) else data
-        data.to_sql(table, con = self._connection, schema = schema, if_exists = if_exists, index = index)
+        if operator in ('=', '=='):
+            out = column == value
+        elif operator in ('!=', '!=='):
+            out = column != value
+        elif operator == '>':
+            out = column > value
+        elif operator == '>=':
+            out = column >= value
+        elif operator == '<':
+            out = column < value
+        elif operator == '<=':
+            out = column <= value
+        elif operator.lower() == 'like':
+            out = column.like(value)
+        elif operator.lower() == 'notlike':
+            out = column.notlike(value)
+        elif operator.lower() == 'ilike':
+            out = column.ilike(value)
+        elif operator.lower() == 'notilike':
+            out = column.notilike(value)
+        elif operator.lower() == 'contains':
+            out = column.contains(value)
+        elif operator.lower() == 'startswith':
+            out = column.startswith(value)
+        elif operator.lower() == 'endswith':
+            out = column.endswith(value)
+        else:
+            raise ValueError(operator + ' is not supported')
+        return out
 
-    def columns(self, table):
+    def _get_dtypes(self, sql, dtypes='schema'):
         """
-        Get number of columns for a table.
+        Get the pandas data types of the columns selected by a query from their sqlalchemy types.
         
         Parameters
         ----------
-        table : str
-            Name of the table to get columns for.
-        
+        sql : :class:`sqlalchemy:sqlalchemy.sql.expression.Select`
+            Select statement, such as from :meth:`msdss_base_database.core.Database._build_query`.
+        dtypes : str or dict
+            One of ``'schema'`` to use the types of the selected columns from :func:`msdss_base_database.tools.get_pandas_dtype`,
+            or a dict of column names and pandas data types to use instead of the types of the selected columns for those columns.
+
+        Returns
+        -------
+        dict
+            Dictionary of column names and pandas data types, where the type is ``None`` for columns without a matching pandas type.
+
         Author
         ------
         Richard Wen <rrwen.dev@gmail.com>
-        
+
         Example
         -------
         .. jupyter-execute::
 
-            from msdss_base_database import Database
-            
-            # Setup database
+            from msdss_base_database.core import Database
             db = Database()
 
             # Check if the table exists and drop if it does
@@ -671,105 +1339,3870 @@ class Database:
                 ('column_two', 'Integer')
             ]
             db.create_table('test_table', columns)
-            
-            # Write data to table
-            data = {
-                'id': [1, 2, 3],
+
+            # Get data types of selected and aggregated columns
+            sql = db._build_query('test_table', select='column_one', group_by='column_one', aggregate='column_two', aggregate_func='sum')
+            print(db._get_dtypes(sql))
+            print(db._get_dtypes(sql, {'column_one': 'category'}))
+        """
+        if not isinstance(dtypes, dict) and dtypes != 'schema':
+            raise ValueError(str(dtypes) + ' is not supported')
+        out = {c.name:get_pandas_dtype(c.type) for c in sql.selected_columns}
+        out.update(dtypes if isinstance(dtypes, dict) else {})
+        return out
+
+    def _get_function(self, table, column, func, *args):
+        """
+        Get a sqlalchemy function of a column for aggregate or window functions.
+
+        Parameters
+        ----------
+        table : :class:`sqlalchemy.schema.Table`
+            Table object with the column.
+        column : str or None
+            Name of the column to apply the function to. If ``'*'`` or ``None``, the function is applied without a column, such as ``count(*)`` or ``rank()``.
+        func : str
+            Function name from :class:`sqlalchemy:sqlalchemy.sql.functions.Function`, such as ``sum`` or ``rank``.
+            If the name ends with ``_distinct``, the function is applied to the distinct values of the column, such as ``count(DISTINCT column)`` for ``count_distinct``.
+        *args
+            Additional arguments for the function after the column.
+
+        Returns
+        -------
+        :class:`sqlalchemy:sqlalchemy.sql.functions.Function`
+            Function of the column.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True), ('column_one', 'String')])
+
+            # Get functions
+            target = db._get_table('test_table')
+            print(db._get_function(target, 'column_one', 'count_distinct'))
+            print(db._get_function(target, '*', 'count'))
+        """
+        func = func.lower()
+        distinct = func.endswith('_distinct')
+        func = func[:-len('_distinct')] if distinct else func
+        if column is None or column == '*':
+            arguments = list(args)
+        else:
+            arguments = [table.c[column].distinct() if distinct else table.c[column]] + list(args)
+        out = getattr(sqlalchemy.func, func)(*arguments)
+        return out
+
+    def _get_partitions(self, table, partition_column='id', partitions=DEFAULT_PARTITIONS, method='range', where=None, where_boolean='AND'):
+        """
+        Get the partitions of the rows in a table for :meth:`msdss_base_database.core.Database.select_parallel`.
+
+        Parameters
+        ----------
+        table : str
+            Name of the database table.
+        partition_column : str
+            Name of the column to partition the rows by.
+        partitions : int
+            Number of partitions.
+        method : str
+            One of ``range`` or ``modulo``.
+
+            * If ``range``, the range of values from the minimum to the maximum of the rows matching ``where`` is split into ``partitions`` equal parts, which requires a numeric, date, or datetime column. Fewer partitions are returned if the range has fewer distinct integer or date values
+            * If ``modulo``, rows are partitioned by the remainder of the column divided by ``partitions``, which requires an integer column. Remainders of negative values are counted up from ``0`` so that every row is in a partition
+
+        where : list of list or list of tuple or None
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database.select`, used to get the range of values.
+        where_boolean : str
+            See parameter ``where_boolean`` in :meth:`msdss_base_database.core.Database.select`.
+
+        Returns
+        -------
+        list(tuple)
+            List of partitions in order, where each is a value for parameter ``partition`` in :meth:`msdss_base_database.core.Database._build_query`.
+            The first range partition has no lower bound and the last has no upper bound, so rows added outside of the range after the partitions are created are still included.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+            
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Write sample data
+            data = {
+                'id': list(range(1, 11)),
+                'column_one': list('abcdefghij'),
+                'column_two': list(range(2, 22, 2))
+            }
+            db.insert('test_table', data)
+
+            # Get range and modulo partitions
+            range_partitions = db._get_partitions('test_table', 'id', partitions=3)
+            modulo_partitions = db._get_partitions('test_table', 'id', partitions=3, method='modulo')
+
+            # Display results
+            print('range_partitions: ' + str(range_partitions))
+            print('modulo_partitions: ' + str(modulo_partitions))
+        """
+        method = method.lower()
+
+        # (Database_get_partitions_modulo) Get a partition for each remainder of an integer column
+        if method == 'modulo':
+            target = self._get_table(table)
+            try:
+                python_type = target.c[partition_column].type.python_type
+            except NotImplementedError:
+                python_type = None
+            if python_type is not int:
+                raise ValueError('modulo partitions of column ' + partition_column + ' is not supported')
+            out = [(partition_column, 'modulo', (partitions, i)) for i in range(partitions)]
+
+        # (Database_get_partitions_range) Split the range of values into equal parts
+        elif method == 'range':
+            sql = self._build_query(
+                table,
+                select=None,
+                aggregate=[partition_column, partition_column],
+                aggregate_func=['min', 'max'],
+                where=where,
+                where_boolean=where_boolean
+            )
+            with self._connect(read=True) as connection:
+                lower, upper = connection.execute(sql).first()
+            if lower is None or partitions < 2:
+                bounds = []
+            elif isinstance(lower, bool) or isinstance(lower, str):
+                raise ValueError('range partitions of column ' + partition_column + ' is not supported')
+            elif isinstance(lower, int):
+                bounds = sorted({lower + (upper - lower + 1) * i // partitions for i in range(1, partitions)} - {lower})
+            else:
+                try:
+                    bounds = sorted({lower + (upper - lower) * i / partitions for i in range(1, partitions)} - {lower})
+                except TypeError:
+                    raise ValueError('range partitions of column ' + partition_column + ' is not supported')
+            edges = [None] + bounds + [None]
+            out = [(partition_column, 'range', (edges[i], edges[i + 1])) for i in range(len(edges) - 1)]
+        else:
+            raise ValueError(method + ' is not supported')
+        return out
+
+    def _get_query_params(self, where=None, limit=None, offset=None, order_by=None, after=None, having=None, partition=None, update=False, values=None, *args, **kwargs):
+        """
+        Get the values for the bound parameters of a statement from :meth:`msdss_base_database.core.Database._build_query` with ``bind=True``.
+        
+        Parameters
+        ----------
+        where : list of list or list of tuple or None
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database._build_query`.
+        limit : int or None
+            See parameter ``limit`` in :meth:`msdss_base_database.core.Database._build_query`.
+        offset : int or None
+            See parameter ``offset`` in :meth:`msdss_base_database.core.Database._build_query`.
+        order_by : str or list(str) or None
+            See parameter ``order_by`` in :meth:`msdss_base_database.core.Database._build_query`.
+        after : dict or None
+            See parameter ``after`` in :meth:`msdss_base_database.core.Database._build_query`.
+        having : list of list or list of tuple or None
+            See parameter ``having`` in :meth:`msdss_base_database.core.Database._build_query`.
+        partition : list or tuple or None
+            See parameter ``partition`` in :meth:`msdss_base_database.core.Database._build_query`.
+        update : bool
+            See parameter ``update`` in :meth:`msdss_base_database.core.Database._build_query`.
+        values : dict
+            See parameter ``values`` in :meth:`msdss_base_database.core.Database._build_query`.
+        *args, **kwargs
+            Additional arguments to accept any extra parameters passed through.
+        
+        Returns
+        -------
+        dict
+            Dictionary of bound parameter names and values.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            db = Database()
+
+            params = db._get_query_params(
+                where=[('column_two', '<', 3), ('column_one', '=', 'b')],
+                limit=6
+            )
+            print(params)
+        """
+        out = {}
+
+        # (Database_get_query_params_where) Add where values that are not null
+        if where is not None:
+            where = [where] if not any(isinstance(w, list) or isinstance(w, tuple) for w in where) else where
+            out.update({'msdss_where_' + str(i):w[2] for i, w in enumerate(where) if w[2] is not None})
+
+        # (Database_get_query_params_limit) Add limit and offset values
+        if not self._literal_limit:
+            if offset is not None:
+                out['msdss_offset'] = offset
+            if limit is not None:
+                out['msdss_limit'] = limit
+
+        # (Database_get_query_params_after) Add values for rows after the order by values
+        if after is not None and order_by is not None:
+            order_by = [order_by] if isinstance(order_by, str) else order_by
+            out.update({'msdss_after_' + c:after[c] for c in order_by})
+
+        # (Database_get_query_params_having) Add having values that are not null
+        if having is not None:
+            having = [having] if not any(isinstance(h, list) or isinstance(h, tuple) for h in having) else having
+            out.update({'msdss_having_' + str(i):h[2] for i, h in enumerate(having) if h[2] is not None})
+
+        # (Database_get_query_params_partition) Add partition values that are not null
+        if partition is not None:
+            out.update({'msdss_partition_' + str(i):v for i, v in enumerate(partition[2]) if v is not None})
+
+        # (Database_get_query_params_values) Add update values
+        if values is not None and update:
+            out.update({'msdss_values_' + k:v for k, v in values.items()})
+        return out
+
+    def _get_records(self, data, *args, table=None, fill=True, **kwargs):
+        """
+        Convert data to a list of records.
+
+        Data that is already a list of dict or a dict of lists is converted without creating a :class:`pandas:pandas.DataFrame`.
+        
+        Parameters
+        ----------
+        data : dict or list or :class:`pandas:pandas.DataFrame`
+            Data to convert. If not a list of dict, a dict of lists, or a :class:`pandas:pandas.DataFrame`, see :class:`pandas:pandas.DataFrame`.
+        table : :class:`sqlalchemy.schema.Table` or None
+            Table object that the records are for. If given, dataframe columns are cast once to the types of the table columns (see :func:`msdss_base_database.tools.get_pandas_dtype`) before converting,
+            so that values such as integers stored as floats with missing values are converted to the types of the table. Columns that cannot be cast are converted as is.
+        fill : bool
+            Whether to fill the keys missing from a list of dict with ``None``, so that all records have the same keys. Set to ``False`` to keep the keys of each record, such as for updates where missing keys are columns that should not be changed.
+        *args, **kwargs
+            Additional arguments passed to :class:`pandas:pandas.DataFrame` if parameter ``data`` is not a list of dict, a dict of lists, or a dataframe.
+
+        Returns
+        -------
+        list(dict)
+            List of records, where each record is a dict of column names and values. Missing values are converted to ``None``.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            db = Database()
+
+            data = {
+                'id': [1, 2, 3],
+                'column_one': ['a', 'b', None],
+                'column_two': [2, 4, 6]
+            }
+            records = db._get_records(data)
+            print(records)
+
+            # Convert a dataframe with the types of a table
+            import pandas
+            db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True), ('column_one', 'String'), ('column_two', 'Integer')])
+            target = db._get_table('test_table')
+            df = pandas.DataFrame({'id': [1, 2], 'column_one': ['a', 'b'], 'column_two': [2, None]})
+            print(db._get_records(df, table=target))
+        """
+
+        # (Database_get_records_list) Return list of dict as is, filling missing keys with None if needed
+        if isinstance(data, list) and len(data) > 0 and all(isinstance(d, dict) for d in data) and len(args) == 0 and len(kwargs) == 0:
+            columns = list(dict.fromkeys(k for d in data for k in d))
+            if fill and any(len(d) != len(columns) for d in data):
+                data = [{c:d.get(c) for c in columns} for d in data]
+            return data
+
+        # (Database_get_records_dict) Convert dict of lists by column
+        if isinstance(data, dict) and all(isinstance(v, (list, tuple)) for v in data.values()) and len(args) == 0 and len(kwargs) == 0:
+            if len({len(v) for v in data.values()}) > 1:
+                raise ValueError('All arrays must be of the same length')
+            columns = list(data)
+            out = [dict(zip(columns, row)) for row in zip(*data.values())]
+            return out
+
+        # (Database_get_records_dataframe) Convert dataframe with missing values as None
+        import pandas
+        data = pandas.DataFrame(data, *args, **kwargs) if not isinstance(data, pandas.DataFrame) else data
+
+        # (Database_get_records_cast) Cast columns to the types of the table columns
+        if table is not None:
+            casts = {c:get_pandas_dtype(table.c[c].type) for c in data.columns if c in table.c}
+            casts = {c:t for c, t in casts.items() if t is not None and str(data[c].dtype) != t}
+            if len(casts) > 0:
+                data = data.copy(deep=False)
+                for c, t in casts.items():
+                    try:
+                        data[c] = data[c].astype(t)
+                    except (TypeError, ValueError):
+                        pass
+        out = data.astype(object).where(data.notna(), None).to_dict('records')
+        return out
+
+    def _get_replica(self):
+        """
+        Choose a replica to read from.
+
+        Reads are sent to the primary database if there are no replicas, or if ``read_your_writes`` is set in :class:`msdss_base_database.core.Database` and this object wrote to the database within that many seconds.
+        The chosen replica is counted as running a read until the connection is closed by :meth:`msdss_base_database.core.Database._connect`.
+
+        Returns
+        -------
+        int or None
+            Index of the replica in ``_replicas``, or ``None`` to read from the primary database.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            
+            # Setup database with two replicas
+            db = Database(replicas=['sqlite://', 'sqlite://'])
+
+            # Choose replicas in turn
+            print(db._get_replica())
+            print(db._get_replica())
+            print(db._get_replica())
+        """
+        if len(self._replicas) == 0:
+            return None
+
+        # (Database_get_replica_pin) Read from the primary for a time after a write
+        if self._read_your_writes is not None and self._last_write is not None and time.monotonic() - self._last_write < self._read_your_writes:
+            return None
+
+        # (Database_get_replica_choose) Choose the next replica, or the one with the fewest running reads starting from the next
+        with self._replica_lock:
+            start = next(self._replica_next) % len(self._replicas)
+            if self._replica_balance == 'least_loaded':
+                order = [(start + i) % len(self._replicas) for i in range(len(self._replicas))]
+                out = min(order, key=lambda i: self._replica_counters[i]['in_flight'])
+            elif self._replica_balance == 'round_robin':
+                out = start
+            else:
+                raise ValueError(str(self._replica_balance) + ' is not supported')
+            self._replica_counters[out]['reads'] += 1
+            self._replica_counters[out]['in_flight'] += 1
+        return out
+
+    def _get_staging_table(self, table, columns, temporary=True):
+        """
+        Get a staging table object with a unique name and the same column types as a table.
+
+        The staging table has no keys or constraints, so that any rows can be loaded into it before they are checked by the target table. It is not created in the database.
+
+        Parameters
+        ----------
+        table : :class:`sqlalchemy.schema.Table`
+            Table object to copy column types from.
+        columns : list(str)
+            Names of the columns to include in the staging table.
+        temporary : bool
+            Whether the staging table is temporary, so that it only exists for the connection that creates it. Staging tables shared by several connections must not be temporary and should be dropped after use.
+
+        Returns
+        -------
+        :class:`sqlalchemy.schema.Table`
+            Table object for the staging table.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True), ('column_one', 'String')])
+
+            # Get a staging table object
+            target = db._get_table('test_table')
+            staging = db._get_staging_table(target, ['id', 'column_one'])
+            print(repr(staging))
+        """
+        name = 'msdss_staging_' + uuid.uuid4().hex[:12]
+        prefixes = ['TEMPORARY'] if temporary else []
+        out = sqlalchemy.Table(name, sqlalchemy.MetaData(), *[sqlalchemy.Column(c, table.c[c].type) for c in columns], prefixes=prefixes)
+        return out
+
+    def _get_table(self, table, *args, **kwargs):
+        """
+        Get a table object from the database.
+
+        Reflected table objects are kept in a table cache until they expire or are removed with :meth:`msdss_base_database.core.Database.invalidate`.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to remove.
+        *args, **kwargs
+            Additional arguments passed to :class:`sqlalchemy.schema.Table`. If any are given, the table cache is not used.
+
+        Return
+        ------
+        :class:`sqlalchemy.schema.Table`
+            A ``Table`` object from ``sqlalchemy``.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Get the table object
+            tb = db._get_table('test_table')
+            print(str(tb))
+        """
+        use_cache = len(args) == 0 and len(kwargs) == 0
+
+        # (Database_get_table_cache) Return the cached table if available
+        if use_cache:
+            out = self._table_cache.get(table)
+            if out is not None:
+                return out
+
+        # (Database_get_table_reflect) Reflect the table, replacing stale metadata
+        if use_cache and table in self._metadata.tables:
+            self._metadata.remove(self._metadata.tables[table])
+        with self._connect() as connection:
+            out = sqlalchemy.Table(table, self._metadata, autoload_with=connection, *args, **kwargs)
+
+        # (Database_get_table_return) Cache and return the table
+        if use_cache:
+            self._table_cache.set(table, out)
+        return out
+
+    def _is_single_connection(self):
+        """
+        Check if the connection pool only has one connection for each thread or one connection in total, such as for in-memory ``sqlite`` databases.
+
+        Each thread of a :class:`sqlalchemy:sqlalchemy.pool.SingletonThreadPool` has its own connection, which is a separate empty database for in-memory ``sqlite``,
+        and a :class:`sqlalchemy:sqlalchemy.pool.StaticPool` shares one connection, so concurrent work on other threads or processes cannot use them.
+
+        Returns
+        -------
+        bool
+            Whether concurrent connections are not supported.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            db = Database(driver='sqlite', database=None, user=None, password=None, host=None, port=None, load_env=False)
+            print(db._is_single_connection())
+        """
+        url = self._connection.url
+        memory = url.get_backend_name() == 'sqlite' and (url.database in (None, '', ':memory:') or 'memory' in str(url.query.get('mode', '')))
+        out = memory or isinstance(self._connection.pool, (sqlalchemy.pool.SingletonThreadPool, sqlalchemy.pool.StaticPool))
+        return out
+
+    def _listen_pool(self, engine):
+        """
+        Count connection pool events for an engine.
+
+        Parameters
+        ----------
+        engine : :class:`sqlalchemy:sqlalchemy.engine.Engine`
+            Engine with the connection pool to count events for.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import sqlalchemy
+            from msdss_base_database.core import Database
+            db = Database()
+
+            # Count events for another engine
+            engine = sqlalchemy.create_engine('sqlite://')
+            db._listen_pool(engine)
+            engine.connect().close()
+            print(db._pool_counters)
+        """
+
+        # (Database_listen_pool_counters) Create counters
+        self._pool_lock = threading.Lock()
+        self._pool_counters = dict(connects=0, checkouts=0, checkins=0, invalidations=0, waits=0, wait_seconds_total=0.0, wait_seconds_max=0.0)
+
+        # (Database_listen_pool_events) Increase counters for each pool event
+        def count(name):
+            def listener(*args, **kwargs):
+                with self._pool_lock:
+                    self._pool_counters[name] += 1
+            return listener
+        sqlalchemy.event.listen(engine, 'connect', count('connects'))
+        sqlalchemy.event.listen(engine, 'checkout', count('checkouts'))
+        sqlalchemy.event.listen(engine, 'checkin', count('checkins'))
+        sqlalchemy.event.listen(engine, 'invalidate', count('invalidations'))
+
+    def _insert_parallel(self, table, data, workers, chunksize=DEFAULT_CHUNKSIZE, method='auto', batch_size=DEFAULT_BATCH_SIZE, atomic=False, max_pending=None):
+        """
+        Insert chunks of data concurrently on separate pooled connections.
+
+        Chunks are converted to records and loaded with :meth:`msdss_base_database.core.Database._bulk_insert` in a :class:`concurrent.futures.ThreadPoolExecutor`.
+        At most ``max_pending`` chunks are converted or loading at a time, so that memory use depends on ``chunksize`` rather than the size of the data.
+        
+        Parameters
+        ----------
+        table : :class:`sqlalchemy.schema.Table`
+            Table object to insert into.
+        data : dict or list or :class:`pandas:pandas.DataFrame`
+            Data to insert. Dataframes are split into chunks before converting them to records in the workers.
+        workers : int
+            Number of chunks to load at the same time, which should not be more than the connections allowed by the ``pool`` settings of :class:`msdss_base_database.core.Database`.
+        chunksize : int
+            Number of rows in each chunk.
+        method : str
+            See parameter ``method`` in :meth:`msdss_base_database.core.Database._bulk_insert`.
+        batch_size : int
+            See parameter ``batch_size`` in :meth:`msdss_base_database.core.Database._bulk_insert`.
+        atomic : bool
+            Whether to insert all or none of the data.
+
+            * If ``True``, chunks are loaded into a staging table (see :meth:`msdss_base_database.core.Database._get_staging_table`), which is copied into ``table`` in one transaction after all chunks are loaded and then dropped
+            * If ``False``, each chunk is committed when it is loaded, so chunks loaded before an error remain in ``table``
+
+        max_pending : int or None
+            Maximum number of chunks that are converted or loading at a time. If ``None``, twice the number of ``workers``.
+
+        Returns
+        -------
+        tuple
+            A tuple of the number of rows inserted and the ``str`` method used.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+            
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Insert chunks of 2 rows with 2 workers
+            data = {
+                'id': [1, 2, 3, 4, 5],
+                'column_one': ['a', 'b', 'c', 'd', 'e'],
+                'column_two': [2, 4, 6, 8, 10]
+            }
+            target = db._get_table('test_table')
+            rows, method = db._insert_parallel(target, data, workers=2, chunksize=2, atomic=True)
+
+            # Display results
+            print('rows: ' + str(rows) + ', method: ' + method)
+            print(db.select('test_table'))
+        """
+        max_pending = max_pending if max_pending is not None else workers * 2
+
+        # (Database_insert_parallel_chunks) Split the data into chunks, converting dataframe chunks to records in the workers
+        if is_dataframe(data):
+            rows = len(data)
+            columns = list(data.columns)
+            chunks = (data.iloc[i:i + chunksize] for i in range(0, rows, chunksize))
+        else:
+            records = self._get_records(data, table=table)
+            rows = len(records)
+            columns = list(records[0]) if rows > 0 else []
+            chunks = (records[i:i + chunksize] for i in range(0, rows, chunksize))
+        if rows == 0:
+            return 0, method
+
+        # (Database_insert_parallel_staging) Create a staging table shared by the workers for an all or nothing insert
+        if atomic:
+            destination = self._get_staging_table(table, columns, temporary=False)
+            with self._connect() as connection:
+                destination.create(connection)
+        else:
+            destination = table
+
+        # (Database_insert_parallel_load) Load each chunk on its own connection
+        def load(chunk):
+            records = self._get_records(chunk, table=table)
+            with self._connect() as connection:
+                out = self._bulk_insert(connection, destination, records, method=method, batch_size=batch_size)
+            return out
+
+        # (Database_insert_parallel_submit) Submit chunks, waiting for loads to finish when too many are pending
+        out = method
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                pending = set()
+                try:
+                    for chunk in chunks:
+                        if len(pending) >= max_pending:
+                            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                            for future in done:
+                                out = future.result()
+                        pending.add(pool.submit(load, chunk))
+                    for future in concurrent.futures.as_completed(pending):
+                        out = future.result()
+                except BaseException:
+                    for future in pending:
+                        future.cancel()
+                    raise
+
+            # (Database_insert_parallel_copy) Copy the staged rows into the table in one transaction
+            if atomic:
+                with self._connect() as connection:
+                    connection.execute(table.insert().from_select(columns, destination.select()))
+        finally:
+            if atomic:
+                with self._connect() as connection:
+                    destination.drop(connection, checkfirst=True)
+        return rows, out
+
+    def _invalidate_results(self, table):
+        """
+        Remove the cached query results of a table.
+
+        If called in a :meth:`msdss_base_database.core.Database.transaction`, the results are removed again when the transaction ends, so that results queried before the commit are not reused.
+        This is called for each write, so the time is also kept for the ``read_your_writes`` parameter of :class:`msdss_base_database.core.Database`.
+        The results of the change log of the table are also removed, as it is written to by triggers (see :meth:`msdss_base_database.core.Database.create_change_log`).
+        
+        Parameters
+        ----------
+        table : str
+            Name of the table to remove results for.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database with a result cache
+            db = Database(result_cache='memory')
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table and cache a result
+            db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True)])
+            db.select('test_table')
+            before_invalidate = db.cache_info()['result']['size']
+
+            # Remove the cached results
+            db._invalidate_results('test_table')
+            after_invalidate = db.cache_info()['result']['size']
+            
+            # Display results
+            print('before_invalidate: ' + str(before_invalidate))
+            print('after_invalidate: ' + str(after_invalidate))
+        """
+        self._last_write = time.monotonic()
+        if self._result_cache is None:
+            return
+
+        # (Database_invalidate_results_remove) Remove the results grouped by the table, including the change log written to by triggers
+        for name in (table, table + DEFAULT_CHANGE_LOG_SUFFIX):
+            self._result_versions[name] = self._result_versions.get(name, 0) + 1
+            self._result_cache.invalidate_group(name)
+
+        # (Database_invalidate_results_transaction) Remove the results again when the transaction ends
+        if getattr(self._local, 'connection', None) is not None:
+            self._local.invalidated.add(table)
+
+    def _listen_stats(self, engine, stats=False, slow_query_threshold=None, slow_query_log=None):
+        """
+        Record the time spent compiling and executing statements for an engine in the query record being measured.
+
+        The time from the start of an execution to the cursor execution is recorded as ``compile``, and the time of the cursor execution is recorded as ``execute``.
+        See :meth:`msdss_base_database.core.Database._measure`.
+
+        Parameters
+        ----------
+        engine : :class:`sqlalchemy:sqlalchemy.engine.Engine`
+            Engine to record execution times for.
+        stats : bool or :class:`msdss_base_database.stats.QueryStats`
+            See parameter ``stats`` in :class:`msdss_base_database.core.Database`.
+        slow_query_threshold : int or float or None
+            See parameter ``slow_query_threshold`` in :class:`msdss_base_database.core.Database`.
+        slow_query_log : str or :class:`logging.Logger` or None
+            See parameter ``slow_query_log`` in :class:`msdss_base_database.core.Database`.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            import sqlalchemy
+            from msdss_base_database.core import Database
+            db = Database(stats=True)
+
+            # Record times for another engine
+            engine = sqlalchemy.create_engine('sqlite://')
+            db._listen_stats(engine, stats=db._stats)
+            with db._measure(None, 'execute') as record:
+                with engine.connect() as connection:
+                    connection.execute(sqlalchemy.text('SELECT 1'))
+            print(db._stats.history()[-1])
+        """
+
+        # (Database_listen_stats_create) Create the stats object
+        if isinstance(stats, QueryStats):
+            self._stats = stats
+        elif stats:
+            self._stats = QueryStats(slow_query_threshold=slow_query_threshold, slow_query_log=slow_query_log)
+        else:
+            self._stats = None
+            return
+
+        # (Database_listen_stats_events) Add compile and execute times to the query record of the thread
+        def before_execute(conn, *args, **kwargs):
+            record = getattr(self._local, 'record', None)
+            if record is not None:
+                record['_start'] = time.perf_counter()
+        def before_cursor_execute(conn, *args, **kwargs):
+            record = getattr(self._local, 'record', None)
+            if record is not None:
+                now = time.perf_counter()
+                record['compile'] += now - record.pop('_start', now)
+                record['_cursor'] = now
+        def after_cursor_execute(conn, *args, **kwargs):
+            record = getattr(self._local, 'record', None)
+            if record is not None and '_cursor' in record:
+                record['execute'] += time.perf_counter() - record.pop('_cursor')
+        sqlalchemy.event.listen(engine, 'before_execute', before_execute)
+        sqlalchemy.event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        sqlalchemy.event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+
+    def _list_to_columns(self, clist):
+        """
+        Converts a list of dict or list to ``sqlalchemy`` columns.
+
+        Parameters
+        ----------
+        clist : list(dict) or list(list)
+            List of dict (kwargs) or lists (positional args) that are passed to :class:`sqlalchemy.schema.Column`. Data types can also be specified as str.
+            
+            * Example list(dict): ``[dict(name='id', type_='Integer', autoincrement=True, primary_key=True), dict(name='col', type='String')]``
+            * Example list(list): ``[('id', 'Integer'), ('col', 'String')]``
+        *args, **kwargs
+            Additional arguments passed to :class:`sqlalchemy.schema.Table`.
+
+        Return
+        ------
+        list(:class:`sqlalchemy.schema.Column`)
+            A list of ``Column`` objects from ``sqlalchemy``.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            db = Database()
+
+            # Create column definitions
+            clist = [
+                dict(name='id', type_='Integer', primary_key=True),
+                dict(name='column_one', type_='String'),
+                dict(name='column_two', type_='Integer')
+            ]
+
+            # Convert to sqlalchemy column objects
+            columns = db._list_to_columns(clist)
+            print(str(columns))
+        """
+
+        # (Database_list_to_columns_convert) Convert data types from str
+        clist = [list(c) if isinstance(c, tuple) else c for c in clist] # conv tuples to list
+        for i, c in enumerate(clist):
+
+            # (Database_list_to_columns_convert_type) Get data type depending on list or dict
+            if isinstance(c, dict):
+                cidx = 'type_'
+            elif isinstance(c, list):
+                cidx = 1
+            ctype = c[cidx]
+            
+            # (Databse_list_columns_convert_str) Convert to column if str
+            if isinstance(ctype, str):
+                clist[i][cidx] = getattr(sqlalchemy, ctype)
+
+        # (Database_list_to_columns_return) Return the list of sqlalchemy columns
+        out = [sqlalchemy.Column(*c) if isinstance(c, list) else sqlalchemy.Column(**c) for c in clist]
+        return out
+
+    @contextlib.contextmanager
+    def _measure(self, table, operation):
+        """
+        Measure a call as a query record, which is added to the query stats when the call ends.
+
+        The record is shared with the events from :meth:`msdss_base_database.core.Database._listen_stats` through thread local storage. If a record is already being measured in the thread,
+        such as for a method that calls another method, the existing record is used so that each call is only recorded once.
+        
+        Parameters
+        ----------
+        table : str or None
+            Name of the table for the record.
+        operation : str
+            Name of the operation for the record.
+        
+        Yields
+        ------
+        dict
+            Query record to add the phase times, ``rows``, ``bytes``, ``cached``, and ``statement`` to. See :class:`msdss_base_database.stats.QueryStats`.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            db = Database(stats=True)
+
+            with db._measure('test_table', 'custom') as record:
+                cursor = db._execute_query('SELECT 1')
+                record['rows'] = 1
+            print(db._stats.history()[-1])
+        """
+        current = getattr(self._local, 'record', None) if self._stats is not None else None
+
+        # (Database_measure_skip) Use a temporary record if not recording stats, or the existing record if already measuring
+        if self._stats is None or current is not None:
+            yield current if current is not None else dict(build=0.0, compile=0.0, execute=0.0, fetch=0.0, frame=0.0)
+            return
+
+        # (Database_measure_record) Measure the total time and add the record to the stats
+        record = dict(table=table, operation=operation, build=0.0, compile=0.0, execute=0.0, fetch=0.0, frame=0.0, rows=None, bytes=None, cached=False, error=False, statement=None)
+        self._local.record = record
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException:
+            record['error'] = True
+            raise
+        finally:
+            self._local.record = None
+            record['total'] = time.perf_counter() - start
+            record.pop('_start', None)
+            record.pop('_cursor', None)
+            self._stats.record(record)
+
+    def _prepare_query(
+        self,
+        table,
+        select='*',
+        where=None,
+        group_by=None,
+        aggregate=None,
+        aggregate_func='count',
+        order_by=None,
+        order_by_sort='asc',
+        limit=None,
+        offset=None,
+        where_boolean='AND',
+        after=None,
+        having=None,
+        having_boolean='AND',
+        window=None,
+        partition=None,
+        update=False,
+        delete=False,
+        values=None,
+        return_key=False,
+        advise=True,
+        *args, **kwargs):
+        """
+        Get a reusable SQL statement and its parameter values.
+
+        Statements are built with :meth:`msdss_base_database.core.Database._build_query` using ``bind=True`` and kept in a query cache keyed on the structure of the query,
+        so that queries differing only in their ``where``, ``limit``, ``offset``, or ``values`` values reuse the same statement (and the compiled statement cache of ``sqlalchemy``).
+        
+        Parameters
+        ----------
+        table : str or :class:`sqlalchemy.schema.Table`
+            Name of the database table or a table object.
+        select : str or list(str) or None
+            See parameter ``select`` in :meth:`msdss_base_database.core.Database._build_query`.
+        where : list of list or list of tuple or None
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database._build_query`.
+        group_by : str or list(str) or None
+            See parameter ``group_by`` in :meth:`msdss_base_database.core.Database._build_query`.
+        aggregate : str or list(str) or dict or None
+            See parameter ``aggregate`` in :meth:`msdss_base_database.core.Database._build_query`.
+        aggregate_func : str or list(str)
+            See parameter ``aggregate_func`` in :meth:`msdss_base_database.core.Database._build_query`.
+        order_by : str or list(str) or None
+            See parameter ``order_by`` in :meth:`msdss_base_database.core.Database._build_query`.
+        order_by_sort : str or list(str)
+            See parameter ``order_by_sort`` in :meth:`msdss_base_database.core.Database._build_query`.
+        limit : int or None
+            See parameter ``limit`` in :meth:`msdss_base_database.core.Database._build_query`.
+        offset : int or None
+            See parameter ``offset`` in :meth:`msdss_base_database.core.Database._build_query`.
+        where_boolean : str
+            See parameter ``where_boolean`` in :meth:`msdss_base_database.core.Database._build_query`.
+        after : dict or None
+            See parameter ``after`` in :meth:`msdss_base_database.core.Database._build_query`.
+        having : list of list or list of tuple or None
+            See parameter ``having`` in :meth:`msdss_base_database.core.Database._build_query`.
+        having_boolean : str
+            See parameter ``having_boolean`` in :meth:`msdss_base_database.core.Database._build_query`.
+        window : dict or list(dict) or None
+            See parameter ``window`` in :meth:`msdss_base_database.core.Database._build_query`.
+        partition : list or tuple or None
+            See parameter ``partition`` in :meth:`msdss_base_database.core.Database._build_query`.
+        update : bool
+            See parameter ``update`` in :meth:`msdss_base_database.core.Database._build_query`.
+        delete : bool
+            See parameter ``delete`` in :meth:`msdss_base_database.core.Database._build_query`.
+        values : dict
+            See parameter ``values`` in :meth:`msdss_base_database.core.Database._build_query`.
+        return_key : bool
+            Whether to also return the query cache key, which starts with the table name and identifies the structure of the query.
+        advise : bool
+            Whether to record the query for index suggestions if ``index_advisor`` is set in :class:`msdss_base_database.core.Database`. See :meth:`msdss_base_database.core.Database.suggest_indexes`.
+        *args, **kwargs
+            Additional arguments to accept any extra parameters passed through.
+        
+        Returns
+        -------
+        tuple
+            A tuple of the statement (see :meth:`msdss_base_database.core.Database._build_query`) and a dict of its parameter values, followed by the query cache key if ``return_key`` is ``True``.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+            
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Prepare queries with the same structure
+            sql_a, params_a = db._prepare_query('test_table', where=('column_two', '<', 3), limit=6)
+            sql_b, params_b = db._prepare_query('test_table', where=('column_two', '<', 5), limit=2)
+
+            # Display results
+            print('sql:\\n\\n' + str(sql_a))
+            print('\\nsame_sql: ' + str(sql_a is sql_b))
+            print('params_a: ' + str(params_a))
+            print('params_b: ' + str(params_b))
+        """
+
+        # (Database_prepare_query_var_list) Format single variables into hashable tuples
+        select = (select,) if isinstance(select, str) else tuple(select) if select is not None else None
+        group_by = (group_by,) if isinstance(group_by, str) else tuple(group_by) if group_by is not None else None
+        aggregate = (aggregate,) if isinstance(aggregate, str) else dict(aggregate) if isinstance(aggregate, dict) else tuple(aggregate) if aggregate is not None else None
+        order_by = (order_by,) if isinstance(order_by, str) else tuple(order_by) if order_by is not None else None
+        window = [window] if isinstance(window, dict) else window
+        if where is not None:
+            where = [where] if not any(isinstance(w, list) or isinstance(w, tuple) for w in where) else where
+        if having is not None:
+            having = [having] if not any(isinstance(h, list) or isinstance(h, tuple) for h in having) else having
+
+        # (Database_prepare_query_key) Form a key from the structure of the query
+        target = table if isinstance(table, sqlalchemy.Table) else self._get_table(table)
+        key = (
+            target.name,
+            select,
+            tuple((w[0], w[1], w[2] is None) for w in where) if where is not None else None,
+            where_boolean.lower(),
+            group_by,
+            tuple((k, tuple(v) if isinstance(v, list) else v) for k, v in aggregate.items()) if isinstance(aggregate, dict) else aggregate,
+            tuple(aggregate_func) if isinstance(aggregate_func, list) else aggregate_func,
+            order_by,
+            tuple(order_by_sort) if isinstance(order_by_sort, list) else order_by_sort,
+            (limit, offset) if self._literal_limit else (limit is not None, offset is not None),
+            after is not None,
+            tuple((h[0], h[1], h[2] is None) for h in having) if having is not None else None,
+            having_boolean.lower(),
+            tuple(tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in w.items())) for w in window) if window is not None else None,
+            (partition[0], partition[1].lower(), tuple(v is None for v in partition[2])) if partition is not None else None,
+            update,
+            delete,
+            tuple(values) if values is not None and update else None
+        )
+
+        # (Database_prepare_query_cache) Get the cached statement if the table was not reflected again since
+        cached = self._query_cache.get(key)
+        if cached is not None and cached[0] is target:
+            sql = cached[1]
+        else:
+            sql = self._build_query(
+                target,
+                select=list(select) if select is not None else None,
+                where=where,
+                group_by=list(group_by) if group_by is not None else None,
+                aggregate=aggregate if isinstance(aggregate, dict) else list(aggregate) if aggregate is not None else None,
+                aggregate_func=aggregate_func,
+                order_by=list(order_by) if order_by is not None else None,
+                order_by_sort=order_by_sort,
+                limit=limit,
+                offset=offset,
+                where_boolean=where_boolean,
+                after=after,
+                having=having,
+                having_boolean=having_boolean,
+                window=window,
+                partition=partition,
+                update=update,
+                delete=delete,
+                values=values,
+                bind=True
+            )
+            self._query_cache.set(key, (target, sql))
+
+        # (Database_prepare_query_return) Return the statement and its parameter values, recording the filtered and sorted columns for index suggestions
+        params = self._get_query_params(where=where, limit=limit, offset=offset, order_by=order_by, after=after, having=having, partition=partition, update=update, values=values)
+        if advise and self._advisor is not None:
+            self._advisor.record(key, target.name, where=where, group_by=group_by, order_by=order_by, sql=sql, params=params)
+        out = (sql, params, key) if return_key else (sql, params)
+        return out
+
+    @staticmethod
+    def _select_process(url, table, args, kwargs):
+        """
+        Query data in a new process for :meth:`msdss_base_database.core.Database.select_parallel`.
+
+        A :class:`msdss_base_database.core.Database` is created from the connection url without loading the environment, and its engine is disposed after the query.
+
+        Parameters
+        ----------
+        url : str
+            Connection url of the database including the password, such as from :meth:`sqlalchemy:sqlalchemy.engine.URL.render_as_string`.
+        table : str
+            Name of the database table to query from.
+        args : tuple
+            Positional arguments passed to :meth:`msdss_base_database.core.Database.select` after ``table``.
+        kwargs : dict
+            Keyword arguments passed to :meth:`msdss_base_database.core.Database.select`.
+
+        Returns
+        -------
+        :class:`pandas:pandas.DataFrame` or :class:`pyarrow:pyarrow.Table`
+            The queried data.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        """
+        url = sqlalchemy.engine.make_url(url)
+        db = Database(
+            driver=url.drivername,
+            user=url.username,
+            password=url.password,
+            host=url.host,
+            port=url.port,
+            database=url.database,
+            load_env=False,
+            stats=False
+        )
+        try:
+            out = db.select(table, *args, **kwargs)
+        finally:
+            db._connection.dispose()
+        return out
+
+    def _select_partitions(self, table, partitions, workers=None, executor='thread', *args, **kwargs):
+        """
+        Query partitions of data concurrently for :meth:`msdss_base_database.core.Database.select_parallel`.
+
+        Parameters
+        ----------
+        table : str
+            Name of the database table to query from.
+        partitions : list(tuple)
+            Partitions from :meth:`msdss_base_database.core.Database._get_partitions`.
+        workers : int or None
+            See parameter ``workers`` in :meth:`msdss_base_database.core.Database.select_parallel`.
+        executor : str
+            See parameter ``executor`` in :meth:`msdss_base_database.core.Database.select_parallel`.
+        *args, **kwargs
+            Additional arguments passed to :meth:`msdss_base_database.core.Database.select`.
+
+        Yields
+        ------
+        :class:`pandas:pandas.DataFrame` or :class:`pyarrow:pyarrow.Table`
+            The queried data of each partition in the order of ``partitions``.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        """
+        workers = workers if workers is not None else len(partitions)
+
+        # (Database_select_partitions_serial) Query the partitions one at a time on this thread if other threads or processes cannot share the connection
+        if self._is_single_connection():
+            for partition in partitions:
+                yield self.select(table, *args, partition=partition, **kwargs)
+            return
+
+        # (Database_select_partitions_executor) Create the pool of workers
+        if executor == 'thread':
+            pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+            submit = lambda partition: pool.submit(self.select, table, *args, partition=partition, **kwargs)
+        elif executor == 'process': # spread partitions across replicas unless reads are pinned to the primary after a write
+            pinned = self._read_your_writes is not None and self._last_write is not None and time.monotonic() - self._last_write < self._read_your_writes
+            urls = itertools.cycle([e.url.render_as_string(hide_password=False) for e in (self._replicas if len(self._replicas) > 0 and not pinned else [self._connection])])
+            pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+            submit = lambda partition: pool.submit(Database._select_process, next(urls), table, args, {**kwargs, 'partition': partition})
+        else:
+            raise ValueError(str(executor) + ' is not supported')
+
+        # (Database_select_partitions_run) Query all partitions and yield the results in order, cancelling queries that have not started if stopped early
+        with pool:
+            futures = [submit(partition) for partition in partitions]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _set_result_cache(self, result_cache=None, ttl=DEFAULT_RESULT_CACHE_TTL, max_bytes=DEFAULT_RESULT_CACHE_MAX_BYTES, directory=None):
+        """
+        Set the cache for query results.
+        
+        Parameters
+        ----------
+        result_cache : str or :class:`msdss_base_database.cache.LRUCache` or None
+            See parameter ``result_cache`` in :class:`msdss_base_database.core.Database`.
+        ttl : int or float or None
+            See parameter ``result_cache_ttl`` in :class:`msdss_base_database.core.Database`.
+        max_bytes : int or None
+            See parameter ``result_cache_max_bytes`` in :class:`msdss_base_database.core.Database`.
+        directory : str or None
+            See parameter ``result_cache_dir`` in :class:`msdss_base_database.core.Database`.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            db = Database()
+            db._set_result_cache('memory', ttl=30)
+            print(db.cache_info()['result'])
+        """
+        if result_cache == 'memory':
+            self._result_cache = LRUCache(max_size=None, ttl=ttl, max_bytes=max_bytes)
+        elif result_cache == 'disk':
+            self._result_cache = DiskCache(directory=directory, max_size=None, ttl=ttl, max_bytes=max_bytes)
+        elif result_cache is None or isinstance(result_cache, LRUCache):
+            self._result_cache = result_cache
+        else:
+            raise ValueError(str(result_cache) + ' is not supported')
+        self._result_versions = {}
+
+    @contextlib.contextmanager
+    def _stage_records(self, connection, table, records, columns=None, batch_size=DEFAULT_BATCH_SIZE, index=None):
+        """
+        Load records into a temporary staging table with the same column types as a table, and drop the staging table when the context ends.
+
+        The staging table only exists for the given connection. It is dropped even if an error occurs, where errors from dropping it after an error, such as in an aborted transaction, are ignored so that the original error is raised.
+        
+        Parameters
+        ----------
+        connection : :class:`sqlalchemy:sqlalchemy.engine.Connection`
+            Connection to create the staging table with.
+        table : :class:`sqlalchemy.schema.Table`
+            Table object to copy column types from.
+        records : list(dict)
+            List of records, where each record is a dict of column names and values.
+        columns : list(str) or None
+            Names of the columns to include in the staging table. If ``None``, the keys of the first record are used.
+        batch_size : int
+            Number of records to insert with each statement (see :meth:`msdss_base_database.core.Database._bulk_insert`).
+        index : list(str) or None
+            Names of the columns to index after loading the records, such as the key columns that are matched to another table, so that each match does not scan the staging table.
+            If ``None``, the staging table is not indexed.
+
+        Yields
+        ------
+        :class:`sqlalchemy.schema.Table`
+            Table object for the staging table.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True), ('column_one', 'String')])
+
+            # Stage records and read them on the same connection
+            target = db._get_table('test_table')
+            with db._connect() as connection:
+                with db._stage_records(connection, target, [dict(id=1, column_one='a')]) as staging:
+                    print(connection.execute(staging.select()).fetchall())
+        """
+        columns = list(records[0]) if columns is None else columns
+        out = self._get_staging_table(table, columns)
+        out.create(connection)
+
+        # (Database_stage_records_load) Load and index the records, dropping the staging table on error without hiding the error
+        try:
+            self._bulk_insert(connection, out, [{c:r[c] for c in columns} for r in records], batch_size=batch_size)
+            if index is not None:
+                sqlalchemy.Index(out.name + '_index', *[out.c[c] for c in index]).create(connection)
+            yield out
+        except BaseException:
+            try:
+                out.drop(connection)
+            except sqlalchemy.exc.SQLAlchemyError:
+                pass
+            raise
+
+        # (Database_stage_records_drop) Drop the staging table after use
+        out.drop(connection)
+
+    def _write_data(self, table, data, schema=None, if_exists='append', index=False, *args, **kwargs):
+        """
+        Write data to the database.
+        
+        Parameters
+        ----------
+        table : str
+            Name of the table to write to.
+        data : dict or list or :class:`pandas:pandas.DataFrame`
+            Dataframe with the data to write to the database. If ``dict`` or ``list`` see :class:`pandas:pandas.DataFrame`.
+        schema : str
+            Name of the schema to for the table.
+        if_exists : 'fail' or 'replace' or 'append'
+            String indicating whether to throw an error (fail), replace the data, or append the data to the table if it already exists.
+        index : bool
+            Set to True to include the row indices as a column and False to omit them.
+        *args, **kwargs
+            Additional arguments passed to :class:`pandas:pandas.DataFrame` if parameter ``data`` is ``dict`` or ``list``.
+
+        Returns
+        -------
+        int
+            Number of rows written.
+        
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+            
+            # Write data to table
+            data = {
+                'id': [1, 2, 3],
+                'column_one': ['a', 'b', 'c'],
+                'column_two': [2, 4, 6]
+            }
+            db._write_data('test_table', data, if_exists = 'replace')
+        """
+        import pandas
+        data = pandas.DataFrame(data, *args, **kwargs) if not isinstance(data, pandas.DataFrame) else data
+        with self._connect() as connection:
+            data.to_sql(table, con = connection, schema = schema, if_exists = if_exists, index = index)
+        self.invalidate(table)
+        out = len(data)
+        return out
+
+    def add_query_hook(self, hook):
+        """
+        Add a function to call with the record of each query.
+
+        Parameters
+        ----------
+        hook : func
+            Function that takes a query record dict as its only argument, such as to send query times to a monitoring system. See :class:`msdss_base_database.stats.QueryStats`. Errors raised by the hook are logged instead of failing the query.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database(stats=True)
+
+            # Print the operation and time of each query
+            db.add_query_hook(lambda record: print(record['operation'] + ': ' + str(record['total'])))
+            db._execute_query('SELECT 1')
+        """
+        if self._stats is None:
+            raise ValueError('query stats are not recorded')
+        self._stats.add_hook(hook)
+
+    def cache_info(self):
+        """
+        Get usage counters for the database caches.
+        
+        Returns
+        -------
+        dict
+            Dictionary with a key for each cache (``table``, ``query``, and ``result``), where each value is a dict with keys ``hits``, ``misses``, ``size``, ``max_size``, ``ttl``, ``bytes``, and ``max_bytes``.
+            The ``result`` value is ``None`` if results are not cached.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Use the table a few times
+            db.select('test_table')
+            db.rows('test_table')
+            db.columns('test_table')
+
+            # Display cache counters
+            print(db.cache_info())
+        """
+        out = dict(
+            table=self._table_cache.info(),
+            query=self._query_cache.info(),
+            result=self._result_cache.info() if self._result_cache is not None else None
+        )
+        return out
+
+    def columns(self, table):
+        """
+        Get number of columns for a table.
+        
+        Parameters
+        ----------
+        table : str
+            Name of the table to get columns for.
+        
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+            
+            # Write data to table
+            data = {
+                'id': [1, 2, 3],
+                'column_one': ['a', 'b', 'c'],
+                'column_two': [2, 4, 6]
+            }
+            db.insert('test_table', data)
+            df = db.select('test_table')
+
+            # Get number of rows in table
+            columns = db.columns('test_table')
+
+            # Display results
+            print('df:\\n')
+            print(df)
+            print(f'\\ncolumns: {columns}')
+        """
+        table = self._get_table(table)
+        out = len(table.c)
+        return out
+    
+    def create_change_log(self, table, key='id', backfill=False):
+        """
+        Create a change log table with triggers that record each insert, update, and delete of the rows of a table.
+
+        The change log table is named ``<table>_changes`` and has the columns:
+
+        * ``change_id``: increasing number of the change, used as the watermark by :meth:`msdss_base_database.core.Database.select_changes`
+        * ``<key>``: value of the ``key`` column of the changed row
+        * ``operation``: one of ``insert``, ``update``, or ``delete``, where an update of the ``key`` column is recorded as a ``delete`` of the old value and an ``update`` of the new value
+        * ``changed_at``: time of the change
+
+        As the triggers run in the database, changes made outside of this class are also recorded. Only ``sqlite`` and ``postgresql`` are supported.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to record changes for.
+        key : str
+            Name of the column with a primary key or unique constraint that identifies the rows of the table.
+        backfill : bool
+            Whether to record the existing rows as ``insert`` changes, so that consumers without a watermark get the whole table from the change log.
+
+        Returns
+        -------
+        str
+            Name of the change log table.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Record changes to the table
+            db.create_change_log('test_table')
+            db.insert('test_table', {'id': [1, 2], 'column_one': ['a', 'b'], 'column_two': [2, 4]})
+            db.delete('test_table', where=('id', '=', 1))
+            print(db.select('test_table_changes'))
+            db.drop_change_log('test_table')
+        """
+        target = self._get_table(table)
+        dialect = self._connection.dialect.name
+        if dialect not in ('sqlite', 'postgresql'):
+            raise ValueError(dialect + ' is not supported for change logs')
+        change_table = table + DEFAULT_CHANGE_LOG_SUFFIX
+
+        # (Database_create_change_log_table) Create the change log table with the type of the key column
+        columns = [
+            dict(name='change_id', type_='Integer', primary_key=True, autoincrement=True),
+            dict(name=key, type_=target.c[key].type, nullable=False),
+            dict(name='operation', type_=sqlalchemy.String(6), nullable=False),
+            dict(name='changed_at', type_='DateTime', server_default=sqlalchemy.func.current_timestamp())
+        ]
+        self.create_table(change_table, columns)
+
+        # (Database_create_change_log_triggers) Create the statements for the triggers
+        quote = self._connection.dialect.identifier_preparer.quote
+        t, c, k = quote(table), quote(change_table), quote(key)
+        log = lambda value, operation: 'INSERT INTO ' + c + ' (' + k + ', operation) VALUES (' + value + '.' + k + ", '" + operation + "');"
+        if dialect == 'sqlite':
+            statements = [
+                'CREATE TRIGGER ' + quote(change_table + '_insert') + ' AFTER INSERT ON ' + t + ' BEGIN ' + log('NEW', 'insert') + ' END',
+                'CREATE TRIGGER ' + quote(change_table + '_update') + ' AFTER UPDATE ON ' + t + ' BEGIN '
+                    + 'INSERT INTO ' + c + ' (' + k + ", operation) SELECT OLD." + k + ", 'delete' WHERE OLD." + k + ' IS NOT NEW.' + k + '; '
+                    + log('NEW', 'update') + ' END',
+                'CREATE TRIGGER ' + quote(change_table + '_delete') + ' AFTER DELETE ON ' + t + ' BEGIN ' + log('OLD', 'delete') + ' END'
+            ]
+        else:
+            function = quote(change_table + '_log')
+            statements = [
+                'CREATE OR REPLACE FUNCTION ' + function + '() RETURNS trigger AS $$ BEGIN '
+                    + "IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD." + k + ' IS DISTINCT FROM NEW.' + k + ') THEN ' + log('OLD', 'delete') + ' END IF; '
+                    + "IF TG_OP <> 'DELETE' THEN INSERT INTO " + c + ' (' + k + ', operation) VALUES (NEW.' + k + ', lower(TG_OP)); END IF; '
+                    + 'RETURN NULL; END; $$ LANGUAGE plpgsql',
+                'CREATE TRIGGER ' + quote(change_table + '_trigger') + ' AFTER INSERT OR UPDATE OR DELETE ON ' + t + ' FOR EACH ROW EXECUTE PROCEDURE ' + function + '()'
+            ]
+        if backfill:
+            statements.append('INSERT INTO ' + c + ' (' + k + ", operation) SELECT " + k + ", 'insert' FROM " + t)
+
+        # (Database_create_change_log_execute) Create the triggers, removing the change log table if they fail
+        try:
+            with self._connect() as connection:
+                for statement in statements:
+                    connection.exec_driver_sql(statement)
+        except Exception:
+            self.drop_table(change_table)
+            raise
+        out = change_table
+        return out
+
+    def create_index(self, table, columns, name=None, unique=False, **kwargs):
+        """
+        Create an index on columns of a table.
+        
+        Parameters
+        ----------
+        table : str
+            Name of the table to create the index for.
+        columns : str or list(str)
+            Single or list of column names to index in order, such as from :meth:`msdss_base_database.core.Database.suggest_indexes`.
+        name : str or None
+            Name of the index. If ``None``, the name is ``<table>_<column>_..._index``.
+        unique : bool
+            Whether the index only allows one row for each value of the columns.
+        **kwargs
+            Additional dialect arguments passed to :class:`sqlalchemy:sqlalchemy.schema.Index`, such as ``postgresql_using``.
+
+        Returns
+        -------
+        str
+            Name of the created index.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Create an index and list the indexes
+            db.create_index('test_table', ['column_one', 'column_two'])
+            print(db.list_indexes('test_table'))
+        """
+        columns = [columns] if isinstance(columns, str) else columns
+        name = name if name is not None else table + '_' + '_'.join(columns) + '_index'
+        target = self._get_table(table)
+        index = sqlalchemy.Index(name, *[target.c[c] for c in columns], unique=unique, **kwargs)
+        try:
+            with self._connect() as connection:
+                index.create(connection)
+        finally:
+            self.invalidate(table)
+        out = name
+        return out
+
+    def create_table(self, table, columns):
+        """
+        Create a table in the database.
+        
+        Parameters
+        ----------
+        table : str
+            Name of the table to create.
+        columns : list(dict) or list(list)
+            List of dict (kwargs) or lists (positional args) that are passed to :class:`sqlalchemy.schema.Column`. Data types can also be specified as str.
+            
+            * Example list(dict): ``[dict(name='id', type_='Integer', autoincrement=True, primary_key=True), dict(name='col', type='String')]``
+            * Example list(list): ``[('id', 'Integer'), ('col', 'String')]``
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Drop table if exists
+            if db.has_table('test_table'):
+                db.drop_table('test_table')
+
+            # Create column definitions
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                dict(name='column_one', type_='String'),
+                dict(name='column_two', type_='Integer')
+            ]
+            
+            # Create the table
+            db.create_table('test_table', columns)
+
+            # View the table
+            df = db.select('test_table')
+            print(df)
+        """
+        self.invalidate(table)
+        columns = self._list_to_columns(columns)
+        tb = sqlalchemy.Table(table, self._metadata, *columns, extend_existing=True)
+        with self._connect() as connection:
+            tb.create(connection)
+        self._table_cache.set(table, tb)
+
+    def delete(self, table, where, where_boolean='AND', *args, **kwargs):
+        """
+        Remove rows from a table in the database.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to remove rows from.
+        where : list of list or list of tuple or None
+            list of where statements the form of ``['column_name', 'operator', value]`` to further filter individual values or rows. 
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database._build_query`.
+        where_boolean : str
+            One of ``AND`` or ``OR`` to combine ``where`` statements with. Defaults to ``AND`` if not one of ``AND`` or ``OR``.
+            
+            * Operators are one of:
+
+                .. jupyter-execute::
+                    :hide-code:
+
+                    from msdss_base_database.defaults import DEFAULT_SUPPORTED_OPERATORS
+                    for operator in DEFAULT_SUPPORTED_OPERATORS:
+                        print(operator)
+                        
+            * Values can be any single value such as ``int`` or ``str``
+            * Examples: ``['column_two', '>', 2]``, ``['column_one', 'LIKE', 'a']``, ``[['column_two', '>', 2], ['column_one', 'LIKE', 'a']]``
+
+        *args, **kwargs
+            Additional arguments passed to :meth:`msdss_base_database.core.Database._execute_query`.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Write sample data
+            data = {
+                'id': [1, 2, 3],
+                'column_one': ['a', 'b', 'c'],
+                'column_two': [2, 4, 6]
+            }
+            db.insert('test_table', data)
+            df = db.select('test_table')
+
+            # Delete a row with matching id
+            db.delete(
+                'test_table',
+                where=('id', '=', 1)
+            )
+            df_delete_id = db.select('test_table')
+
+            # Delete a row with matching query
+            db.delete(
+                'test_table',
+                where=[('id', '<', 3), ('column_one', '=', 'c')],
+                where_boolean='OR'
+            )
+            df_delete_where = db.select('test_table')
+
+            # Print results
+            print('df:\\n')
+            print(df)
+            print('\\ndf_delete_id:\\n')
+            print(df_delete_id)
+            print('\\ndf_delete_where:\\n')
+            print(df_delete_where)
+        """
+        with self._measure(table, 'delete') as record:
+            start = time.perf_counter()
+            sql, params = self._prepare_query(table=table, where=where, where_boolean=where_boolean, delete=True)
+            record['build'] = time.perf_counter() - start - record['compile'] - record['execute']
+            cursor = self._execute_query(sql, params, *args, **kwargs)
+            record['rows'] = cursor.rowcount
+            self._invalidate_results(table)
+
+    def delete_many(self, table, keys, key='id', method='auto', batch_size=DEFAULT_BATCH_SIZE, staged_threshold=DEFAULT_STAGED_THRESHOLD):
+        """
+        Remove many rows from a table in the database by their key values in one pass.
+
+        Rows are removed in batches of bound parameters with ``executemany``, or by joining to a staging table of keys (see :meth:`msdss_base_database.core.Database._stage_records`),
+        so that the number of round trips depends on the number of batches rather than the number of rows.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to remove rows from.
+        keys : list or dict or :class:`pandas:pandas.DataFrame`
+            Key values of the rows to remove. If a list of single values, these are values of the ``key`` column.
+            Otherwise, see :meth:`msdss_base_database.core.Database._get_records`, where each record has the ``key`` columns.
+        key : str or list(str)
+            Name of the key column or columns that identify each row.
+        method : str
+            One of ``executemany``, ``staged`` to join with a staging table, or ``auto`` to use ``staged`` if there are more than ``staged_threshold`` keys.
+        batch_size : int
+            Number of keys to remove with each statement or to load into the staging table with each statement.
+        staged_threshold : int
+            Number of keys above which ``auto`` uses the ``staged`` method.
+
+        Returns
+        -------
+        int
+            Number of rows removed as reported by the database driver.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Write sample data
+            data = {
+                'id': [1, 2, 3],
+                'column_one': ['a', 'b', 'c'],
+                'column_two': [2, 4, 6]
+            }
+            db.insert('test_table', data)
+
+            # Delete rows by key
+            db.delete_many('test_table', [1, 3])
+            print(db.select('test_table'))
+        """
+        with self._measure(table, 'delete_many') as record:
+            key = [key] if isinstance(key, str) else key
+
+            # (Database_delete_many_records) Get key records
+            if isinstance(keys, list) and len(keys) > 0 and not isinstance(keys[0], dict) and len(key) == 1:
+                records = [{key[0]:k} for k in keys]
+            else:
+                records = self._get_records(keys)
+            if len(records) == 0:
+                return 0
+
+            # (Database_delete_many_execute) Remove rows by staging table or batches of bound parameters
+            target = self._get_table(table)
+            method = ('staged' if len(records) > staged_threshold else 'executemany') if method == 'auto' else method
+            out = 0
+            with self._connect() as connection:
+                if method == 'staged':
+                    with self._stage_records(connection, target, records, columns=key, batch_size=batch_size, index=key) as staging:
+                        match = sqlalchemy.and_(*[staging.c[k] == target.c[k] for k in key])
+                        out = connection.execute(target.delete().where(sqlalchemy.exists().where(match))).rowcount
+                elif method == 'executemany':
+                    sql = target.delete().where(sqlalchemy.and_(*[target.c[k] == sqlalchemy.bindparam('msdss_key_' + k) for k in key]))
+                    params = [{'msdss_key_' + k:r[k] for k in key} for r in records]
+                    for i in range(0, len(params), batch_size):
+                        out += connection.execute(sql, params[i:i + batch_size]).rowcount
+                else:
+                    raise ValueError(str(method) + ' is not supported')
+            self._invalidate_results(table)
+            record['rows'] = out
+            return out
+
+    def dispose(self):
+        """
+        Close all connections in the connection pools of the database and its read replicas, and close the result cache.
+
+        A temporary directory created for a ``disk`` result cache is removed. The database should not be used after it is disposed.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+
+            db = Database(result_cache='disk')
+            db.dispose()
+        """
+        for engine in [self._connection] + self._replicas:
+            engine.dispose()
+        if self._result_cache is not None:
+            self._result_cache.close()
+
+    def drop_change_log(self, table):
+        """
+        Remove the change log table and triggers of a table created by :meth:`msdss_base_database.core.Database.create_change_log`.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to stop recording changes for.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table with a change log
+            db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True)])
+            db.create_change_log('test_table')
+
+            # Remove the change log
+            db.drop_change_log('test_table')
+            print(db.has_table('test_table_changes'))
+        """
+        dialect = self._connection.dialect.name
+        if dialect not in ('sqlite', 'postgresql'):
+            raise ValueError(dialect + ' is not supported for change logs')
+        change_table = table + DEFAULT_CHANGE_LOG_SUFFIX
+
+        # (Database_drop_change_log_triggers) Remove the triggers if the table still exists
+        quote = self._connection.dialect.identifier_preparer.quote
+        if dialect == 'sqlite':
+            statements = ['DROP TRIGGER IF EXISTS ' + quote(change_table + '_' + o) for o in ('insert', 'update', 'delete')]
+        else:
+            statements = [
+                'DROP TRIGGER IF EXISTS ' + quote(change_table + '_trigger') + ' ON ' + quote(table) if self.has_table(table) else None,
+                'DROP FUNCTION IF EXISTS ' + quote(change_table + '_log') + '()'
+            ]
+        with self._connect() as connection:
+            for statement in statements:
+                if statement is not None:
+                    connection.exec_driver_sql(statement)
+
+        # (Database_drop_change_log_table) Remove the change log table
+        if self.has_table(change_table):
+            self.drop_table(change_table)
+
+    def drop_index(self, table, name):
+        """
+        Remove an index from a table.
+        
+        Parameters
+        ----------
+        table : str
+            Name of the table with the index.
+        name : str
+            Name of the index to remove. See :meth:`msdss_base_database.core.Database.list_indexes`.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Create and remove an index
+            name = db.create_index('test_table', 'column_one')
+            db.drop_index('test_table', name)
+            print(db.list_indexes('test_table'))
+        """
+        target = self._get_table(table)
+        index = next((i for i in target.indexes if i.name == name), None)
+        if index is None:
+            raise ValueError('index ' + str(name) + ' for table ' + str(table) + ' does not exist')
+        try:
+            with self._connect() as connection:
+                index.drop(connection)
+        finally:
+            self.invalidate(table)
+
+    def drop_table(self, table, *args, **kwargs):
+        """
+        Remove a table from the database.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to remove.
+        *args, **kwargs
+            Additional arguments passed to :meth:`sqlalchemy.schema.Table.drop` after the connection, such as ``checkfirst``.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+            before_drop = db.has_table('test_table')
+
+            # Drop the table
+            db.drop_table('test_table')
+            after_drop = db.has_table('test_table')
+
+            # Print results
+            print('before_drop: ' + str(before_drop))
+            print('after_drop: ' + str(after_drop))
+        """
+        tb = self._get_table(table)
+        with self._connect() as connection:
+            tb.drop(connection, *args, **kwargs)
+        self.invalidate(table)
+
+    def explain(
+        self,
+        table,
+        select='*',
+        where=None,
+        group_by=None,
+        aggregate=None,
+        aggregate_func='count',
+        order_by=None,
+        order_by_sort='asc',
+        limit=None,
+        offset=None,
+        where_boolean='AND',
+        after=None,
+        having=None,
+        having_boolean='AND',
+        window=None,
+        partition=None,
+        analyze=False):
+        """
+        Get the plan of the database for a query, such as to see if it reads every row of a table or sorts rows without an index.
+
+        Queries that are explained are not recorded for :meth:`msdss_base_database.core.Database.suggest_indexes`.
+        
+        Parameters
+        ----------
+        table : str
+            Name of the database table to query from.
+        select : str or list(str) or None
+            See parameter ``select`` in :meth:`msdss_base_database.core.Database.select`.
+        where : list of list or list of tuple or None
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database.select`.
+        group_by : str or list(str) or None
+            See parameter ``group_by`` in :meth:`msdss_base_database.core.Database.select`.
+        aggregate : str or list(str) or dict or None
+            See parameter ``aggregate`` in :meth:`msdss_base_database.core.Database.select`.
+        aggregate_func : str or list(str)
+            See parameter ``aggregate_func`` in :meth:`msdss_base_database.core.Database.select`.
+        order_by : str or list(str) or None
+            See parameter ``order_by`` in :meth:`msdss_base_database.core.Database.select`.
+        order_by_sort : str or list(str)
+            See parameter ``order_by_sort`` in :meth:`msdss_base_database.core.Database.select`.
+        limit : int or None
+            See parameter ``limit`` in :meth:`msdss_base_database.core.Database.select`.
+        offset : int or None
+            See parameter ``offset`` in :meth:`msdss_base_database.core.Database.select`.
+        where_boolean : str
+            See parameter ``where_boolean`` in :meth:`msdss_base_database.core.Database.select`.
+        after : dict or None
+            See parameter ``after`` in :meth:`msdss_base_database.core.Database.select`.
+        having : list of list or list of tuple or None
+            See parameter ``having`` in :meth:`msdss_base_database.core.Database.select`.
+        having_boolean : str
+            See parameter ``having_boolean`` in :meth:`msdss_base_database.core.Database.select`.
+        window : dict or list(dict) or None
+            See parameter ``window`` in :meth:`msdss_base_database.core.Database.select`.
+        partition : list or tuple or None
+            See parameter ``partition`` in :meth:`msdss_base_database.core.Database.select`.
+        analyze : bool
+            Whether to also run the query to get the actual rows and times of each step. Only supported for ``postgresql``.
+
+        Returns
+        -------
+        dict
+            The parsed plan. See :meth:`msdss_base_database.core.Database._explain_query`.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Explain a query before and after indexing its columns
+            before = db.explain('test_table', where=('column_one', '=', 'a'), order_by='column_two')
+            db.create_index('test_table', ['column_one', 'column_two'])
+            after = db.explain('test_table', where=('column_one', '=', 'a'), order_by='column_two')
+
+            # Display results
+            print('before: ' + str(before['full_scans']))
+            print(before['plan'])
+            print('\\nafter: ' + str(after['full_scans']))
+            print(after['plan'])
+        """
+        sql, params = self._prepare_query(
+            table,
+            select=select,
+            where=where,
+            group_by=group_by,
+            aggregate=aggregate,
+            aggregate_func=aggregate_func,
+            order_by=order_by,
+            order_by_sort=order_by_sort,
+            limit=limit,
+            offset=offset,
+            where_boolean=where_boolean,
+            after=after,
+            having=having,
+            having_boolean=having_boolean,
+            window=window,
+            partition=partition,
+            advise=False
+        )
+        out = self._explain_query(sql, params, analyze=analyze)
+        return out
+
+    def get_watermark(self, table, consumer):
+        """
+        Get the watermark of a consumer for a table, saved by :meth:`msdss_base_database.core.Database.set_watermark` or :meth:`msdss_base_database.core.Database.select_changes`.
+
+        Watermarks are kept in the table named by ``DEFAULT_WATERMARK_TABLE`` (``msdss_watermarks``), with one row for each consumer and table.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table the watermark is for, which is the change log table (``<table>_changes``) for watermarks of the ``change_log`` of :meth:`msdss_base_database.core.Database.select_changes`.
+        consumer : str
+            Name of the consumer reading the changes.
+
+        Returns
+        -------
+        any
+            The watermark value, or ``None`` if the consumer has no watermark for the table.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Save and get a watermark
+            db.set_watermark('test_table', 'sync', 3)
+            print(db.get_watermark('test_table', 'sync'))
+        """
+        if not self.has_table(DEFAULT_WATERMARK_TABLE):
+            return None
+        df = self.select(DEFAULT_WATERMARK_TABLE, select='watermark', where=[('consumer', '=', consumer), ('table_name', '=', table)], cache=False)
+        if len(df) == 0:
+            return None
+
+        # (Database_get_watermark_decode) Convert dates and times back from ISO format
+        value = json.loads(df['watermark'].iloc[0])
+        if 'datetime' in value:
+            out = datetime.datetime.fromisoformat(value['datetime'])
+        elif 'date' in value:
+            out = datetime.date.fromisoformat(value['date'])
+        else:
+            out = value['value']
+        return out
+
+    def has_table(self, table, *args, **kwargs):
+        """
+        Check if a table exists.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to check.
+        *args, **kwargs
+            Additional arguments passed to :meth:`sqlalchemy.engine.reflection.Inspector.has_table`.
+
+        Return
+        ------
+        bool
+            Returns ``True`` if the table exists and ``False`` otherwise.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            db = Database()
+
+            # Drop the table if it exists
+            if db.has_table('test_table'):
+                db.drop_table('test_table')
+            before_create = db.has_table('test_table') # False
+            
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Check if table exists again
+            after_create = db.has_table('test_table') # True
+
+            # Print results
+            print('before_create: ' + str(before_create))
+            print('after_create: ' + str(after_create))
+        """
+        out = self._inspector.has_table(table, *args, **kwargs)
+        return out
+
+    def insert(self, table, data, method='auto', batch_size=DEFAULT_BATCH_SIZE, workers=None, chunksize=DEFAULT_CHUNKSIZE, atomic=False, max_pending=None, *args, **kwargs):
+        """
+        Insert additional data to the database.
+
+        If the table exists, data is loaded in batches with :meth:`msdss_base_database.core.Database._bulk_insert`, or in chunks on several connections at the same time with :meth:`msdss_base_database.core.Database._insert_parallel` if ``workers`` is given.
+        Otherwise, the table is created from the data with :meth:`msdss_base_database.core.Database._write_data`.
+        
+        Parameters
+        ----------
+        table : str
+            Name of the table to insert additional data to.
+        data : dict or list or :class:`pandas:pandas.DataFrame`
+            Dataframe with the data to write to the database. If ``dict`` or ``list`` see :class:`pandas:pandas.DataFrame`.
+            If the table exists, dataframe columns are cast once to the types of the table columns before loading. See parameter ``table`` in :meth:`msdss_base_database.core.Database._get_records`.
+        method : str
+            One of ``auto``, ``copy``, ``values``, or ``executemany`` (see :meth:`msdss_base_database.core.Database._bulk_insert`), or ``pandas`` to always use :meth:`msdss_base_database.core.Database._write_data`.
+        batch_size : int
+            Number of rows to insert with each statement.
+        workers : int or None
+            Number of chunks of ``chunksize`` rows to load at the same time on separate pooled connections, which should not be more than the connections allowed by the ``pool`` settings.
+            If ``None`` or ``1``, inside a :meth:`msdss_base_database.core.Database.transaction`, or if the pool cannot share its connection across threads (see :meth:`msdss_base_database.core.Database._is_single_connection`), the data is loaded on one connection. Databases that lock the whole table or file for writes, such as ``sqlite``, do not load faster with more workers.
+        chunksize : int
+            Number of rows in each chunk if ``workers`` is given.
+        atomic : bool
+            Whether to insert all or none of the data if ``workers`` is given, by loading the chunks into a staging table first. See parameter ``atomic`` in :meth:`msdss_base_database.core.Database._insert_parallel`.
+        max_pending : int or None
+            Maximum number of chunks converted or loading at a time if ``workers`` is given, so that reading the data waits for the database. If ``None``, twice the number of ``workers``.
+        *args, **kwargs
+            Additional arguments passed to :meth:`msdss_base_database.core.Database._write_data`. Except that ``if_exists`` is always set to ``append``.
+            If any are given, :meth:`msdss_base_database.core.Database._write_data` is used instead of bulk loading.
+        
+        Returns
+        -------
+        dict
+            Dictionary with keys ``rows`` (number of rows inserted), ``seconds`` (time taken), ``rows_per_second``, and ``method`` (the method used).
+        
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+            df = db.select('test_table')
+            
+            # Write data to table
+            data = {
+                'id': [1, 2, 3],
+                'column_one': ['a', 'b', 'c'],
+                'column_two': [2, 4, 6]
+            }
+            db.insert('test_table', data)
+            df_insert = db.select('test_table')
+
+            # Insert more new values to table
+            more_new = {
+                'id': [5, 6, 7],
+                'column_one': ['e', 'f', 'g'],
+                'column_two': [10, 12, 14]
+            }
+            db.insert('test_table', more_new)
+            df_insert_more = db.select('test_table')
+
+            # Display results
+            print('df:\\n')
+            print(df)
+            print('\\ndf_insert:\\n')
+            print(df_insert)
+            print('\\ndf_insert_more:\\n')
+            print(df_insert_more)
+
+            # Insert records in batches and display load stats
+            records = [
+                dict(id=8, column_one='h', column_two=16),
+                dict(id=9, column_one='i', column_two=18)
+            ]
+            stats = db.insert('test_table', records, batch_size=1)
+            print('\\nstats: ' + str(stats))
+
+            # Insert all or none of the records in chunks of 2 rows with 2 workers
+            records = [dict(id=i, column_one='j', column_two=i * 2) for i in range(10, 16)]
+            stats_parallel = db.insert('test_table', records, workers=2, chunksize=2, atomic=True)
+            print('stats_parallel: ' + str(stats_parallel))
+        """
+        with self._measure(table, 'insert') as record:
+            start = time.perf_counter()
+
+            # (Database_insert_target) Get the table if it exists and no arguments are given for pandas
+            try:
+                target = self._get_table(table) if method != 'pandas' and len(args) == 0 and len(kwargs) == 0 else None
+            except sqlalchemy.exc.NoSuchTableError:
+                target = None
+
+            # (Database_insert_write) Write with pandas if the table does not exist, otherwise bulk insert records in parallel or on one connection
+            try:
+                if target is None:
+                    rows = self._write_data(table=table, data=data, if_exists='append', *args, **kwargs)
+                    method = 'pandas'
+                elif workers is not None and workers > 1 and getattr(self._local, 'connection', None) is None and not self._is_single_connection():
+                    rows, method = self._insert_parallel(target, data, workers, chunksize=chunksize, method=method, batch_size=batch_size, atomic=atomic, max_pending=max_pending)
+                else:
+                    records = self._get_records(data, table=target)
+                    rows = len(records)
+                    if rows > 0:
+                        with self._connect() as connection:
+                            method = self._bulk_insert(connection, target, records, method=method, batch_size=batch_size)
+
+            # (Database_insert_invalidate) Remove cached results for every write path, as rows may be committed before an error
+            finally:
+                self._invalidate_results(table)
+
+            # (Database_insert_return) Return load stats
+            record['rows'] = rows
+            seconds = time.perf_counter() - start
+            out = dict(rows=rows, seconds=seconds, rows_per_second=rows / seconds if seconds > 0 else None, method=method)
+            return out
+    
+    def invalidate(self, table):
+        """
+        Remove a table and its query results from the database caches.
+
+        Use this after changing the structure or data of a table outside of this object, so that the table is reflected again and queried again on next use.
+        
+        Parameters
+        ----------
+        table : str
+            Name of the table to remove from the caches.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Cache the table, then remove it from the cache
+            db.columns('test_table')
+            before_invalidate = db.cache_info()['table']['size']
+            db.invalidate('test_table')
+            after_invalidate = db.cache_info()['table']['size']
+
+            # Display results
+            print('before_invalidate: ' + str(before_invalidate))
+            print('after_invalidate: ' + str(after_invalidate))
+        """
+        self._table_cache.invalidate(table)
+        self._invalidate_results(table)
+        if table in self._metadata.tables:
+            self._metadata.remove(self._metadata.tables[table])
+
+    def invalidate_all(self):
+        """
+        Remove all tables and query results from the database caches.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Cache the table, then clear the caches
+            db.columns('test_table')
+            db.invalidate_all()
+            print(db.cache_info())
+        """
+        self._table_cache.clear()
+        self._metadata.clear()
+        for table in set(k[0] for k in self._result_cache.keys()) if self._result_cache is not None else []:
+            self._invalidate_results(table)
+
+    def list_indexes(self, table):
+        """
+        Get the indexes of a table, including the primary key.
+        
+        Parameters
+        ----------
+        table : str
+            Name of the table to get indexes for.
+
+        Returns
+        -------
+        list(dict)
+            List of indexes, where each index is a dict with keys ``name``, ``columns`` (list of column names in order), ``unique``, and ``primary_key``.
+            The primary key is first if the table has one, and its ``name`` may be ``None`` for some databases.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Create an index and list the indexes
+            db.create_index('test_table', 'column_two', unique=True)
+            print(db.list_indexes('test_table'))
+        """
+        with self._connect() as connection:
+            inspector = sqlalchemy.inspect(connection)
+            primary_key = inspector.get_pk_constraint(table)
+            indexes = inspector.get_indexes(table)
+        out = [dict(name=primary_key.get('name'), columns=primary_key['constrained_columns'], unique=True, primary_key=True)] if len(primary_key.get('constrained_columns') or []) > 0 else []
+        out += [dict(name=i['name'], columns=i['column_names'], unique=bool(i['unique']), primary_key=False) for i in indexes]
+        return out
+
+    def paginate(
+        self,
+        table,
+        order_by='id',
+        order_by_sort='asc',
+        page_size=DEFAULT_PAGE_SIZE,
+        cursor=None,
+        *args, **kwargs):
+        """
+        Query pages of data from a table in the database with keyset pagination.
+
+        Each page is selected with the ``after`` parameter of :meth:`msdss_base_database.core.Database.select` using the ``order_by`` values of the last row of the previous page,
+        so every page takes the same time to query regardless of how deep it is in the table, unlike ``offset``.
+        
+        Parameters
+        ----------
+        table : str
+            Name of the database table to query from.
+        order_by : str or list(str)
+            Single or list of column names to order pages by. These should uniquely identify rows, have no null values, and be selected.
+        order_by_sort : str or list(str)
+            See parameter ``order_by_sort`` in :meth:`msdss_base_database.core.Database.select`.
+        page_size : int
+            Number of rows in each page.
+        cursor : str or None
+            Cursor from a previous page to continue after. If ``None``, starts from the first page.
+        *args, **kwargs
+            Additional arguments passed to :meth:`msdss_base_database.core.Database.select`, such as ``select`` and ``where``.
+
+        Yields
+        ------
+        tuple
+            A tuple of the page as a :class:`pandas:pandas.DataFrame` and a ``str`` cursor for the next page, where the cursor is ``None`` for the last page.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Write sample data
+            data = {
+                'id': [1, 2, 3, 4, 5],
+                'column_one': ['a', 'b', 'c', 'd', 'e'],
+                'column_two': [2, 4, 6, 8, 10]
+            }
+            db.insert('test_table', data)
+
+            # Get pages of 2 rows
+            for df, cursor in db.paginate('test_table', order_by='id', page_size=2):
+                print(df)
+                print('cursor: ' + str(cursor) + '\\n')
+
+            # Continue from a cursor
+            pages = db.paginate('test_table', order_by='id', page_size=2)
+            df, cursor = next(pages)
+            df_next, cursor_next = next(db.paginate('test_table', order_by='id', page_size=2, cursor=cursor))
+            print(df_next)
+        """
+        order_by = [order_by] if isinstance(order_by, str) else order_by
+
+        # (Database_paginate_cursor) Get order by values from the cursor, converting date and time str values
+        after = decode_cursor(cursor) if cursor is not None else None
+        if after is not None:
+            target = self._get_table(table)
+            for c in order_by:
+                try:
+                    python_type = target.c[c].type.python_type
+                except NotImplementedError:
+                    python_type = None
+                if python_type in (datetime.datetime, datetime.date, datetime.time) and isinstance(after[c], str):
+                    after[c] = python_type.fromisoformat(after[c])
+
+        # (Database_paginate_pages) Select each page after the last row of the previous page
+        while True:
+            df = self.select(table, order_by=order_by, order_by_sort=order_by_sort, limit=page_size, after=after, *args, **kwargs)
+            if len(df) < page_size:
+                yield df, None
+                break
+            if any(c not in df.columns for c in order_by):
+                raise ValueError('order_by columns must be selected to paginate')
+            after = self._get_records(df[order_by].iloc[[-1]])[0]
+            yield df, encode_cursor(after)
+
+    def pool_stats(self):
+        """
+        Get statistics for the connection pool.
+
+        Use these to size the pool, such as increasing ``pool_size`` if ``overflow`` or the wait times are often high.
+        
+        Returns
+        -------
+        dict
+            Dictionary of pool statistics with keys:
+
+            * ``pool``: name of the pool class
+            * ``size``: number of connections the pool keeps open, or ``None`` if the pool does not have a fixed size
+            * ``checked_out``: number of connections currently in use
+            * ``idle``: number of open connections that are not in use, or ``None`` if not tracked by the pool
+            * ``overflow``: number of connections opened beyond ``size``, or ``None`` if the pool does not overflow
+            * ``connects``, ``checkouts``, ``checkins``, ``invalidations``: total number of pool events
+            * ``waits``: number of connections requested by this object from the primary database
+            * ``wait_seconds_total``, ``wait_seconds_max``, ``wait_seconds_mean``: time taken to get connections requested by this object from the primary database
+            * ``replicas``: if ``replicas`` is set in :class:`msdss_base_database.core.Database`, a list of dicts for each replica with keys ``url`` (without the password), ``reads`` (number of reads sent to it), ``in_flight`` (number of reads running), ``errors`` (number of failed connections),
+              and ``waits``, ``wait_seconds_total``, ``wait_seconds_max``, ``wait_seconds_mean`` for the connections requested from the replica
+
+            The pool statistics are for the primary database, and the wait statistics of each database are kept separately, so that reads from replicas do not change the waits of the primary database.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database with a pool profile
+            db = Database(pool='small')
+
+            # Run a query
+            db.has_table('test_table')
+            db._execute_query('SELECT 1')
+
+            # Display pool stats
+            print(db.pool_stats())
+        """
+        pool = self._connection.pool
+        with self._pool_lock:
+            counters = dict(self._pool_counters)
+        out = dict(
+            pool=type(pool).__name__,
+            size=pool.size() if callable(getattr(pool, 'size', None)) else getattr(pool, 'size', None),
+            checked_out=pool.checkedout() if hasattr(pool, 'checkedout') else counters['checkouts'] - counters['checkins'],
+            idle=pool.checkedin() if hasattr(pool, 'checkedin') else None,
+            overflow=max(0, pool.overflow()) if hasattr(pool, 'overflow') else None,
+            **counters,
+            wait_seconds_mean=counters['wait_seconds_total'] / counters['waits'] if counters['waits'] > 0 else None
+        )
+
+        # (Database_pool_stats_replicas) Add the reads of each replica
+        if len(self._replicas) > 0:
+            with self._replica_lock:
+                out['replicas'] = [dict(url=e.url.render_as_string(hide_password=True), **c, wait_seconds_mean=c['wait_seconds_total'] / c['waits'] if c['waits'] > 0 else None) for e, c in zip(self._replicas, self._replica_counters)]
+        return out
+
+    def prepare(
+        self,
+        table,
+        select='*',
+        where=None,
+        group_by=None,
+        aggregate=None,
+        aggregate_func='count',
+        order_by=None,
+        order_by_sort='asc',
+        limit=None,
+        offset=None,
+        where_boolean='AND',
+        after=None,
+        having=None,
+        having_boolean='AND',
+        window=None,
+        output='pandas',
+        server=None):
+        """
+        Prepare a select query to run many times with different values.
+
+        Values in ``where``, ``limit``, ``offset``, ``after``, and ``having`` can be :class:`msdss_base_database.prepared.Param` objects, which are given by name each time the prepared query is called.
+        The statement is built and compiled once, so each call skips the work done by :meth:`msdss_base_database.core.Database.select` before the query is sent to the database.
+        Other values are fixed when the query is prepared.
+
+        Parameters
+        ----------
+        table : str or :class:`sqlalchemy.schema.Table`
+            Name of the database table to query from or a table object.
+        select : str or list(str) or None
+            See parameter ``select`` in :meth:`msdss_base_database.core.Database.select`.
+        where : list of list or list of tuple or None
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database.select`, where values can be :class:`msdss_base_database.prepared.Param` objects.
+            A value of ``None`` is always a null check and cannot be given as a parameter.
+        group_by : str or list(str) or None
+            See parameter ``group_by`` in :meth:`msdss_base_database.core.Database.select`.
+        aggregate : str or list(str) or dict or None
+            See parameter ``aggregate`` in :meth:`msdss_base_database.core.Database.select`.
+        aggregate_func : str or list(str)
+            See parameter ``aggregate_func`` in :meth:`msdss_base_database.core.Database.select`.
+        order_by : str or list(str) or None
+            See parameter ``order_by`` in :meth:`msdss_base_database.core.Database.select`.
+        order_by_sort : str or list(str)
+            See parameter ``order_by_sort`` in :meth:`msdss_base_database.core.Database.select`.
+        limit : int or :class:`msdss_base_database.prepared.Param` or None
+            See parameter ``limit`` in :meth:`msdss_base_database.core.Database.select`.
+        offset : int or :class:`msdss_base_database.prepared.Param` or None
+            See parameter ``offset`` in :meth:`msdss_base_database.core.Database.select`.
+        where_boolean : str
+            See parameter ``where_boolean`` in :meth:`msdss_base_database.core.Database.select`.
+        after : dict or None
+            See parameter ``after`` in :meth:`msdss_base_database.core.Database.select`, where values can be :class:`msdss_base_database.prepared.Param` objects.
+        having : list of list or list of tuple or None
+            See parameter ``having`` in :meth:`msdss_base_database.core.Database.select`, where values can be :class:`msdss_base_database.prepared.Param` objects.
+        having_boolean : str
+            See parameter ``having_boolean`` in :meth:`msdss_base_database.core.Database.select`.
+        window : dict or list(dict) or None
+            See parameter ``window`` in :meth:`msdss_base_database.core.Database.select`.
+        output : str
+            One of ``pandas`` to return a :class:`pandas:pandas.DataFrame`, ``rows`` to return a list of tuples, or ``arrow`` to return a :class:`pyarrow:pyarrow.Table` from each call.
+        server : bool or None
+            Whether to also prepare the statement on the database server with ``PREPARE``, so that it is planned once for each pooled connection instead of on every call.
+            This is only supported for ``postgresql`` with the ``psycopg2`` driver. If ``None``, it is used when supported.
+        
+        Returns
+        -------
+        :class:`msdss_base_database.prepared.PreparedQuery`
+            Callable that takes the values of each :class:`msdss_base_database.prepared.Param` as keyword arguments and returns the queried data.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database, Param
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+            
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Write sample data
+            data = {
+                'id': [1, 2, 3],
+                'column_one': ['a', 'b', 'c'],
+                'column_two': [2, 4, 6]
+            }
+            db.insert('test_table', data)
+
+            # Prepare a lookup by id
+            lookup = db.prepare('test_table', select=['id', 'column_one'], where=[('id', '=', Param('id'))])
+
+            # Prepare a query with a fixed where value and a limit parameter
+            top = db.prepare('test_table', where=[('column_two', '>', 2)], order_by='column_two', order_by_sort='desc', limit=Param('n'), output='rows')
+
+            # Display results
+            for i in [1, 2, 3]:
+                print(lookup(id=i))
+            print(top(n=1))
+        """
+        target = table if isinstance(table, sqlalchemy.Table) else self._get_table(table)
+        dialect = self._connection.dialect
+
+        # (Database_prepare_check) Check that parameters can be bound
+        if self._literal_limit and (isinstance(limit, Param) or isinstance(offset, Param)):
+            raise ValueError('limit and offset parameters for ' + dialect.name + ' is not supported')
+        server = dialect.name == 'postgresql' and dialect.driver == 'psycopg2' if server is None else server
+
+        # (Database_prepare_query) Build the statement with bound parameters and get the fixed and parameter values
+        kwargs = dict(
+            select=select,
+            where=where,
+            group_by=group_by,
+            aggregate=aggregate,
+            aggregate_func=aggregate_func,
+            order_by=order_by,
+            order_by_sort=order_by_sort,
+            limit=limit,
+            offset=offset,
+            where_boolean=where_boolean,
+            after=after,
+            having=having,
+            having_boolean=having_boolean,
+            window=window
+        )
+        sql = self._build_query(target, bind=True, **kwargs)
+        params = self._get_query_params(**kwargs)
+        out = PreparedQuery(self, target.name, sql, params, output=output, server=server)
+        return out
+
+    def query_stats(self, history=False):
+        """
+        Get the summary of the time spent in each phase of the queries for each table and operation.
+        
+        Parameters
+        ----------
+        history : bool
+            Whether to return the most recent query records instead of the summary.
+
+        Returns
+        -------
+        dict or list(dict)
+            See :meth:`msdss_base_database.stats.QueryStats.summary` and :meth:`msdss_base_database.stats.QueryStats.history`. The phases are:
+
+            * ``build``: building the statement, excluding any table reflection queries
+            * ``compile``: sqlalchemy compiling the statement
+            * ``execute``: the database executing the statement
+            * ``fetch``: fetching the results, which also includes creating the dataframe if it is created by :meth:`pandas:pandas.read_sql`
+            * ``frame``: creating the dataframe or arrow table from fetched rows
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database(stats=True)
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Run queries
+            db.insert('test_table', {'id': [1, 2, 3], 'column_one': ['a', 'b', 'c'], 'column_two': [2, 4, 6]})
+            db.select('test_table', where=('column_two', '>', 2))
+            db.update('test_table', where=('id', '=', 1), values={'column_one': 'AA'})
+
+            # Display query stats
+            for key, summary in db.query_stats().items():
+                print(str(key) + ': ' + str(summary))
+        """
+        if self._stats is None:
+            raise ValueError('query stats are not recorded')
+        out = self._stats.history() if history else self._stats.summary()
+        return out
+
+    def remove_query_hook(self, hook):
+        """
+        Remove a function added with :meth:`msdss_base_database.core.Database.add_query_hook`.
+
+        Parameters
+        ----------
+        hook : func
+            Function to remove.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            db = Database(stats=True)
+            db.add_query_hook(print)
+            db.remove_query_hook(print)
+            db._execute_query('SELECT 1')
+        """
+        if self._stats is None:
+            raise ValueError('query stats are not recorded')
+        self._stats.remove_hook(hook)
+
+    def reset_query_stats(self):
+        """
+        Remove all query records and summaries.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            db = Database(stats=True)
+            db._execute_query('SELECT 1')
+            db.reset_query_stats()
+            print(db.query_stats())
+        """
+        if self._stats is None:
+            raise ValueError('query stats are not recorded')
+        self._stats.reset()
+
+    def rows(self, table):
+        """
+        Get number of rows for a table.
+        
+        Parameters
+        ----------
+        table : str
+            Name of the table to get rows for.
+        
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+            
+            # Write data to table
+            data = {
+                'id': [1, 2, 3],
                 'column_one': ['a', 'b', 'c'],
                 'column_two': [2, 4, 6]
             }
             db.insert('test_table', data)
             df = db.select('test_table')
 
-            # Get number of rows in table
-            columns = db.columns('test_table')
+            # Get number of columns in table
+            rows = db.rows('test_table')
 
             # Display results
             print('df:\\n')
             print(df)
-            print(f'\\ncolumns: {columns}')
+            print(f'\\nrows: {rows}')
         """
         table = self._get_table(table)
-        out = len(table.c)
+        with self._connect(read=True) as connection:
+            out = connection.execute(sqlalchemy.select([sqlalchemy.func.count()]).select_from(table)).scalar()
         return out
-    
-    def create_table(self, table, columns):
+
+    def select(
+        self,
+        table,
+        select='*',
+        where=None,
+        group_by=None,
+        aggregate=None,
+        aggregate_func='count',
+        order_by=None,
+        order_by_sort='asc',
+        limit=None,
+        offset=None,
+        where_boolean='AND',
+        after=None,
+        having=None,
+        having_boolean='AND',
+        window=None,
+        partition=None,
+        output='pandas',
+        dtype_backend=None,
+        dtypes=None,
+        categories=None,
+        chunksize=DEFAULT_CHUNKSIZE,
+        cache=True,
+        *args, **kwargs):
+        """
+        Query data from a table in the database.
+        
+        Parameters
+        ----------
+        table : str
+            Name of the database table to query from.
+        select : str or list(str) or list(:class:`sqlalchemy:sqlalchemy.schema.Column`) or None
+            List of column names or a single column name to filter or select from the table.
+            
+            * If ``None``, columns will not be added to the select statement.
+            * If ``'*'``, then all columns will be selected
+            
+        where : list of list or list of tuple or None
+            list of where statements the form of ``['column_name', 'operator', value]`` to further filter individual values or rows.
+            
+            * Operators are one of:
+
+                .. jupyter-execute::
+                    :hide-code:
+
+                    from msdss_base_database.defaults import DEFAULT_SUPPORTED_OPERATORS
+                    for operator in DEFAULT_SUPPORTED_OPERATORS:
+                        print(operator)
+                        
+            * Values can be any single value such as ``int`` or ``str``
+            * Examples: ``['column_two', '>', 2]``, ``['column_one', 'LIKE', 'a']``, ``[['column_two', '>', 2], ['column_one', 'LIKE', 'a']]``            
+
+        group_by : str or list(str) or None
+            Single or list of column names to group by. This should be used with ``aggregate`` and ``aggregate_func``.
+        aggregate : str or list(str) or dict or None
+            Single or list of column names to aggregate using the ``aggregate_func``. This should be used with ``aggregate_func``.
+            If a dict, then keys are column names and values are a function name or a list of function names for that column, which overrides ``aggregate_func``, such as ``{'column_two': ['sum', 'avg'], 'column_one': 'count_distinct'}``.
+            A column name of ``'*'`` aggregates rows rather than a column, such as ``{'*': 'count'}``.
+            Aggregated columns are named ``<column>_<function>``, or ``<function>`` for ``'*'``.
+        aggregate_func : str or list(str)
+            Function name (such as 'count' or 'sum') from :class:`sqlalchemy:sqlalchemy.sql.functions.Function` for aggregating records from each ``aggregate`` column.
+            Function names ending with ``_distinct`` (such as 'count_distinct') aggregate the distinct values of the column only.
+            If a list of str, then it must have the same number of elements as ``aggregate`` or else only the shortest length list will be used.
+        order_by : str or list(str) or None
+            Single or list of column names to order or sort by.
+        order_by_sort : str or list(str)
+            Sort the records in increasing or decreasing order by each column in ``order_by``, where the value can be one of 'asc' for ascending or 'desc' for descending'.
+            If a list of str, then it must have the same number of elements as ``order_by`` or else only the shortest length list will be used.
+        limit : int or None
+            Integer number to limit the number of rows returned.
+        offset : int or None
+            Number of rows to skip for the query.
+        where_boolean : str
+            One of ``AND`` or ``OR`` to combine ``where`` statements with. Defaults to ``AND`` if not one of ``AND`` or ``OR``.
+        after : dict or None
+            Dictionary of values for each ``order_by`` column from the last row of a previous page, to only get rows after that row.
+            See parameter ``after`` in :meth:`msdss_base_database.core.Database._build_query` and :meth:`msdss_base_database.core.Database.paginate`.
+        having : list of list or list of tuple or None
+            list of having statements in the form of ``['column_name', 'operator', value]`` to filter groups by aggregated columns, such as ``[('column_two_sum', '>', 10)]``.
+            See parameter ``having`` in :meth:`msdss_base_database.core.Database._build_query`.
+        having_boolean : str
+            One of ``AND`` or ``OR`` to combine ``having`` statements with. Defaults to ``AND`` if not one of ``AND`` or ``OR``.
+        window : dict or list(dict) or None
+            Single or list of window functions to add as columns, such as ``dict(func='sum', column='column_two', partition_by='column_one', order_by='id')`` for a running total.
+            See parameter ``window`` in :meth:`msdss_base_database.core.Database._build_query`.
+        partition : list or tuple or None
+            Partition of the rows to select, combined with the ``where`` statements using ``AND``.
+            See parameter ``partition`` in :meth:`msdss_base_database.core.Database._build_query` and :meth:`msdss_base_database.core.Database.select_parallel`.
+        output : str
+            One of ``pandas`` to return a :class:`pandas:pandas.DataFrame` or ``arrow`` to return a :class:`pyarrow:pyarrow.Table`.
+            The ``arrow`` output builds columns directly from the fetched rows in batches of ``chunksize`` rows instead of through :meth:`pandas:pandas.read_sql`, and requires the ``pyarrow`` package.
+        dtype_backend : str or None
+            Data types of the :class:`pandas:pandas.DataFrame` columns for the ``pandas`` output.
+
+            * If ``'pyarrow'``, the data is fetched as with the ``arrow`` output and converted to a dataframe with :class:`pandas:pandas.ArrowDtype` columns, without creating python objects for each value
+            * If ``None``, the data is read with :meth:`pandas:pandas.read_sql` using the default data types
+            * Otherwise, passed as the ``dtype_backend`` of :meth:`pandas:pandas.read_sql`
+
+        dtypes : str or dict or None
+            Data types of the :class:`pandas:pandas.DataFrame` columns for the ``pandas`` output from the types of the table columns, instead of inferring them from the values with :meth:`pandas:pandas.read_sql`.
+
+            * If ``'schema'``, nullable types from the table columns are used, such as ``Int64`` for integers and ``string`` for text (see :func:`msdss_base_database.tools.get_pandas_dtype`)
+            * If ``dict``, column names and pandas data types to use for those columns instead, with the other columns as ``'schema'``
+            * If ``None``, the types are inferred unless ``categories`` is given
+
+            Each column is created once with its type from the fetched rows by :func:`msdss_base_database.tools.get_dataframe`. Not used if ``dtype_backend`` is ``'pyarrow'``.
+        categories : list(str) or str or None
+            List of column names to return as :class:`pandas:pandas.Categorical` columns for the ``pandas`` output, or ``'auto'`` for text columns with few unique values (see :func:`msdss_base_database.tools.get_dataframe`).
+            If given, ``dtypes`` defaults to ``'schema'``.
+        chunksize : int
+            Number of rows to fetch at a time for the ``arrow`` output or the ``pyarrow`` data types.
+        cache : bool
+            Whether to use the result cache if it is set with parameter ``result_cache`` in :class:`msdss_base_database.core.Database`.
+            Results are not cached inside a :meth:`msdss_base_database.core.Database.transaction` or if any arguments are not hashable.
+        *args, **kwargs
+            Additional parameters passed to :meth:`pandas:pandas.read_sql`.
+        
+        Returns
+        -------
+        :class:`pandas:pandas.DataFrame` or :class:`pyarrow:pyarrow.Table`
+            pandas dataframe or arrow table containing the queried data.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.core import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+            
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+
+            # Write sample data
+            data = {
+                'id': [1, 2, 3],
+                'column_one': ['a', 'b', 'c'],
+                'column_two': [2, 4, 6]
+            }
+            db.insert('test_table', data)
+            df = db.select('test_table')
+            
+            # Read data from table using select and limit
+            data = db.select(
+                'test_table',
+                select = ['column_one', 'column_two'],
+                limit = 5
+            )
+            df_select = db.select('test_table')
+
+            # Use where statements
+            data = db.select(
+                'test_table',
+                select = 'column_one',
+                where = [('column_two', '<', '15'), ('column_one', '=', 'b')],
+                where_boolean = 'AND'
+            )
+            df_where = db.select('test_table')
+
+            # Order results
+            data = db.select(
+                'test_table',
+                select = ['column_one', 'column_two'],
+                order_by = ['column_one', 'column_two'],
+                order_by_sort = ['asc', 'desc']
+            )
+            df_order = db.select('test_table')
+
+            # Aggregate read
+            data = db.select(
+                'test_table',
+                select = 'column_one',
+                group_by = 'column_one',
+                aggregate = 'column_two',
+                aggregate_func = ['count', 'sum']
+            )
+            df_agg = db.select('test_table')
+
+            # Aggregate with several functions and filter the groups
+            df_having = db.select(
+                'test_table',
+                select = 'column_one',
+                group_by = 'column_one',
+                aggregate = {'column_two': ['sum', 'max'], '*': 'count'},
+                having = [('count', '>=', 1)]
+            )
+
+            # Add a running total with a window function
+            df_window = db.select(
+                'test_table',
+                window = dict(func='sum', column='column_two', order_by='id', label='running_total')
+            )
+
+            # Read data with the types of the table columns and categorical text
+            df_schema = db.select('test_table', dtypes='schema', categories=['column_one'])
+
+            # Read data as an arrow table
+            table_arrow = db.select('test_table', output='arrow')
+
+            # Read data with arrow data types
+            df_arrow = db.select('test_table', dtype_backend='pyarrow')
+
+            # Display results
+            print('df:\\n')
+            print(df)
+            print('\\ndf_select:\\n')
+            print(df_select)
+            print('\\ndf_where:\\n')
+            print(df_where)
+            print('\\ndf_order:\\n')
+            print(df_order)
+            print('\\ndf_agg:\\n')
+            print(df_agg)
+            print('\\ndf_having:\\n')
+            print(df_having)
+            print('\\ndf_window:\\n')
+            print(df_window)
+            print('\\ntable_arrow:\\n')
+            print(table_arrow)
+            print('\\ndf_arrow dtypes:\\n')
+            print(df_arrow.dtypes)
+            print('\\ndf_schema dtypes:\\n')
+            print(df_schema.dtypes)
+        """
+
+        # (Database_select_output) Check the output before querying
+        if output not in ('pandas', 'arrow'):
+            raise ValueError(str(output) + ' is not supported')
+        with self._measure(table, 'select') as record:
+            start = time.perf_counter()
+            sql, params, key = self._prepare_query(
+                table,
+                select=select,
+                where=where,
+                group_by=group_by,
+                aggregate=aggregate,
+                aggregate_func=aggregate_func,
+                order_by=order_by,
+                order_by_sort=order_by_sort,
+                limit=limit,
+                offset=offset,
+                where_boolean=where_boolean,
+                after=after,
+                having=having,
+                having_boolean=having_boolean,
+                window=window,
+                partition=partition,
+                return_key=True
+            )
+            record['build'] = time.perf_counter() - start - record['compile'] - record['execute']
+            record['statement'] = sql
+
+            # (Database_select_cache) Get the cached result if one exists for the same arguments
+            use_cache = cache and self._result_cache is not None and getattr(self._local, 'connection', None) is None
+            if use_cache:
+                try:
+                    result_key = (key[0], key, tuple(sorted(params.items())), output, dtype_backend, tuple(sorted(dtypes.items())) if isinstance(dtypes, dict) else dtypes, tuple(categories) if isinstance(categories, list) else categories, args, tuple(sorted(kwargs.items())))
+                    hash(result_key)
+                except TypeError:
+                    use_cache = False
+            if use_cache:
+                cached = self._result_cache.get(result_key)
+                if cached is not None:
+                    out = cached.copy() if is_dataframe(cached) else cached
+                    record.update(cached=True, rows=len(out))
+                    return out
+                version = self._result_versions.get(key[0], 0)
+
+            # (Database_select_arrow) Build an arrow table from batches of rows
+            if output == 'arrow' or (output == 'pandas' and dtype_backend == 'pyarrow'):
+                with self._connect(read=True) as connection:
+                    out = get_arrow_table(list(self._fetch_arrow(connection, sql, params, chunksize=chunksize)))
+                if output == 'pandas':
+                    import pandas
+                    start = time.perf_counter()
+                    out = out.to_pandas(types_mapper=pandas.ArrowDtype)
+                    record['frame'] += time.perf_counter() - start
+
+            # (Database_select_dtypes) Build a dataframe from the rows with the types of the table columns
+            elif output == 'pandas' and (dtypes is not None or categories is not None):
+                dtypes = self._get_dtypes(sql, dtypes if dtypes is not None else 'schema')
+                start = time.perf_counter()
+                queried = record['compile'] + record['execute']
+                with self._connect(read=True) as connection:
+                    result = connection.execute(sql, params)
+                    columns = list(result.keys())
+                    rows = result.fetchall()
+                record['fetch'] = time.perf_counter() - start - (record['compile'] + record['execute'] - queried)
+                start = time.perf_counter()
+                out = get_dataframe(rows, columns, dtypes=dtypes, categories=categories)
+                record['frame'] += time.perf_counter() - start
+        
+            # (Database_select_pandas) Read a dataframe with pandas
+            else:
+                import pandas
+                read_kwargs = {**kwargs, 'dtype_backend': dtype_backend} if dtype_backend is not None else kwargs
+                start = time.perf_counter()
+                queried = record['compile'] + record['execute']
+                with self._connect(read=True) as connection:
+                    out = pandas.read_sql(sql = sql, con = connection, params = params, *args, **read_kwargs)
+                record['fetch'] = time.perf_counter() - start - (record['compile'] + record['execute'] - queried)
+
+            # (Database_select_stats) Record the size of the result, where the dataframe size does not include the contents of python objects
+            record['rows'] = len(out)
+            record['bytes'] = int(out.memory_usage(index=True, deep=False).sum()) if is_dataframe(out) else out.nbytes
+
+            # (Database_select_cache_set) Cache the result if the table was not written to while querying
+            if use_cache and self._result_versions.get(key[0], 0) == version:
+                if is_dataframe(out):
+                    self._result_cache.set(result_key, out.copy(), size=int(out.memory_usage(index=True, deep=True).sum()), group=key[0])
+                else:
+                    self._result_cache.set(result_key, out, size=out.nbytes, group=key[0])
+            return out
+
+    def select_changes(
+        self,
+        table,
+        watermark_column='id',
+        since=None,
+        consumer=None,
+        select='*',
+        where=None,
+        where_boolean='AND',
+        limit=None,
+        change_log=False,
+        commit=True):
+        """
+        Query the rows of a table that changed after a watermark, so that a consumer syncing the table only reads the rows changed since its last sync.
+
+        Rows are returned in order of the watermark column, and the watermark of the ``consumer`` is saved as the last value returned, which is used as ``since`` for its next call.
+
+        * Without ``change_log``, rows with a ``watermark_column`` value greater than ``since`` are returned. The column should increase each time a row is inserted or updated, such as an increasing id or an updated time. Deleted rows are not returned
+        * With ``change_log``, the changes recorded by :meth:`msdss_base_database.core.Database.create_change_log` after ``since`` are returned, including deletes
+
+        Parameters
+        ----------
+        table : str
+            Name of the database table to query changes from.
+        watermark_column : str
+            Name of the column to compare with the watermark, which is not used with ``change_log``.
+        since : any
+            Only rows with a watermark value greater than this value are returned. If ``None``, the saved watermark of the ``consumer`` is used, or all rows are returned if there is none.
+        consumer : str or None
+            Name of the consumer reading the changes, used to get and save its watermark with :meth:`msdss_base_database.core.Database.get_watermark` and :meth:`msdss_base_database.core.Database.set_watermark`.
+            If ``None``, watermarks are not saved.
+        select : str or list(str)
+            See parameter ``select`` in :meth:`msdss_base_database.core.Database.select`. The ``watermark_column`` is always selected.
+        where : list of list or list of tuple or None
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database.select`, which is combined with the watermark using ``AND``. Not supported with ``change_log``.
+        where_boolean : str
+            See parameter ``where_boolean`` in :meth:`msdss_base_database.core.Database.select`.
+        limit : int or None
+            Maximum number of rows or changes to return, where later rows are returned by the next call.
+            Without ``change_log``, if the limit ends within rows that have the same watermark value, those rows are left for the next call so that they are not skipped.
+            If all of the rows have the same watermark value, all rows with that value are returned instead, which can be more than ``limit`` rows.
+            A ``ValueError`` is raised for this case if ``where`` statements are combined with ``OR``.
+        change_log : bool
+            Whether to return the changes from the change log of the table (see :meth:`msdss_base_database.core.Database.create_change_log`).
+            Only the last change of each key is returned, with the columns ``change_id``, ``operation``, and ``changed_at`` of the change and the current values of the row, which are missing for deleted rows.
+        commit : bool
+            Whether to save the watermark of the ``consumer`` after the query. If ``False``, the watermark can be saved with :meth:`msdss_base_database.core.Database.set_watermark` after the rows are processed, so that rows are not missed if processing fails.
+
+        Returns
+        -------
+        :class:`pandas:pandas.DataFrame`
+            The changed rows in order of the watermark.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
+            
+            # Setup database
+            db = Database()
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
+            # Create sample table
+            columns = [
+                dict(name='id', type_='Integer', primary_key=True),
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
+            ]
+            db.create_table('test_table', columns)
+            db.set_watermark('test_table', 'sync', None)
+            db.insert('test_table', {'id': [1, 2], 'column_one': ['a', 'b'], 'column_two': [2, 4]})
+
+            # Get new rows since the last sync by id
+            first = db.select_changes('test_table', consumer='sync')
+            db.insert('test_table', {'id': [3], 'column_one': ['c'], 'column_two': [6]})
+            second = db.select_changes('test_table', consumer='sync')
+
+            # Get inserts, updates, and deletes from a change log
+            db.create_change_log('test_table')
+            db.update('test_table', where=('id', '=', 1), values={'column_one': 'aa'})
+            db.delete('test_table', where=('id', '=', 2))
+            changes = db.select_changes('test_table', consumer='sync', change_log=True)
+            db.drop_change_log('test_table')
+
+            # Display results
+            print('first:\\n')
+            print(first)
+            print('\\nsecond:\\n')
+            print(second)
+            print('\\nchanges:\\n')
+            print(changes)
+        """
+        select = [select] if isinstance(select, str) and select != '*' else select
+        if change_log:
+            if where is not None:
+                raise ValueError('where with change_log is not supported')
+            source = table + DEFAULT_CHANGE_LOG_SUFFIX
+            watermark_column = 'change_id'
+        else:
+            source = table
+            select = select + [watermark_column] if select != '*' and watermark_column not in select else select
+        since = self.get_watermark(source, consumer) if since is None and consumer is not None else since
+
+        # (Database_select_changes_query) Query rows after the watermark in order
+        after = {watermark_column: since} if since is not None else None
+        out = self.select(
+            source,
+            select='*' if change_log else select,
+            where=where,
+            where_boolean=where_boolean,
+            order_by=watermark_column,
+            after=after,
+            limit=limit + 1 if limit is not None and not change_log else limit,
+            cache=False
+        )
+
+        # (Database_select_changes_ties) Leave rows with the last watermark value for the next call if the limit split them
+        if not change_log and limit is not None and len(out) > limit:
+            last = out[watermark_column].iloc[limit - 1]
+            tied = out[watermark_column].iloc[limit] == last
+            out = out.iloc[:limit]
+            if tied and (out[watermark_column] != last).any():
+                out = out[out[watermark_column] != last].reset_index(drop=True)
+
+            # (Database_select_changes_ties_all) Get all rows with the last watermark value if they are the whole page, as the next call would skip the rest
+            elif tied:
+                tied_where = [where] if where is not None and not any(isinstance(w, list) or isinstance(w, tuple) for w in where) else where
+                if tied_where is not None and len(tied_where) > 1 and where_boolean.lower() == 'or':
+                    raise ValueError('limit ' + str(limit) + ' is too small for the rows with watermark value ' + str(last))
+                last = last.to_pydatetime() if hasattr(last, 'to_pydatetime') else last.item() if hasattr(last, 'item') else last
+                out = self.select(source, select=select, where=(tied_where or []) + [(watermark_column, '=', last)], order_by=watermark_column, cache=False)
+        watermark = out[watermark_column].iloc[-1] if len(out) > 0 else None
+
+        # (Database_select_changes_log) Get the current values of the last change of each key
+        if change_log and len(out) > 0:
+            key = next(c for c in out.columns if c not in ('change_id', 'operation', 'changed_at'))
+            out = out.drop_duplicates(key, keep='last')
+            keys = out[key][out['operation'] != 'delete'].tolist()
+            if len(keys) > 0:
+                rows = self.select_in(table, key, keys, select=select if select == '*' or key in select else select + [key])
+                out = out.merge(rows, on=key, how='left')
+            out = out.sort_values('change_id', ignore_index=True)
+
+        # (Database_select_changes_commit) Save the watermark of the consumer
+        if commit and consumer is not None and watermark is not None:
+            self.set_watermark(source, consumer, watermark)
+        return out
+
+    def select_in(
+        self,
+        table,
+        column,
+        values,
+        select='*',
+        where=None,
+        order_by=None,
+        order_by_sort='asc',
+        where_boolean='AND',
+        method='auto',
+        batch_size=DEFAULT_BATCH_SIZE,
+        staged_threshold=DEFAULT_STAGED_THRESHOLD,
+        output='pandas'):
         """
-        Create a table in the database.
+        Query the rows of a table in the database where a column has any of many values.
+
+        Values are looked up in batches of ``IN`` lists or PostgreSQL arrays, or by joining to a staging table of values (see :meth:`msdss_base_database.core.Database._stage_records`),
+        so that many lookups take a few statements instead of one for each value or a long ``OR`` of ``where`` statements.
         
         Parameters
         ----------
         table : str
-            Name of the table to create.
-        columns : list(dict) or list(list)
-            List of dict (kwargs) or lists (positional args) that are passed to :class:`sqlalchemy.schema.Column`. Data types can also be specified as str.
-            
-            * Example list(dict): ``[dict(name='id', type_='Integer', autoincrement=True, primary_key=True), dict(name='col', type='String')]``
-            * Example list(list): ``[('id', 'Integer'), ('col', 'String')]``
+            Name of the database table to query from.
+        column : str
+            Name of the column to look up the values in.
+        values : list
+            Values to look up. Duplicate and ``None`` values are removed, as ``None`` never matches.
+        select : str or list(str) or None
+            See parameter ``select`` in :meth:`msdss_base_database.core.Database.select`.
+        where : list of list or list of tuple or None
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database.select`, which is combined with the lookup using ``AND``.
+        order_by : str or list(str) or None
+            See parameter ``order_by`` in :meth:`msdss_base_database.core.Database.select`. Rows from several batches are sorted after they are combined.
+        order_by_sort : str or list(str)
+            See parameter ``order_by_sort`` in :meth:`msdss_base_database.core.Database.select`.
+        where_boolean : str
+            See parameter ``where_boolean`` in :meth:`msdss_base_database.core.Database.select`.
+        method : str
+            One of:
+
+            * ``in``: a ``column IN (...)`` statement for each batch of values
+            * ``any``: a ``column = ANY(array)`` statement for each batch of values, which is only supported for ``postgresql``
+            * ``staged``: load the values into a staging table and query the rows with matching values in one statement
+            * ``auto``: ``staged`` if there are more than ``staged_threshold`` values, otherwise ``any`` for ``postgresql`` and ``in`` for other databases
+
+        batch_size : int
+            Number of values to look up with each statement or to load into the staging table with each statement. ``IN`` batches are kept under the limit of bound parameters (see :meth:`msdss_base_database.core.Database._get_batch_size`).
+        staged_threshold : int
+            Number of values above which ``auto`` uses the ``staged`` method.
+        output : str
+            One of ``pandas`` to return a :class:`pandas:pandas.DataFrame`, ``rows`` to return a list of rows that behave like named tuples, or ``arrow`` to return a :class:`pyarrow:pyarrow.Table`.
+        
+        Returns
+        -------
+        :class:`pandas:pandas.DataFrame` or list(:class:`sqlalchemy:sqlalchemy.engine.Row`) or :class:`pyarrow:pyarrow.Table`
+            The queried data.
 
         Author
         ------
         Richard Wen <rrwen.dev@gmail.com>
-        
+
         Example
         -------
         .. jupyter-execute::
 
-            from msdss_base_database import Database
+            from msdss_base_database.core import Database
             
             # Setup database
             db = Database()
 
-            # Drop table if exists
-            if db.has_table('test_table'):
-                db.drop_table('test_table')
-
-            # Create column definitions
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+            
+            # Create sample table
             columns = [
                 dict(name='id', type_='Integer', primary_key=True),
-                dict(name='column_one', type_='String'),
-                dict(name='column_two', type_='Integer')
+                ('column_one', 'String'),
+                ('column_two', 'Integer')
             ]
-            
-            # Create the table
             db.create_table('test_table', columns)
 
-            # View the table
-            df = db.select('test_table')
+            # Write sample data
+            data = {
+                'id': list(range(1, 11)),
+                'column_one': list('abcdefghij'),
+                'column_two': list(range(2, 22, 2))
+            }
+            db.insert('test_table', data)
+
+            # Look up rows by id in batches of 2 ids
+            df = db.select_in('test_table', 'id', [1, 3, 5, 7, 9], batch_size=2, order_by='id')
+
+            # Look up rows by id with a staging table
+            df_staged = db.select_in('test_table', 'id', [2, 4, 6], method='staged', where=('column_two', '>', 4))
+
+            # Display results
+            print('df:\\n')
             print(df)
+            print('\\ndf_staged:\\n')
+            print(df_staged)
         """
-        columns = self._list_to_columns(columns)
-        tb = sqlalchemy.Table(table, self._metadata, *columns, extend_existing=True)
-        tb.create(self._connection)
 
-    def delete(self, table, where, where_boolean='AND', *args, **kwargs):
+        # (Database_select_in_check) Check the output before querying
+        if output not in ('pandas', 'rows', 'arrow'):
+            raise ValueError(str(output) + ' is not supported')
+        with self._measure(table, 'select_in') as record:
+            start = time.perf_counter()
+            target = self._get_table(table)
+            dialect = self._connection.dialect
+
+            # (Database_select_in_values) Remove duplicate and null values
+            values = list(dict.fromkeys(v for v in values if v is not None))
+
+            # (Database_select_in_method) Choose a method based on the number of values and the database
+            if method == 'auto':
+                if len(values) > staged_threshold:
+                    method = 'staged'
+                elif dialect.name == 'postgresql':
+                    method = 'any'
+                else:
+                    method = 'in'
+            elif method == 'any' and dialect.name != 'postgresql':
+                raise ValueError('method any for ' + dialect.name + ' is not supported')
+
+            # (Database_select_in_query) Build the query for the other statements
+            sql = self._build_query(
+                target,
+                select=select,
+                where=where,
+                order_by=order_by,
+                order_by_sort=order_by_sort,
+                where_boolean=where_boolean,
+                bind=True
+            )
+            params = self._get_query_params(where=where)
+            lookup = target.c[column]
+            if method == 'in':
+                sql = sql.where(lookup.in_(sqlalchemy.bindparam('msdss_in', expanding=True)))
+                batch_size = self._get_batch_size(batch_size, 1, reserved=len(params))
+            elif method == 'any':
+                sql = sql.where(lookup == sqlalchemy.any_(sqlalchemy.bindparam('msdss_in', type_=sqlalchemy.ARRAY(lookup.type))))
+            elif method != 'staged':
+                raise ValueError(str(method) + ' is not supported')
+            record['build'] = time.perf_counter() - start
+            record['statement'] = sql
+
+            # (Database_select_in_execute) Query rows by staging table or batches of values
+            with self._connect(read=method != 'staged') as connection:
+                if method == 'staged':
+                    with self._stage_records(connection, target, [{column:v} for v in values], columns=[column], batch_size=batch_size) as staging:
+                        result = connection.execute(sql.where(lookup.in_(sqlalchemy.select(staging.c[column]))), params)
+                        columns = list(result.keys())
+                        rows = result.fetchall()
+                    batches = 1
+                else:
+                    rows = []
+                    batches = 0
+                    for i in range(0, max(len(values), 1), batch_size):
+                        result = connection.execute(sql, {**params, 'msdss_in':values[i:i + batch_size]})
+                        columns = list(result.keys())
+                        rows += result.fetchall()
+                        batches += 1
+
+            # (Database_select_in_output) Format the rows, sorting rows from several batches
+            start = time.perf_counter()
+            order_by = [order_by] if isinstance(order_by, str) else order_by
+            if order_by is not None and batches > 1:
+                sorts = order_by_sort if isinstance(order_by_sort, list) else [order_by_sort] * len(order_by)
+            else:
+                sorts = None
+            if output == 'pandas':
+                import pandas
+                out = pandas.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+                if sorts is not None:
+                    out = out.sort_values(order_by, ascending=[s.lower() == 'asc' for s in sorts], kind='stable', ignore_index=True)
+            elif output == 'rows':
+                out = rows
+                if sorts is not None:
+                    for c, s in reversed(list(zip(order_by, sorts))):
+                        out = sorted(out, key=lambda r: getattr(r, c), reverse=s.lower() == 'desc')
+            else:
+                types = [get_arrow_type(c.type) for c in sql.selected_columns]
+                out = get_arrow_table([get_arrow_batch(rows, columns, types)])
+                if sorts is not None:
+                    out = out.sort_by([(c, 'descending' if s.lower() == 'desc' else 'ascending') for c, s in zip(order_by, sorts)])
+            record['frame'] = time.perf_counter() - start
+            record['rows'] = len(rows)
+            return out
+
+    def select_iter(
+        self,
+        table,
+        select='*',
+        where=None,
+        group_by=None,
+        aggregate=None,
+        aggregate_func='count',
+        order_by=None,
+        order_by_sort='asc',
+        limit=None,
+        offset=None,
+        where_boolean='AND',
+        after=None,
+        having=None,
+        having_boolean='AND',
+        window=None,
+        chunksize=DEFAULT_CHUNKSIZE,
+        output='pandas',
+        dtypes=None,
+        categories=None,
+        *args, **kwargs):
         """
-        Remove rows from a table in the database.
+        Query data from a table in the database in chunks.
 
+        Results are streamed with server-side cursors (where supported by the database driver), so memory use depends on ``chunksize`` rather than the size of the result.
+        
         Parameters
         ----------
         table : str
-            Name of the table to remove rows from.
+            Name of the database table to query from.
+        select : str or list(str) or None
+            See parameter ``select`` in :meth:`msdss_base_database.core.Database.select`.
         where : list of list or list of tuple or None
-            list of where statements the form of ``['column_name', 'operator', value]`` to further filter individual values or rows. 
-            See parameter ``where`` in :meth:`msdss_base_database.core.Database._build_query`.
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database.select`.
+        group_by : str or list(str) or None
+            See parameter ``group_by`` in :meth:`msdss_base_database.core.Database.select`.
+        aggregate : str or list(str) or dict or None
+            See parameter ``aggregate`` in :meth:`msdss_base_database.core.Database.select`.
+        aggregate_func : str or list(str)
+            See parameter ``aggregate_func`` in :meth:`msdss_base_database.core.Database.select`.
+        order_by : str or list(str) or None
+            See parameter ``order_by`` in :meth:`msdss_base_database.core.Database.select`.
+        order_by_sort : str or list(str)
+            See parameter ``order_by_sort`` in :meth:`msdss_base_database.core.Database.select`.
+        limit : int or None
+            See parameter ``limit`` in :meth:`msdss_base_database.core.Database.select`.
+        offset : int or None
+            See parameter ``offset`` in :meth:`msdss_base_database.core.Database.select`.
         where_boolean : str
-            One of ``AND`` or ``OR`` to combine ``where`` statements with. Defaults to ``AND`` if not one of ``AND`` or ``OR``.
-            
-            * Operators are one of:
-
-                .. jupyter-execute::
-                    :hide-code:
-
-                    from msdss_base_database.defaults import DEFAULT_SUPPORTED_OPERATORS
-                    for operator in DEFAULT_SUPPORTED_OPERATORS:
-                        print(operator)
-                        
-            * Values can be any single value such as ``int`` or ``str``
-            * Examples: ``['column_two', '>', 2]``, ``['column_one', 'LIKE', 'a']``, ``[['column_two', '>', 2], ['column_one', 'LIKE', 'a']]``
-
+            See parameter ``where_boolean`` in :meth:`msdss_base_database.core.Database.select`.
+        after : dict or None
+            See parameter ``after`` in :meth:`msdss_base_database.core.Database.select`.
+        having : list of list or list of tuple or None
+            See parameter ``having`` in :meth:`msdss_base_database.core.Database.select`.
+        having_boolean : str
+            See parameter ``having_boolean`` in :meth:`msdss_base_database.core.Database.select`.
+        window : dict or list(dict) or None
+            See parameter ``window`` in :meth:`msdss_base_database.core.Database.select`.
+        chunksize : int
+            Number of rows in each chunk.
+        output : str
+            One of ``pandas`` to yield :class:`pandas:pandas.DataFrame` chunks, ``rows`` to yield lists of rows that behave like named tuples, or ``arrow`` to yield :class:`pyarrow:pyarrow.RecordBatch` chunks.
+            See :meth:`msdss_base_database.core.Database._fetch_arrow` for the ``arrow`` output, which requires the ``pyarrow`` package.
+        dtypes : str or dict or None
+            See parameter ``dtypes`` in :meth:`msdss_base_database.core.Database.select`, so that each chunk has the same column types.
+        categories : list(str) or str or None
+            See parameter ``categories`` in :meth:`msdss_base_database.core.Database.select`. If ``'auto'``, the categorical columns are chosen for each chunk, so a list should be used if chunks are combined.
         *args, **kwargs
-            Additional arguments passed to :meth:`msdss_base_database.core.Database._execute_query`.
+            Additional parameters passed to :meth:`pandas:pandas.DataFrame.from_records` if ``output`` is ``pandas`` and ``dtypes`` and ``categories`` are ``None``.
+        
+        Yields
+        ------
+        :class:`pandas:pandas.DataFrame` or list(:class:`sqlalchemy:sqlalchemy.engine.Row`) or :class:`pyarrow:pyarrow.RecordBatch`
+            A chunk of the queried data with at most ``chunksize`` rows.
 
         Author
         ------
@@ -780,12 +5213,14 @@ class Database:
         .. jupyter-execute::
 
             from msdss_base_database.core import Database
+            
+            # Setup database
             db = Database()
 
             # Check if the table exists and drop if it does
             if db.has_table("test_table"):
                 db.drop_table("test_table")
-
+            
             # Create sample table
             columns = [
                 dict(name='id', type_='Integer', primary_key=True),
@@ -801,44 +5236,116 @@ class Database:
                 'column_two': [2, 4, 6]
             }
             db.insert('test_table', data)
-            df = db.select('test_table')
 
-            # Delete a row with matching id
-            db.delete(
-                'test_table',
-                where=('id', '=', 1)
-            )
-            df_delete_id = db.select('test_table')
+            # Read data in chunks of 2 rows
+            for df in db.select_iter('test_table', chunksize=2):
+                print(df)
 
-            # Delete a row with matching query
-            db.delete(
-                'test_table',
-                where=[('id', '<', 3), ('column_one', '=', 'c')],
-                where_boolean='OR'
-            )
-            df_delete_where = db.select('test_table')
+            # Read rows in chunks of 2 rows
+            for rows in db.select_iter('test_table', where=('column_two', '>', 2), chunksize=2, output='rows'):
+                print(rows)
 
-            # Print results
-            print('df:\\n')
-            print(df)
-            print('\\ndf_delete_id:\\n')
-            print(df_delete_id)
-            print('\\ndf_delete_where:\\n')
-            print(df_delete_where)
+            # Read chunks with the types of the table columns
+            for df in db.select_iter('test_table', chunksize=2, dtypes='schema'):
+                print(df.dtypes)
         """
-        sql = self._build_query(table=table, where=where, where_boolean=where_boolean, delete=True)
-        cursor = self._execute_query(sql, *args, **kwargs)
 
-    def drop_table(self, table, *args, **kwargs):
+        # (Database_select_iter_output) Check the output before querying
+        if output not in ('pandas', 'rows', 'arrow'):
+            raise ValueError(str(output) + ' is not supported')
+        
+        # (Database_select_iter_query) Get the query statement
+        sql, params = self._prepare_query(
+            table,
+            select=select,
+            where=where,
+            group_by=group_by,
+            aggregate=aggregate,
+            aggregate_func=aggregate_func,
+            order_by=order_by,
+            order_by_sort=order_by_sort,
+            limit=limit,
+            offset=offset,
+            where_boolean=where_boolean,
+            after=after,
+            having=having,
+            having_boolean=having_boolean,
+            window=window
+        )
+
+        # (Database_select_iter_arrow) Stream arrow record batches
+        if output == 'arrow':
+            with self._connect(read=True) as connection:
+                yield from self._fetch_arrow(connection, sql, params, chunksize=chunksize)
+            return
+
+        # (Database_select_iter_stream) Stream results from a server-side cursor in chunks
+        dtypes = self._get_dtypes(sql, dtypes if dtypes is not None else 'schema') if dtypes is not None or categories is not None else None
+        with self._connect(read=True) as connection:
+            result = connection.execution_options(stream_results=True).execute(sql, params)
+            columns = list(result.keys())
+            for rows in result.partitions(chunksize):
+                if output == 'pandas' and dtypes is not None:
+                    out = get_dataframe(rows, columns, dtypes=dtypes, categories=categories)
+                elif output == 'pandas':
+                    import pandas
+                    out = pandas.DataFrame.from_records(rows, columns=columns, *args, **kwargs)
+                else:
+                    out = rows
+                yield out
+
+    def select_parallel(
+        self,
+        table,
+        partition_column='id',
+        partitions=DEFAULT_PARTITIONS,
+        method='range',
+        where=None,
+        where_boolean='AND',
+        output='pandas',
+        workers=None,
+        executor='thread',
+        stream=False,
+        *args, **kwargs):
         """
-        Remove a table from the database.
+        Query data from a table in the database with concurrent queries on partitions of the rows.
 
+        The rows are split into partitions by the values of a column (see :meth:`msdss_base_database.core.Database._get_partitions`), and each partition is queried with :meth:`msdss_base_database.core.Database.select` on its own pooled connection,
+        so that large exports use several database connections and cores instead of one. Partitions do not see uncommitted changes of a :meth:`msdss_base_database.core.Database.transaction`.
+        
         Parameters
         ----------
         table : str
-            Name of the table to remove.
+            Name of the database table to query from.
+        partition_column : str
+            Name of the column to partition the rows by, which should be indexed so that each partition does not scan the whole table.
+        partitions : int
+            Number of partitions.
+        method : str
+            One of ``range`` to split the range of a numeric, date, or datetime column into equal parts, or ``modulo`` to partition an integer column by the remainder of dividing by ``partitions``.
+            Range partitions are in the order of ``partition_column``, so the results are sorted by it if ``order_by`` is also ``partition_column``. Null values are in the first partition.
+        where : list of list or list of tuple or None
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database.select`.
+        where_boolean : str
+            See parameter ``where_boolean`` in :meth:`msdss_base_database.core.Database.select`.
+        output : str
+            See parameter ``output`` in :meth:`msdss_base_database.core.Database.select`.
+        workers : int or None
+            Maximum number of partitions to query at the same time, which should not be more than the connections allowed by the ``pool`` settings of :class:`msdss_base_database.core.Database`. If ``None``, all partitions are queried at the same time.
+            Partitions are queried one at a time if the pool cannot share its connection across threads, such as for in-memory ``sqlite`` (see :meth:`msdss_base_database.core.Database._is_single_connection`).
+        executor : str
+            One of ``thread`` to query in a :class:`concurrent.futures.ThreadPoolExecutor`, or ``process`` to query in a :class:`concurrent.futures.ProcessPoolExecutor`.
+            Threads share the connection pool and caches of this object, and suit most databases as the time is spent waiting on the database.
+            Processes create a new connection from the connection url without the environment or pool settings, and avoid the global interpreter lock when building large dataframes, but do not work with in-memory databases.
+        stream : bool
+            Whether to return a generator of the results of each partition in order instead of combining them, so that the results of earlier partitions can be used while later partitions are queried.
         *args, **kwargs
-            Additional arguments passed to :meth:`sqlalchemy.schema.Table.drop`.
+            Additional arguments passed to :meth:`msdss_base_database.core.Database.select`, such as ``select`` and ``order_by``.
+
+        Returns
+        -------
+        :class:`pandas:pandas.DataFrame` or :class:`pyarrow:pyarrow.Table` or generator
+            pandas dataframe or arrow table containing the queried data of all partitions in order, or a generator of the queried data of each partition if ``stream`` is ``True``.
 
         Author
         ------
@@ -849,12 +5356,14 @@ class Database:
         .. jupyter-execute::
 
             from msdss_base_database.core import Database
+            
+            # Setup database
             db = Database()
 
             # Check if the table exists and drop if it does
             if db.has_table("test_table"):
                 db.drop_table("test_table")
-
+            
             # Create sample table
             columns = [
                 dict(name='id', type_='Integer', primary_key=True),
@@ -862,51 +5371,159 @@ class Database:
                 ('column_two', 'Integer')
             ]
             db.create_table('test_table', columns)
-            before_drop = db.has_table('test_table')
 
-            # Drop the table
-            db.drop_table('test_table')
-            after_drop = db.has_table('test_table')
+            # Write sample data
+            data = {
+                'id': list(range(1, 11)),
+                'column_one': list('abcdefghij'),
+                'column_two': list(range(2, 22, 2))
+            }
+            db.insert('test_table', data)
 
-            # Print results
-            print('before_drop: ' + str(before_drop))
-            print('after_drop: ' + str(after_drop))
+            # Read data with 3 concurrent queries on ranges of the id column
+            df = db.select_parallel('test_table', partition_column='id', partitions=3, order_by='id')
+
+            # Stream the data of each partition of the remainder of the id column
+            for df_partition in db.select_parallel('test_table', partition_column='id', partitions=2, method='modulo', stream=True):
+                print(df_partition)
+
+            # Display results
+            print('\\ndf:\\n')
+            print(df)
         """
-        tb = self._get_table(table)
-        tb.drop(*args, **kwargs)
+        if executor not in ('thread', 'process'):
+            raise ValueError(str(executor) + ' is not supported')
+        if output not in ('pandas', 'arrow'):
+            raise ValueError(str(output) + ' is not supported')
+
+        # (Database_select_parallel_query) Query the partitions concurrently
+        partitions = self._get_partitions(table, partition_column, partitions=partitions, method=method, where=where, where_boolean=where_boolean)
+        results = self._select_partitions(table, partitions, workers, executor, where=where, where_boolean=where_boolean, output=output, *args, **kwargs)
+        if stream:
+            return results
+
+        # (Database_select_parallel_combine) Combine the results in order, skipping empty partitions so their data types are not used
+        results = list(results)
+        filled = [r for r in results if len(r) > 0]
+        if len(filled) == 0:
+            out = results[0]
+        elif output == 'arrow':
+            out = get_arrow_table([b for r in filled for b in r.to_batches()])
+        else:
+            import pandas
+            out = pandas.concat(filled, ignore_index=True)
+        return out
 
-    def has_table(self, table, *args, **kwargs):
+    def set_watermark(self, table, consumer, value):
         """
-        Check if a table exists.
+        Save the watermark of a consumer for a table, so that :meth:`msdss_base_database.core.Database.select_changes` only gets rows after it.
+
+        Watermarks are kept in the table named by ``DEFAULT_WATERMARK_TABLE`` (``msdss_watermarks``), which is created if it does not exist.
+        Values are saved as ``json``, where dates and times are saved in ISO format and returned as :class:`datetime.date` and :class:`datetime.datetime` objects.
 
         Parameters
         ----------
         table : str
-            Name of the table to check.
-        *args, **kwargs
-            Additional arguments passed to :meth:`sqlalchemy.engine.reflection.Inspector.has_table`.
-
-        Return
-        ------
-        bool
-            Returns ``True`` if the table exists and ``False`` otherwise.
+            Name of the table the watermark is for. See parameter ``table`` in :meth:`msdss_base_database.core.Database.get_watermark`.
+        consumer : str
+            Name of the consumer reading the changes.
+        value : any
+            The watermark value, such as the largest value of the watermark column that the consumer has read. If ``None``, the watermark is removed.
 
         Author
         ------
         Richard Wen <rrwen.dev@gmail.com>
-
+        
         Example
         -------
         .. jupyter-execute::
 
-            from msdss_base_database.core import Database
+            import datetime
+            from msdss_base_database import Database
+            
+            # Setup database
             db = Database()
 
-            # Drop the table if it exists
-            if db.has_table('test_table'):
-                db.drop_table('test_table')
-            before_create = db.has_table('test_table') # False
+            # Save and get a watermark
+            db.set_watermark('test_table', 'sync', datetime.datetime(2021, 1, 1, 12, 30))
+            print(db.get_watermark('test_table', 'sync'))
+
+            # Remove the watermark
+            db.set_watermark('test_table', 'sync', None)
+            print(db.get_watermark('test_table', 'sync'))
+        """
+        if not self.has_table(DEFAULT_WATERMARK_TABLE):
+            columns = [
+                dict(name='consumer', type_='String', primary_key=True),
+                dict(name='table_name', type_='String', primary_key=True),
+                dict(name='watermark', type_='Text', nullable=False),
+                dict(name='updated_at', type_='DateTime')
+            ]
+            self.create_table(DEFAULT_WATERMARK_TABLE, columns)
+        where = [('consumer', '=', consumer), ('table_name', '=', table)]
+        if value is None:
+            self.delete(DEFAULT_WATERMARK_TABLE, where=where)
+            return
+
+        # (Database_set_watermark_encode) Convert pandas and numpy values to python values, and dates and times to ISO format
+        value = value.to_pydatetime() if hasattr(value, 'to_pydatetime') else value.item() if hasattr(value, 'item') else value
+        if isinstance(value, datetime.datetime):
+            value = dict(datetime=value.isoformat())
+        elif isinstance(value, datetime.date):
+            value = dict(date=value.isoformat())
+        else:
+            value = dict(value=value)
+
+        # (Database_set_watermark_save) Insert or update the watermark
+        record = dict(consumer=consumer, table_name=table, watermark=json.dumps(value), updated_at=datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None))
+        self.upsert(DEFAULT_WATERMARK_TABLE, [record], conflict_columns=['consumer', 'table_name'])
+
+    def suggest_indexes(self, table=None, min_uses=1, check_plan=True):
+        """
+        Suggest indexes for the columns that recorded queries filter and sort by.
+
+        Queries are only recorded if ``index_advisor`` is set in :class:`msdss_base_database.core.Database`. See :class:`msdss_base_database.advisor.IndexAdvisor` for how the index columns are chosen.
+        Candidate indexes are not suggested if an existing index (see :meth:`msdss_base_database.core.Database.list_indexes`) starts with the same columns,
+        or if ``check_plan`` is ``True`` and the plan of the most recent query (see :meth:`msdss_base_database.core.Database._explain_query`) does not read every row of the table or sort rows without an index.
+        
+        Parameters
+        ----------
+        table : str or None
+            Name of the table to suggest indexes for. If ``None``, indexes are suggested for all recorded tables.
+        min_uses : int
+            Minimum number of recorded queries that would use an index for it to be suggested.
+        check_plan : bool
+            Whether to only suggest indexes for queries that read every row of the table or sort rows without an index.
+            Plans are not checked for dialects that are not supported by :meth:`msdss_base_database.core.Database._explain_query`.
+
+        Returns
+        -------
+        list(dict)
+            List of suggested indexes from most to least used, where each is a dict with keys:
+
+            * ``table``: name of the table
+            * ``columns``: list of column names to index in order, which can be passed to :meth:`msdss_base_database.core.Database.create_index`
+            * ``uses``: number of recorded queries that would use the index
+            * ``full_scan``: whether the plan of the most recent query reads every row of the table or sorts rows without an index, or ``None`` if not checked
+            * ``statement``: the most recent query that would use the index
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database
             
+            # Setup database
+            db = Database(index_advisor=True)
+
+            # Check if the table exists and drop if it does
+            if db.has_table("test_table"):
+                db.drop_table("test_table")
+
             # Create sample table
             columns = [
                 dict(name='id', type_='Integer', primary_key=True),
@@ -915,29 +5532,60 @@ class Database:
             ]
             db.create_table('test_table', columns)
 
-            # Check if table exists again
-            after_create = db.has_table('test_table') # True
-
-            # Print results
-            print('before_create: ' + str(before_create))
-            print('after_create: ' + str(after_create))
-        """
-        out = self._inspector.has_table(table, *args, **kwargs)
-        return out
-
-    def insert(self, table, data, *args, **kwargs):
+            # Run queries and get suggested indexes
+            db.select('test_table', where=('column_one', '=', 'a'))
+            db.select('test_table', where=('column_one', '=', 'b'), order_by='column_two')
+            db.select('test_table', where=('id', '=', 1))
+            suggested = db.suggest_indexes()
+            print(suggested)
+
+            # Create the suggested indexes
+            for s in suggested:
+                db.create_index(s['table'], s['columns'])
+            print(db.suggest_indexes())
         """
-        Insert additional data to the database.
-        
-        Parameters
-        ----------
-        table : str
-            Name of the table to insert additional data to.
-        data : dict or list or :class:`pandas:pandas.DataFrame`
-            Dataframe with the data to write to the database. If ``dict`` or ``list`` see :class:`pandas:pandas.DataFrame`.
-        *args, **kwargs
-            Additional arguments passed to :meth:`msdss_base_database.core.Database._write`. Except that ``if_exists`` is always set to ``append``.
+        if self._advisor is None:
+            raise ValueError('queries are not recorded for index suggestions')
+        out = []
+        indexes = {}
+        for candidate in self._advisor.candidates(table=table, min_uses=min_uses):
+            name = candidate['table']
+
+            # (Database_suggest_indexes_existing) Skip candidates that start an existing index
+            if name not in indexes:
+                indexes[name] = self.list_indexes(name) if self.has_table(name) else None
+            if indexes[name] is None or any(tuple(i['columns'][:len(candidate['columns'])]) == candidate['columns'] for i in indexes[name]):
+                continue
+
+            # (Database_suggest_indexes_plan) Skip candidates for queries that do not scan or sort the table
+            full_scan = None
+            if check_plan and candidate['sql'] is not None:
+                try:
+                    plan = self._explain_query(candidate['sql'], candidate['params'])['plan']
+                except ValueError:
+                    plan = None
+                if plan is not None:
+                    full_scan = any(s['full_scan'] and s['table'] == name for s in plan) or any(s['sort'] for s in plan)
+                    if not full_scan:
+                        continue
+            out.append(dict(table=name, columns=list(candidate['columns']), uses=candidate['uses'], full_scan=full_scan, statement=str(candidate['sql']) if candidate['sql'] is not None else None))
+        return out
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Run a group of operations in a single transaction.
+
+        All of the ``insert``, ``update``, ``delete``, ``select`` and other methods called within the context in the current thread share one connection and transaction,
+        which is committed once when the context exits without an error and rolled back otherwise. This avoids a commit for each operation when running many small writes.
+
+        Nested calls create a savepoint, which is rolled back on an error without rolling back the outer transaction if the error is handled.
         
+        Yields
+        ------
+        :class:`msdss_base_database.core.Database`
+            This object.
+
         Author
         ------
         Richard Wen <rrwen.dev@gmail.com>
@@ -962,44 +5610,76 @@ class Database:
                 ('column_two', 'Integer')
             ]
             db.create_table('test_table', columns)
-            df = db.select('test_table')
-            
-            # Write data to table
-            data = {
-                'id': [1, 2, 3],
-                'column_one': ['a', 'b', 'c'],
-                'column_two': [2, 4, 6]
-            }
-            db.insert('test_table', data)
-            df_insert = db.select('test_table')
-
-            # Insert more new values to table
-            more_new = {
-                'id': [5, 6, 7],
-                'column_one': ['e', 'f', 'g'],
-                'column_two': [10, 12, 14]
-            }
-            db.insert('test_table', more_new)
-            df_insert_more = db.select('test_table')
 
+            # Write and update data with one commit
+            with db.transaction() as tx:
+                for i in range(10):
+                    tx.insert('test_table', [dict(id=i, column_one=str(i), column_two=i)])
+                tx.update('test_table', where=('id', '>', 5), values={'column_one': 'AA'})
+
+                # Roll back a savepoint
+                try:
+                    with tx.transaction():
+                        tx.delete('test_table', where=('id', '<', 5))
+                        raise ValueError('Undo delete')
+                except ValueError:
+                    pass
+            
             # Display results
-            print('df:\\n')
-            print(df)
-            print('\\ndf_insert:\\n')
-            print(df_insert)
-            print('\\ndf_insert_more:\\n')
-            print(df_insert_more)
+            print(db.select('test_table'))
         """
-        self._write_data(table=table, data=data, if_exists='append', *args, **kwargs)
-    
-    def rows(self, table):
+        connection = getattr(self._local, 'connection', None)
+
+        # (Database_transaction_nested) Use a savepoint if already in a transaction
+        if connection is not None:
+            with connection.begin_nested():
+                yield self
+            return
+
+        # (Database_transaction_bind) Bind a connection for this thread until the transaction ends
+        self._local.invalidated = set()
+        try:
+            with self._connect() as connection:
+                self._local.connection = connection
+                try:
+                    yield self
+                finally:
+                    self._local.connection = None
+
+        # (Database_transaction_invalidate) Remove results cached during the transaction for tables written to
+        finally:
+            for table in self._local.invalidated:
+                self._invalidate_results(table)
+
+    def update(self, table, where, values, where_boolean='AND', *args, **kwargs):
         """
-        Get number of rows for a table.
+        Update a table from the database.
         
         Parameters
         ----------
         table : str
-            Name of the table to get rows for.
+            Name of the table to update.
+        where : list of list or list of tuple or None
+            list of where statements the form of ``['column_name', 'operator', value]`` to update individual values or rows.
+            
+            * Operators are one of:
+
+                .. jupyter-execute::
+                    :hide-code:
+
+                    from msdss_base_database.defaults import DEFAULT_SUPPORTED_OPERATORS
+                    for operator in DEFAULT_SUPPORTED_OPERATORS:
+                        print(operator)
+                        
+            * Values can be any single value such as ``int`` or ``str``
+            * Examples: ``['column_two', '>', 2]``, ``['column_one', 'LIKE', 'a']``, ``[['column_two', '>', 2], ['column_one', 'LIKE', 'a']]``
+
+        values : dict
+            Dictionary representing values to update if they match the ``where`` parameter requirements.
+        where_boolean : str
+            One of ``AND`` or ``OR`` to combine ``where`` statements with. Defaults to ``AND`` if not one of ``AND`` or ``OR``.
+        *args, **kwargs
+            Additional arguments passed to :meth:`msdss_base_database.core.Database._execute_query`.
         
         Author
         ------
@@ -1017,7 +5697,7 @@ class Database:
             # Check if the table exists and drop if it does
             if db.has_table("test_table"):
                 db.drop_table("test_table")
-
+            
             # Create sample table
             columns = [
                 dict(name='id', type_='Integer', primary_key=True),
@@ -1025,8 +5705,8 @@ class Database:
                 ('column_two', 'Integer')
             ]
             db.create_table('test_table', columns)
-            
-            # Write data to table
+
+            # Write sample data
             data = {
                 'id': [1, 2, 3],
                 'column_one': ['a', 'b', 'c'],
@@ -1035,85 +5715,54 @@ class Database:
             db.insert('test_table', data)
             df = db.select('test_table')
 
-            # Get number of columns in table
-            rows = db.rows('test_table')
-
-            # Display results
+            # Update values in table
+            db.update(
+                'test_table',
+                where=('id', '>', 1),
+                values={'column_one': 'AA'})
+            df_update = db.select('test_table')
+            
+            # Print results
             print('df:\\n')
             print(df)
-            print(f'\\nrows: {rows}')
+            print('\\ndf_update:\\n')
+            print(df_update)
         """
-        table = self._get_table(table)
-        out = sqlalchemy.select([sqlalchemy.func.count()]).select_from(table).scalar()
-        return out
-
-    def select(
-        self,
-        table,
-        select='*',
-        where=None,
-        group_by=None,
-        aggregate=None,
-        aggregate_func='count',
-        order_by=None,
-        order_by_sort='asc',
-        limit=None,
-        offset=None,
-        where_boolean='AND',
-        *args, **kwargs):
+        with self._measure(table, 'update') as record:
+            start = time.perf_counter()
+            sql, params = self._prepare_query(table=table, where=where, where_boolean=where_boolean, values=values, update=True)
+            record['build'] = time.perf_counter() - start - record['compile'] - record['execute']
+            cursor = self._execute_query(sql, params, *args, **kwargs)
+            record['rows'] = cursor.rowcount
+            self._invalidate_results(table)
+
+    def update_many(self, table, data, key='id', method='auto', batch_size=DEFAULT_BATCH_SIZE, staged_threshold=DEFAULT_STAGED_THRESHOLD):
         """
-        Query data from a table in the database.
-        
+        Update many rows of a table in the database with different values in one pass.
+
+        Rows are updated in batches of bound parameters with ``executemany``, or by joining to a staging table of the data (see :meth:`msdss_base_database.core.Database._stage_records`),
+        so that the number of round trips depends on the number of batches rather than the number of rows.
+
         Parameters
         ----------
         table : str
-            Name of the database table to query from.
-        select : str or list(str) or list(:class:`sqlalchemy:sqlalchemy.schema.Column`) or None
-            List of column names or a single column name to filter or select from the table.
-            
-            * If ``None``, columns will not be added to the select statement.
-            * If ``'*'``, then all columns will be selected
-            
-        where : list of list or list of tuple or None
-            list of where statements the form of ``['column_name', 'operator', value]`` to further filter individual values or rows.
-            
-            * Operators are one of:
-
-                .. jupyter-execute::
-                    :hide-code:
-
-                    from msdss_base_database.defaults import DEFAULT_SUPPORTED_OPERATORS
-                    for operator in DEFAULT_SUPPORTED_OPERATORS:
-                        print(operator)
-                        
-            * Values can be any single value such as ``int`` or ``str``
-            * Examples: ``['column_two', '>', 2]``, ``['column_one', 'LIKE', 'a']``, ``[['column_two', '>', 2], ['column_one', 'LIKE', 'a']]``            
+            Name of the table to update.
+        data : dict or list or :class:`pandas:pandas.DataFrame`
+            Data with the ``key`` columns to match rows and the other columns to update. See :meth:`msdss_base_database.core.Database._get_records`.
+            Columns missing from a record are not updated for that row, where records are updated in groups of the same columns.
+        key : str or list(str)
+            Name of the key column or columns that identify each row.
+        method : str
+            One of ``executemany``, ``staged`` to join with a staging table, or ``auto`` to use ``staged`` if there are more than ``staged_threshold`` rows of data.
+        batch_size : int
+            Number of rows to update with each statement or to load into the staging table with each statement.
+        staged_threshold : int
+            Number of rows of data above which ``auto`` uses the ``staged`` method.
 
-        group_by : str or list(str) or None
-            Single or list of column names to group by. This should be used with ``aggregate`` and ``aggregate_func``.
-        aggregate : str or list(str) or None
-            Single or list of column names to aggregate using the ``aggregate_func``. This should be used with ``aggregate_func``.
-        aggregate_func : str or list(str)
-            Function name (such as 'count' or 'sum') from :class:`sqlalchemy:sqlalchemy.sql.functions.Function` for aggregating records from each ``aggregate`` column.
-            If a list of str, then it must have the same number of elements as ``aggregate`` or else only the shortest length list will be used.
-        order_by : str or list(str) or None
-            Single or list of column names to order or sort by.
-        order_by_sort : str or list(str)
-            Sort the records in increasing or decreasing order by each column in ``order_by``, where the value can be one of 'asc' for ascending or 'desc' for descending'.
-            If a list of str, then it must have the same number of elements as ``order_by`` or else only the shortest length list will be used.
-        limit : int or None
-            Integer number to limit the number of rows returned.
-        offset : int or None
-            Number of rows to skip for the query.
-        where_boolean : str
-            One of ``AND`` or ``OR`` to combine ``where`` statements with. Defaults to ``AND`` if not one of ``AND`` or ``OR``.
-        *args, **kwargs
-            Additional parameters passed to :meth:`pandas:pandas.read_sql`.
-        
         Returns
         -------
-        :class:`pandas:pandas.DataFrame`
-            pandas dataframe containing the queried data.
+        int
+            Number of rows updated as reported by the database driver.
 
         Author
         ------
@@ -1123,7 +5772,7 @@ class Database:
         -------
         .. jupyter-execute::
 
-            from msdss_base_database.core import Database
+            from msdss_base_database import Database
             
             # Setup database
             db = Database()
@@ -1131,7 +5780,7 @@ class Database:
             # Check if the table exists and drop if it does
             if db.has_table("test_table"):
                 db.drop_table("test_table")
-            
+
             # Create sample table
             columns = [
                 dict(name='id', type_='Integer', primary_key=True),
@@ -1147,99 +5796,83 @@ class Database:
                 'column_two': [2, 4, 6]
             }
             db.insert('test_table', data)
-            df = db.select('test_table')
-            
-            # Read data from table using select and limit
-            data = db.select(
-                'test_table',
-                select = ['column_one', 'column_two'],
-                limit = 5
-            )
-            df_select = db.select('test_table')
-
-            # Use where statements
-            data = db.select(
-                'test_table',
-                select = 'column_one',
-                where = [('column_two', '<', '15'), ('column_one', '=', 'b')],
-                where_boolean = 'AND'
-            )
-            df_where = db.select('test_table')
-
-            # Order results
-            data = db.select(
-                'test_table',
-                select = ['column_one', 'column_two'],
-                order_by = ['column_one', 'column_two'],
-                order_by_sort = ['asc', 'desc']
-            )
-            df_order = db.select('test_table')
-
-            # Aggregate read
-            data = db.select(
-                'test_table',
-                select = 'column_one',
-                group_by = 'column_one',
-                aggregate = 'column_two',
-                aggregate_func = ['count', 'sum']
-            )
-            df_agg = db.select('test_table')
 
-            # Display results
-            print('df:\\n')
-            print(df)
-            print('\\ndf_select:\\n')
-            print(df_select)
-            print('\\ndf_where:\\n')
-            print(df_where)
-            print('\\ndf_order:\\n')
-            print(df_order)
-            print('\\ndf_agg:\\n')
-            print(df_agg)
+            # Update rows by key with different values
+            new = {
+                'id': [1, 3],
+                'column_one': ['AA', 'CC'],
+                'column_two': [20, 60]
+            }
+            db.update_many('test_table', new, key='id')
+            print(db.select('test_table'))
         """
-        sql = self._build_query(
-            table,
-            select=select,
-            where=where,
-            group_by=group_by,
-            aggregate=aggregate,
-            aggregate_func=aggregate_func,
-            order_by=order_by,
-            order_by_sort=order_by_sort,
-            limit=limit,
-            offset=offset,
-            where_boolean=where_boolean
-        )
-        out = pandas.read_sql(sql = sql, con = self._connection, *args, **kwargs)
-        return out
+        with self._measure(table, 'update_many') as record:
+            key = [key] if isinstance(key, str) else key
+            target = self._get_table(table)
+            records = self._get_records(data, table=target, fill=False)
+            if len(records) == 0:
+                return 0
+
+            # (Database_update_many_group) Group records by the columns to update, so that missing columns are not set to null
+            groups = {}
+            for r in records:
+                groups.setdefault(tuple(c for c in r if c not in key), []).append(r)
+
+            # (Database_update_many_execute) Update rows by staging table or batches of bound parameters
+            out = 0
+            with self._connect() as connection:
+                for columns, group in groups.items():
+                    if len(columns) == 0:
+                        continue
+                    group_method = ('staged' if len(group) > staged_threshold else 'executemany') if method == 'auto' else method
+                    if group_method == 'staged':
+                        with self._stage_records(connection, target, group, columns=key + list(columns), batch_size=batch_size, index=key) as staging:
+                            match = sqlalchemy.and_(*[staging.c[k] == target.c[k] for k in key])
+                            if connection.dialect.name in ('postgresql', 'mysql'): # update with a join
+                                sql = target.update().values({c:staging.c[c] for c in columns}).where(match)
+                            else: # update with correlated subqueries
+                                sql = target.update().values({c:sqlalchemy.select([staging.c[c]]).where(match).scalar_subquery() for c in columns}).where(sqlalchemy.exists().where(match))
+                            out += connection.execute(sql).rowcount
+                    elif group_method == 'executemany':
+                        sql = target.update().where(sqlalchemy.and_(*[target.c[k] == sqlalchemy.bindparam('msdss_key_' + k) for k in key]))
+                        sql = sql.values({c:sqlalchemy.bindparam('msdss_values_' + c) for c in columns})
+                        params = [{**{'msdss_key_' + k:r[k] for k in key}, **{'msdss_values_' + c:r[c] for c in columns}} for r in group]
+                        for i in range(0, len(params), batch_size):
+                            out += connection.execute(sql, params[i:i + batch_size]).rowcount
+                    else:
+                        raise ValueError(str(method) + ' is not supported')
+            self._invalidate_results(table)
+            record['rows'] = out
+            return out
 
-    def update(self, table, where, values, *args, **kwargs):
+    def upsert(self, table, data, conflict_columns='id', update_columns=None, method='auto', batch_size=DEFAULT_BATCH_SIZE):
         """
-        Update a table from the database.
+        Insert data to the database, updating rows that already exist.
+
+        Uses ``INSERT ... ON CONFLICT DO UPDATE`` for ``postgresql`` and ``sqlite``, and ``INSERT ... ON DUPLICATE KEY UPDATE`` for ``mysql``,
+        so that existing rows do not need to be checked with a separate query. Data is inserted in batches as in :meth:`msdss_base_database.core.Database.insert`.
         
         Parameters
         ----------
         table : str
-            Name of the table to update.
-        where : list of list or list of tuple or None
-            list of where statements the form of ``['column_name', 'operator', value]`` to update individual values or rows.
-            
-            * Operators are one of:
-
-                .. jupyter-execute::
-                    :hide-code:
-
-                    from msdss_base_database.defaults import DEFAULT_SUPPORTED_OPERATORS
-                    for operator in DEFAULT_SUPPORTED_OPERATORS:
-                        print(operator)
-                        
-            * Values can be any single value such as ``int`` or ``str``
-            * Examples: ``['column_two', '>', 2]``, ``['column_one', 'LIKE', 'a']``, ``[['column_two', '>', 2], ['column_one', 'LIKE', 'a']]``
+            Name of the table to insert or update data in.
+        data : dict or list or :class:`pandas:pandas.DataFrame`
+            Data to insert or update. See :meth:`msdss_base_database.core.Database._get_records`.
+        conflict_columns : str or list(str)
+            Name of the column or columns with a primary key or unique constraint that identify existing rows. Not used for ``mysql``, which uses all unique constraints.
+        update_columns : str or list(str) or None
+            Name of the column or columns to update for existing rows. If ``None``, all columns in the data other than ``conflict_columns`` are updated.
+            If an empty list, existing rows are left unchanged.
+        method : str
+            One of ``values`` to insert multiple rows of ``VALUES`` with each statement, ``executemany`` to insert with many parameter sets,
+            or ``auto`` to use ``executemany`` for ``sqlite`` and ``values`` otherwise.
+        batch_size : int
+            Number of rows to insert or update with each statement. For the ``values`` method, this is reduced so that each statement stays under the limit of bound parameters (see :meth:`msdss_base_database.core.Database._get_batch_size`).
 
-        values : dict
-            Dictionary representing values to update if they match the ``where`` parameter requirements.
-        *args, **kwargs
-            Additional arguments passed to :meth:`msdss_base_database.core.Database._execute_query`.
+        Returns
+        -------
+        dict
+            Dictionary with keys ``rows`` (number of rows inserted or updated), ``seconds`` (time taken), ``rows_per_second``, and ``method`` (the method used).
         
         Author
         ------
@@ -1257,7 +5890,7 @@ class Database:
             # Check if the table exists and drop if it does
             if db.has_table("test_table"):
                 db.drop_table("test_table")
-            
+
             # Create sample table
             columns = [
                 dict(name='id', type_='Integer', primary_key=True),
@@ -1273,20 +5906,66 @@ class Database:
                 'column_two': [2, 4, 6]
             }
             db.insert('test_table', data)
-            df = db.select('test_table')
 
-            # Update values in table
-            db.update(
-                'test_table',
-                where=('id', '>', 1),
-                values={'column_one': 'AA'})
-            df_update = db.select('test_table')
-            
-            # Print results
-            print('df:\\n')
-            print(df)
-            print('\\ndf_update:\\n')
-            print(df_update)
+            # Update rows 2 and 3, and insert row 4
+            new = {
+                'id': [2, 3, 4],
+                'column_one': ['BB', 'CC', 'd'],
+                'column_two': [40, 60, 8]
+            }
+            stats = db.upsert('test_table', new, conflict_columns='id')
+
+            # Display results
+            print(db.select('test_table'))
+            print('\\nstats: ' + str(stats))
         """
-        sql = self._build_query(table=table, where=where, values=values, update=True)
-        cursor = self._execute_query(sql, *args, **kwargs)
+        with self._measure(table, 'upsert') as record:
+            start = time.perf_counter()
+            conflict_columns = [conflict_columns] if isinstance(conflict_columns, str) else conflict_columns
+            update_columns = [update_columns] if isinstance(update_columns, str) else update_columns
+            target = self._get_table(table)
+            records = self._get_records(data, table=target)
+            dialect = self._connection.dialect.name
+
+            # (Database_upsert_statement) Create the insert statement for the database
+            from sqlalchemy.dialects import mysql, postgresql, sqlite
+            if dialect == 'postgresql':
+                insert = postgresql.insert
+            elif dialect == 'sqlite':
+                insert = sqlite.insert
+            elif dialect == 'mysql':
+                insert = mysql.insert
+            else:
+                raise ValueError(dialect + ' is not supported for upsert')
+            method = ('executemany' if dialect == 'sqlite' else 'values') if method == 'auto' else method
+
+            # (Database_upsert_execute) Insert or update each batch of records, keeping multi-row statements under the limit of bound parameters
+            if len(records) > 0:
+                update_columns = [c for c in records[0] if c not in conflict_columns] if update_columns is None else update_columns
+                batch_size = self._get_batch_size(batch_size, len(records[0])) if method == 'values' else batch_size
+                with self._connect() as connection:
+                    for i in range(0, len(records), batch_size):
+                        batch = records[i:i + batch_size]
+                        if method == 'values':
+                            sql = insert(target).values(batch)
+                        elif method == 'executemany':
+                            sql = insert(target)
+                        else:
+                            raise ValueError(str(method) + ' is not supported')
+                        if dialect == 'mysql':
+                            sql = sql.on_duplicate_key_update({c:sql.inserted[c] for c in update_columns}) if len(update_columns) > 0 else sql.prefix_with('IGNORE')
+                        elif len(update_columns) > 0:
+                            sql = sql.on_conflict_do_update(index_elements=conflict_columns, set_={c:sql.excluded[c] for c in update_columns})
+                        else:
+                            sql = sql.on_conflict_do_nothing(index_elements=conflict_columns)
+                        if method == 'values':
+                            connection.execute(sql)
+                        else:
+                            connection.execute(sql, batch)
+                self._invalidate_results(table)
+
+            # (Database_upsert_return) Return load stats
+            record['rows'] = len(records)
+            seconds = time.perf_counter() - start
+            out = dict(rows=len(records), seconds=seconds, rows_per_second=len(records) / seconds if seconds > 0 else None, method=method)
+            return out
@@ -5,6 +5,16 @@ DEFAULT_DOTENV_KWARGS = dict(
     host='MSDSS_DATABASE_HOST',
     port='MSDSS_DATABASE_PORT',
     database='MSDSS_DATABASE_NAME',
+    pool='MSDSS_DATABASE_POOL',
+    pool_size='MSDSS_DATABASE_POOL_SIZE',
+    max_overflow='MSDSS_DATABASE_POOL_MAX_OVERFLOW',
+    pool_pre_ping='MSDSS_DATABASE_POOL_PRE_PING',
+    pool_recycle='MSDSS_DATABASE_POOL_RECYCLE',
+    pool_timeout='MSDSS_DATABASE_POOL_TIMEOUT',
+    pool_use_lifo='MSDSS_DATABASE_POOL_USE_LIFO',
+    replicas='MSDSS_DATABASE_REPLICAS',
+    replica_balance='MSDSS_DATABASE_REPLICA_BALANCE',
+    read_your_writes='MSDSS_DATABASE_READ_YOUR_WRITES',
     env_file='./.env',
     key_path=None,
     defaults=dict(
@@ -16,4 +26,52 @@ DEFAULT_DOTENV_KWARGS = dict(
         database='msdss'
     )
 )
-DEFAULT_SUPPORTED_OPERATORS = ['=', '!=', '>', '>=', '>', '<', '<=', 'LIKE', 'NOTLIKE', 'ILIKE', 'NOTILIKE', 'CONTAINS', 'STARTSWITH', 'ENDSWITH']
\ No newline at end of file
+DEFAULT_SUPPORTED_OPERATORS = ['=', '!=', '>', '>=', '>', '<', '<=', 'LIKE', 'NOTLIKE', 'ILIKE', 'NOTILIKE', 'CONTAINS', 'STARTSWITH', 'ENDSWITH']
+DEFAULT_TABLE_CACHE_SIZE = 128
+DEFAULT_TABLE_CACHE_TTL = 300
+DEFAULT_QUERY_CACHE_SIZE = 512
+DEFAULT_CHUNKSIZE = 10000
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_SQLITE_MAX_VARIABLES = 999
+DEFAULT_MAX_VARIABLES = dict(
+    sqlite=DEFAULT_SQLITE_MAX_VARIABLES,
+    mssql=2100,
+    mysql=65535,
+    postgresql=65535
+)
+DEFAULT_ASYNC_DRIVERS = dict(
+    postgresql='postgresql+asyncpg',
+    sqlite='sqlite+aiosqlite',
+    mysql='mysql+aiomysql'
+)
+DEFAULT_POOL_PROFILE = 'default'
+DEFAULT_POOL_PROFILES = dict(
+    default=dict(),
+    small=dict(pool_size=2, max_overflow=2, pool_pre_ping=True, pool_recycle=1800),
+    medium=dict(pool_size=5, max_overflow=10, pool_pre_ping=True, pool_recycle=1800),
+    large=dict(pool_size=20, max_overflow=20, pool_pre_ping=True, pool_recycle=1800, pool_use_lifo=True)
+)
+DEFAULT_POOL_SETTINGS = dict(
+    pool_size=int,
+    max_overflow=int,
+    pool_pre_ping=bool,
+    pool_recycle=int,
+    pool_timeout=float,
+    pool_use_lifo=bool
+)
+DEFAULT_STAGED_THRESHOLD = 10000
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_RESULT_CACHE_TTL = 60
+DEFAULT_RESULT_CACHE_MAX_BYTES = 268435456
+DEFAULT_STATS_HISTORY = 1000
+DEFAULT_STATS_BUCKETS = [0.001, 0.01, 0.1, 1, 10]
+DEFAULT_STATS_PHASES = ['build', 'compile', 'execute', 'fetch', 'frame', 'total']
+DEFAULT_PARTITIONS = 4
+DEFAULT_CATEGORY_RATIO = 0.5
+DEFAULT_ADVISOR_MAX_PATTERNS = 1000
+DEFAULT_ADVISOR_EQUAL_OPERATORS = ['=', '==']
+DEFAULT_ADVISOR_RANGE_OPERATORS = ['>', '>=', '<', '<=', 'startswith']
+DEFAULT_REPLICA_BALANCE = 'round_robin'
+DEFAULT_SHARD_AGGREGATES = dict(count='sum', sum='sum', min='min', max='max')
+DEFAULT_WATERMARK_TABLE = 'msdss_watermarks'
+DEFAULT_CHANGE_LOG_SUFFIX = '_changes'
\ No newline at end of file
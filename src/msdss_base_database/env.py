@@ -38,6 +38,26 @@ class DatabaseDotEnv(DotEnv):
         The environmental variable name for ``port``.
     database : str
         The environmental variable name for ``database``.
+    pool : str
+        The environmental variable name for ``pool``, the name of a connection pool profile (see :func:`msdss_base_database.tools.get_pool_kwargs`).
+    pool_size : str
+        The environmental variable name for ``pool_size``.
+    max_overflow : str
+        The environmental variable name for ``max_overflow``.
+    pool_pre_ping : str
+        The environmental variable name for ``pool_pre_ping``.
+    pool_recycle : str
+        The environmental variable name for ``pool_recycle``.
+    pool_timeout : str
+        The environmental variable name for ``pool_timeout``.
+    pool_use_lifo : str
+        The environmental variable name for ``pool_use_lifo``.
+    replicas : str
+        The environmental variable name for ``replicas``, a comma separated list of read replica urls (see :func:`msdss_base_database.tools.get_replica_kwargs`).
+    replica_balance : str
+        The environmental variable name for ``replica_balance``.
+    read_your_writes : str
+        The environmental variable name for ``read_your_writes``.
 
     Author
     ------
@@ -113,6 +133,16 @@ class DatabaseDotEnv(DotEnv):
         host=DEFAULT_DOTENV_KWARGS['host'],
         port=DEFAULT_DOTENV_KWARGS['port'],
         database=DEFAULT_DOTENV_KWARGS['database'],
+        pool=DEFAULT_DOTENV_KWARGS['pool'],
+        pool_size=DEFAULT_DOTENV_KWARGS['pool_size'],
+        max_overflow=DEFAULT_DOTENV_KWARGS['max_overflow'],
+        pool_pre_ping=DEFAULT_DOTENV_KWARGS['pool_pre_ping'],
+        pool_recycle=DEFAULT_DOTENV_KWARGS['pool_recycle'],
+        pool_timeout=DEFAULT_DOTENV_KWARGS['pool_timeout'],
+        pool_use_lifo=DEFAULT_DOTENV_KWARGS['pool_use_lifo'],
+        replicas=DEFAULT_DOTENV_KWARGS['replicas'],
+        replica_balance=DEFAULT_DOTENV_KWARGS['replica_balance'],
+        read_your_writes=DEFAULT_DOTENV_KWARGS['read_your_writes'],
         env_file=DEFAULT_DOTENV_KWARGS['env_file'],
         key_path=DEFAULT_DOTENV_KWARGS['key_path'],
         defaults=DEFAULT_DOTENV_KWARGS['defaults']):
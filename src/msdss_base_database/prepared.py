@@ -0,0 +1,315 @@
+import re
+import uuid
+
+class Param:
+    """
+    Class for a named parameter of a prepared query, whose value is given each time the query is called.
+
+    Parameters
+    ----------
+    name : str
+        Name of the parameter, used as the keyword argument when calling the prepared query.
+
+    Attributes
+    ----------
+    name : str
+        Same as parameter ``name``.
+
+    Author
+    ------
+    Richard Wen <rrwen.dev@gmail.com>
+
+    Example
+    -------
+    .. jupyter-execute::
+
+        from msdss_base_database.prepared import Param
+
+        # Create a parameter for the where value of an id column
+        where = [('id', '=', Param('id'))]
+        print(where)
+    """
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return 'Param(' + repr(self.name) + ')'
+
+class PreparedQuery:
+    """
+    Class for a select query that is built and compiled once, and run with different parameter values.
+
+    Prepared queries are created by :meth:`msdss_base_database.core.Database.prepare`.
+    Each call only binds the values of the :class:`msdss_base_database.prepared.Param` objects and executes the compiled statement with the database driver,
+    skipping the building, caching, and compiling of the statement done by :meth:`msdss_base_database.core.Database.select`.
+
+    Parameters
+    ----------
+    database : :class:`msdss_base_database.core.Database`
+        Database to run the query with.
+    table : str
+        Name of the database table queried.
+    sql : :class:`sqlalchemy:sqlalchemy.sql.expression.Select`
+        Statement with named bound parameters from :meth:`msdss_base_database.core.Database._build_query`.
+    params : dict
+        Dictionary of bound parameter names and values, where values that are :class:`msdss_base_database.prepared.Param` objects are given on each call.
+    output : str
+        One of ``pandas`` to return a :class:`pandas:pandas.DataFrame`, ``rows`` to return a list of tuples, or ``arrow`` to return a :class:`pyarrow:pyarrow.Table`.
+    server : bool
+        Whether to also prepare the statement on the database server, so that it is only planned once for each connection.
+        This uses ``PREPARE`` and ``EXECUTE`` statements, which are only supported for ``postgresql`` with the ``psycopg2`` driver.
+
+    Attributes
+    ----------
+    database : :class:`msdss_base_database.core.Database`
+        Same as parameter ``database``.
+    table : str
+        Same as parameter ``table``.
+    sql : :class:`sqlalchemy:sqlalchemy.sql.expression.Select`
+        Same as parameter ``sql``.
+    params : dict
+        Same as parameter ``params``.
+    output : str
+        Same as parameter ``output``.
+    server : bool
+        Same as parameter ``server``.
+    _fixed : dict
+        Dictionary of bound parameter names and values that are the same for every call.
+    _names : dict
+        Dictionary of bound parameter names and the names of their :class:`msdss_base_database.prepared.Param` objects.
+    _compiled : :class:`sqlalchemy:sqlalchemy.sql.compiler.Compiled`
+        Compiled statement for the dialect of the database.
+    _bind_processors : dict
+        Dictionary of bound parameter names and functions to convert their values for the database driver.
+    _result_processors : list(func or None)
+        Functions to convert the values of each selected column from the database driver.
+    _positions : list(str) or None
+        Names of the bound parameters in order for drivers with positional parameters, or ``None`` for named parameters.
+    _statement : str
+        Compiled statement for the database driver.
+    _server_name : str or None
+        Name of the statement prepared on the server, or ``None`` if ``server`` is ``False``.
+    _server_statement : str or None
+        ``EXECUTE`` statement for the statement prepared on the server.
+    _server_prepare : str or None
+        ``PREPARE`` statement run once on each connection.
+
+    Author
+    ------
+    Richard Wen <rrwen.dev@gmail.com>
+
+    Example
+    -------
+    .. jupyter-execute::
+
+        from msdss_base_database import Database, Param
+
+        # Setup database
+        db = Database()
+
+        # Check if the table exists and drop if it does
+        if db.has_table("test_table"):
+            db.drop_table("test_table")
+
+        # Create sample table
+        columns = [
+            dict(name='id', type_='Integer', primary_key=True),
+            ('column_one', 'String'),
+            ('column_two', 'Integer')
+        ]
+        db.create_table('test_table', columns)
+        db.insert('test_table', {'id': [1, 2, 3], 'column_one': ['a', 'b', 'c'], 'column_two': [2, 4, 6]})
+
+        # Prepare a lookup by id and run it with different ids
+        lookup = db.prepare('test_table', select=['id', 'column_one'], where=[('id', '=', Param('id'))])
+        print(lookup(id=1))
+        print(lookup(id=3))
+    """
+    def __init__(self, database, table, sql, params, output='pandas', server=False):
+        self.database = database
+        self.table = table
+        self.sql = sql
+        self.params = params
+        self.output = output
+        self.server = server
+        self._fixed = {k:v for k, v in params.items() if not isinstance(v, Param)}
+        self._names = {k:v.name for k, v in params.items() if isinstance(v, Param)}
+
+        # (PreparedQuery_compile) Compile the statement and get the value conversions for the driver
+        dialect = database._connection.dialect
+        compiled = sql.compile(dialect=dialect)
+        self._compiled = compiled
+        self._statement = compiled.string
+        self._positions = list(compiled.positiontup) if dialect.positional else None
+        self._bind_processors = {name:bind.type.dialect_impl(dialect).bind_processor(dialect) for bind, name in compiled.bind_names.items()}
+        self._result_processors = [c.type.dialect_impl(dialect).result_processor(dialect, None) for c in sql.selected_columns]
+
+        # (PreparedQuery_server) Get the statements to prepare and execute the statement on the server
+        self._server_name = None
+        self._server_statement = None
+        self._server_prepare = None
+        if server:
+            if dialect.name != 'postgresql' or dialect.driver != 'psycopg2':
+                raise ValueError('server prepared statements for ' + dialect.name + '+' + dialect.driver + ' is not supported')
+            order = []
+            def number(match):
+                if match.group(1) not in order:
+                    order.append(match.group(1))
+                return '$' + str(order.index(match.group(1)) + 1)
+            statement = re.sub(r'%\((\w+)\)s', number, self._statement).replace('%%', '%')
+            self._server_name = 'msdss_prepared_' + uuid.uuid4().hex[:12]
+            self._server_prepare = 'PREPARE ' + self._server_name + ' AS ' + statement
+            self._server_statement = 'EXECUTE ' + self._server_name + ('(' + ', '.join('%(' + n + ')s' for n in order) + ')' if len(order) > 0 else '')
+
+    def __call__(self, **kwargs):
+        """
+        Run the query with values for its parameters.
+
+        Parameters
+        ----------
+        **kwargs
+            Values for each :class:`msdss_base_database.prepared.Param` by name.
+
+        Returns
+        -------
+        :class:`pandas:pandas.DataFrame` or list(tuple) or :class:`pyarrow:pyarrow.Table`
+            The queried data in the form of the ``output`` parameter.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        """
+        params = self._get_params(kwargs)
+        with self.database._measure(self.table, 'select') as record:
+            record['statement'] = self.sql
+            with self.database._connect(read=True) as connection:
+
+                # (PreparedQuery_call_server) Prepare the statement once on each connection of the pool
+                if self._server_name is not None:
+                    prepared = connection.info.setdefault('msdss_prepared', set())
+                    if self._server_name not in prepared:
+                        connection.exec_driver_sql(self._server_prepare)
+                        prepared.add(self._server_name)
+                    result = connection.exec_driver_sql(self._server_statement, params)
+
+                # (PreparedQuery_call_execute) Execute the compiled statement
+                else:
+                    result = connection.exec_driver_sql(self._statement, params)
+                columns = list(result.keys())
+                rows = result.fetchall()
+            out = self._get_output(rows, columns)
+            record['rows'] = len(rows)
+            return out
+
+    def __repr__(self):
+        return '<PreparedQuery ' + repr(self.table) + ' params=' + repr(sorted(set(self._names.values()))) + '>'
+
+    def _get_output(self, rows, columns):
+        """
+        Convert the rows from the database driver to the output.
+
+        Parameters
+        ----------
+        rows : list(tuple)
+            Rows of values from the database driver.
+        columns : list(str)
+            Names of the columns.
+
+        Returns
+        -------
+        :class:`pandas:pandas.DataFrame` or list(tuple) or :class:`pyarrow:pyarrow.Table`
+            The rows in the form of the ``output`` attribute.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        """
+        from .tools import get_arrow_batch, get_arrow_table, get_arrow_type
+
+        # (PreparedQuery_get_output_process) Convert driver values of columns that need it
+        if any(p is not None for p in self._result_processors):
+            processors = [(i, p) for i, p in enumerate(self._result_processors) if p is not None]
+            rows = [list(row) for row in rows]
+            for row in rows:
+                for i, p in processors:
+                    row[i] = p(row[i])
+            rows = [tuple(row) for row in rows]
+
+        # (PreparedQuery_get_output_format) Format the rows as the output
+        if self.output == 'pandas':
+            import pandas
+            out = pandas.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+        elif self.output == 'rows':
+            out = [tuple(row) for row in rows]
+        elif self.output == 'arrow':
+            types = [get_arrow_type(c.type) for c in self.sql.selected_columns]
+            out = get_arrow_table([get_arrow_batch(rows, columns, types)])
+        else:
+            raise ValueError(str(self.output) + ' is not supported')
+        return out
+
+    def _get_params(self, values):
+        """
+        Get the parameter values for the database driver.
+
+        Parameters
+        ----------
+        values : dict
+            Values for each :class:`msdss_base_database.prepared.Param` by name.
+
+        Returns
+        -------
+        dict or tuple
+            Converted parameter values by name, or in order if the driver uses positional parameters.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+        """
+        missing = sorted({n for n in self._names.values() if n not in values})
+        if len(missing) > 0:
+            raise ValueError('missing values for parameters ' + ', '.join(missing))
+        out = self._compiled.construct_params({**self._fixed, **{k:values[n] for k, n in self._names.items()}})
+        out = {k:self._bind_processors[k](v) if self._bind_processors.get(k) is not None else v for k, v in out.items()}
+        out = tuple(out[k] for k in self._positions) if self._positions is not None else out
+        return out
+
+class AsyncPreparedQuery(PreparedQuery):
+    """
+    Class for a select query that is built and compiled once, and run with different parameter values with ``asyncio``.
+
+    * Extends :class:`msdss_base_database.prepared.PreparedQuery`
+    * Created by :meth:`msdss_base_database.async_core.AsyncDatabase.prepare`
+    * Calls are coroutines. The ``asyncpg`` driver also prepares statements on the server and keeps them for each connection, so the ``server`` parameter is not needed
+
+    Author
+    ------
+    Richard Wen <rrwen.dev@gmail.com>
+
+    Example
+    -------
+    .. jupyter-execute::
+
+        import asyncio
+        from msdss_base_database import AsyncDatabase, Param
+
+        async def main():
+            db = AsyncDatabase()
+            if await db.has_table('test_table'):
+                await db.drop_table('test_table')
+            await db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True), ('column_one', 'String')])
+            await db.insert('test_table', {'id': [1, 2, 3], 'column_one': ['a', 'b', 'c']})
+            lookup = await db.prepare('test_table', where=[('id', '=', Param('id'))])
+            print(await lookup(id=2))
+            await db.dispose()
+
+        asyncio.run(main())
+    """
+    async def __call__(self, **kwargs):
+        params = self._get_params(kwargs)
+        async with self.database._connect() as connection:
+            result = await connection.exec_driver_sql(self._statement, params)
+            columns = list(result.keys())
+            rows = result.fetchall()
+        out = self._get_output(rows, columns)
+        return out
@@ -0,0 +1,688 @@
+import bisect
+import concurrent.futures
+import time
+import zlib
+
+from .defaults import *
+
+class ShardedDatabase:
+    """
+    Class for spreading the rows of tables across several databases by the value of a shard key column.
+
+    Rows are written to the shard of their shard key value, and queries with an ``=`` comparison on the shard key (or range comparisons for ``range`` shards) only run on the shards that can have matching rows.
+    Other queries run on every shard at the same time, and their results are combined as if they were from one table, including ``order_by``, ``limit``, ``offset``, and the ``count``, ``sum``, ``min``, and ``max`` aggregates.
+
+    Each shard should have the same tables and columns, which can be created with :meth:`msdss_base_database.sharded.ShardedDatabase.create_table`.
+    Writes are not in one transaction across shards, and rows are not moved if their shard key value is updated.
+
+    Parameters
+    ----------
+    shards : list(:class:`msdss_base_database.core.Database`)
+        Databases for each shard, where the order of the list is the order of the shards.
+    shard_key : str or dict
+        Name of the shard key column, or a dict of table names and their shard key column names.
+    method : str
+        One of:
+
+        * ``hash``: rows are placed by a hash of the ``str`` of the shard key value, which spreads values evenly but needs every shard for range queries
+        * ``range``: rows are placed by the ``ranges`` of the shard key value, so that range queries only run on the shards with the range
+
+    ranges : list or None
+        Sorted list of one less value than the number of shards for the ``range`` method, where shard ``i`` has values at least ``ranges[i - 1]`` and less than ``ranges[i]``.
+        The first shard has all values less than ``ranges[0]``, and the last shard has all values at least ``ranges[-1]``.
+    workers : int or None
+        Maximum number of shards to query at the same time. If ``None``, all shards are queried at the same time.
+
+    Attributes
+    ----------
+    shards : list(:class:`msdss_base_database.core.Database`)
+        Same as parameter ``shards``.
+    shard_key : str or dict
+        Same as parameter ``shard_key``.
+    method : str
+        Same as parameter ``method``.
+    ranges : list or None
+        Same as parameter ``ranges``.
+    workers : int or None
+        Same as parameter ``workers``.
+
+    Author
+    ------
+    Richard Wen <rrwen.dev@gmail.com>
+
+    Example
+    -------
+    .. jupyter-execute::
+
+        from msdss_base_database import Database, ShardedDatabase
+
+        # Setup two shards split by id
+        sqlite = dict(driver='sqlite', user=None, password=None, host=None, port=None, load_env=False)
+        shards = [
+            Database(database='shard_a.db', **sqlite),
+            Database(database='shard_b.db', **sqlite)
+        ]
+        db = ShardedDatabase(shards, shard_key='id', method='range', ranges=[3])
+
+        # Check if the table exists and drop if it does
+        if db.has_table('test_table'):
+            db.drop_table('test_table')
+
+        # Create sample table on each shard
+        columns = [
+            dict(name='id', type_='Integer', primary_key=True),
+            ('column_one', 'String'),
+            ('column_two', 'Integer')
+        ]
+        db.create_table('test_table', columns)
+
+        # Write sample data, which is split across the shards
+        data = {
+            'id': [1, 2, 3, 4],
+            'column_one': ['a', 'b', 'a', 'b'],
+            'column_two': [2, 4, 6, 8]
+        }
+        db.insert('test_table', data)
+
+        # Query rows from all shards, and from the shard of one id
+        df = db.select('test_table', order_by='column_two', order_by_sort='desc', limit=3)
+        df_one = db.select('test_table', where=('id', '=', 4))
+
+        # Aggregate across shards
+        df_agg = db.select('test_table', select='column_one', group_by='column_one', aggregate={'column_two': ['sum', 'max'], '*': 'count'})
+
+        # Display results
+        print('df:\\n')
+        print(df)
+        print('\\ndf_one:\\n')
+        print(df_one)
+        print('\\ndf_agg:\\n')
+        print(df_agg)
+        print('\\nrows: ' + str(db.rows('test_table')))
+    """
+    def __init__(self, shards, shard_key='id', method='hash', ranges=None, workers=None):
+        if method not in ('hash', 'range'):
+            raise ValueError(str(method) + ' is not supported')
+        if method == 'range' and (ranges is None or len(ranges) != len(shards) - 1):
+            raise ValueError('ranges must have ' + str(len(shards) - 1) + ' values for ' + str(len(shards)) + ' shards')
+        self.shards = shards
+        self.shard_key = shard_key
+        self.method = method
+        self.ranges = ranges
+        self.workers = workers
+
+    def _get_key(self, table):
+        """
+        Get the shard key column of a table.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table.
+
+        Returns
+        -------
+        str
+            Name of the shard key column.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database, ShardedDatabase
+
+            db = ShardedDatabase([Database(), Database()], shard_key={'test_table': 'column_one'})
+            print(db._get_key('test_table'))
+        """
+        out = self.shard_key.get(table, 'id') if isinstance(self.shard_key, dict) else self.shard_key
+        return out
+
+    def _get_shard(self, value):
+        """
+        Get the shard of a shard key value.
+
+        Parameters
+        ----------
+        value : any
+            Value of the shard key column.
+
+        Returns
+        -------
+        int
+            Index of the shard in ``shards``.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database, ShardedDatabase
+
+            db = ShardedDatabase([Database(), Database()])
+            print([db._get_shard(i) for i in range(6)])
+        """
+        if self.method == 'range':
+            out = bisect.bisect_right(self.ranges, value)
+        else:
+            out = zlib.crc32(str(value).encode('utf-8')) % len(self.shards)
+        return out
+
+    def _get_shards(self, table, where=None, where_boolean='AND'):
+        """
+        Get the shards that can have rows matching where statements.
+
+        Only ``where`` statements combined with ``AND`` that compare the shard key column are used, with ``=`` for both methods and ``>``, ``>=``, ``<``, and ``<=`` for the ``range`` method.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table.
+        where : list of list or list of tuple or None
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database.select`.
+        where_boolean : str
+            See parameter ``where_boolean`` in :meth:`msdss_base_database.core.Database.select`.
+
+        Returns
+        -------
+        list(int)
+            Sorted indices of the shards in ``shards``.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database, ShardedDatabase
+
+            db = ShardedDatabase([Database(), Database(), Database()], method='range', ranges=[10, 20])
+            print(db._get_shards('test_table', where=('id', '=', 15)))
+            print(db._get_shards('test_table', where=[('id', '>=', 12), ('column_one', '=', 'a')]))
+            print(db._get_shards('test_table', where=('column_one', '=', 'a')))
+        """
+        out = set(range(len(self.shards)))
+        if where is None or (where_boolean.lower() == 'or' and len(where) > 1):
+            return sorted(out)
+        where = [where] if not any(isinstance(w, list) or isinstance(w, tuple) for w in where) else where
+        key = self._get_key(table)
+        for column, operator, value in where:
+            if column != key or value is None:
+                continue
+
+            # (ShardedDatabase_get_shards_equal) Keep the shard of an equal value
+            if operator in ('=', '=='):
+                out &= {self._get_shard(value)}
+
+            # (ShardedDatabase_get_shards_range) Keep the shards that overlap a range of values
+            elif self.method == 'range' and operator in ('>', '>='):
+                out &= set(range(bisect.bisect_right(self.ranges, value), len(self.shards)))
+            elif self.method == 'range' and operator == '<':
+                out &= set(range(bisect.bisect_left(self.ranges, value) + 1))
+            elif self.method == 'range' and operator == '<=':
+                out &= set(range(bisect.bisect_right(self.ranges, value) + 1))
+        out = sorted(out)
+        return out
+
+    def _map(self, func, shards=None):
+        """
+        Call a function with each shard at the same time.
+
+        Parameters
+        ----------
+        func : func
+            Function that takes a :class:`msdss_base_database.core.Database` as its only argument.
+        shards : list(int) or None
+            Indices of the shards to call the function with. If ``None``, all shards are used.
+
+        Returns
+        -------
+        list
+            Results of the function in the order of ``shards``.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database, ShardedDatabase
+
+            db = ShardedDatabase([Database(), Database()])
+            print(db._map(lambda shard: shard.has_table('test_table')))
+        """
+        shards = shards if shards is not None else list(range(len(self.shards)))
+        if len(shards) == 1:
+            return [func(self.shards[shards[0]])]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers if self.workers is not None else len(shards)) as pool:
+            futures = [pool.submit(func, self.shards[i]) for i in shards]
+            out = [f.result() for f in futures]
+        return out
+
+    def create_table(self, table, columns):
+        """
+        Create a table on each shard.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to create.
+        columns : list(dict) or list(list)
+            See parameter ``columns`` in :meth:`msdss_base_database.core.Database.create_table`.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database, ShardedDatabase
+
+            sqlite = dict(driver='sqlite', user=None, password=None, host=None, port=None, load_env=False)
+            db = ShardedDatabase([Database(database='shard_a.db', **sqlite), Database(database='shard_b.db', **sqlite)])
+            if db.has_table('test_table'):
+                db.drop_table('test_table')
+            db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True), ('column_one', 'String')])
+            print(db.has_table('test_table'))
+        """
+        self._map(lambda shard: shard.create_table(table, columns))
+
+    def delete(self, table, where, where_boolean='AND'):
+        """
+        Remove rows from a table on the shards that can have matching rows.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to remove rows from.
+        where : list of list or list of tuple
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database.delete`.
+        where_boolean : str
+            See parameter ``where_boolean`` in :meth:`msdss_base_database.core.Database.delete`.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database, ShardedDatabase
+
+            sqlite = dict(driver='sqlite', user=None, password=None, host=None, port=None, load_env=False)
+            db = ShardedDatabase([Database(database='shard_a.db', **sqlite), Database(database='shard_b.db', **sqlite)])
+            if db.has_table('test_table'):
+                db.drop_table('test_table')
+            db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True), ('column_one', 'String')])
+            db.insert('test_table', {'id': [1, 2, 3], 'column_one': ['a', 'b', 'c']})
+            db.delete('test_table', where=('id', '=', 2))
+            print(db.select('test_table', order_by='id'))
+        """
+        self._map(lambda shard: shard.delete(table, where=where, where_boolean=where_boolean), self._get_shards(table, where=where, where_boolean=where_boolean))
+
+    def drop_table(self, table):
+        """
+        Remove a table from each shard that has it.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to remove.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database, ShardedDatabase
+
+            sqlite = dict(driver='sqlite', user=None, password=None, host=None, port=None, load_env=False)
+            db = ShardedDatabase([Database(database='shard_a.db', **sqlite), Database(database='shard_b.db', **sqlite)])
+            if not db.has_table('test_table'):
+                db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True)])
+            db.drop_table('test_table')
+            print(db.has_table('test_table'))
+        """
+        self._map(lambda shard: shard.drop_table(table) if shard.has_table(table) else None)
+
+    def has_table(self, table):
+        """
+        Check if a table exists on every shard.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to check.
+
+        Returns
+        -------
+        bool
+            Whether the table exists on every shard.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database, ShardedDatabase
+
+            sqlite = dict(driver='sqlite', user=None, password=None, host=None, port=None, load_env=False)
+            db = ShardedDatabase([Database(database='shard_a.db', **sqlite), Database(database='shard_b.db', **sqlite)])
+            print(db.has_table('test_table'))
+        """
+        out = all(self._map(lambda shard: shard.has_table(table)))
+        return out
+
+    def insert(self, table, data, **kwargs):
+        """
+        Insert data into a table, writing each row to the shard of its shard key value.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to insert data to.
+        data : dict or list or :class:`pandas:pandas.DataFrame`
+            Data to insert, where each row must have the shard key column. See :meth:`msdss_base_database.core.Database._get_records`.
+        **kwargs
+            Additional arguments passed to :meth:`msdss_base_database.core.Database.insert` for each shard, such as ``method`` or ``batch_size``.
+
+        Returns
+        -------
+        dict
+            Dictionary with keys ``rows`` (number of rows inserted), ``seconds`` (time taken), ``rows_per_second``, and ``shards`` (list of the load stats of each shard from :meth:`msdss_base_database.core.Database.insert`, or ``None`` for shards without rows).
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database, ShardedDatabase
+
+            sqlite = dict(driver='sqlite', user=None, password=None, host=None, port=None, load_env=False)
+            db = ShardedDatabase([Database(database='shard_a.db', **sqlite), Database(database='shard_b.db', **sqlite)])
+            if db.has_table('test_table'):
+                db.drop_table('test_table')
+            db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True), ('column_one', 'String')])
+            stats = db.insert('test_table', {'id': [1, 2, 3, 4], 'column_one': ['a', 'b', 'c', 'd']})
+            print(stats)
+        """
+        start = time.perf_counter()
+        key = self._get_key(table)
+
+        # (ShardedDatabase_insert_split) Split the records by shard
+        records = [[] for _ in self.shards]
+        for record in self.shards[0]._get_records(data):
+            records[self._get_shard(record[key])].append(record)
+
+        # (ShardedDatabase_insert_load) Insert the records of each shard at the same time
+        shards = [i for i, r in enumerate(records) if len(r) > 0]
+        results = self._map(lambda shard: shard.insert(table, records[self.shards.index(shard)], **kwargs), shards) if len(shards) > 0 else []
+        stats = [None] * len(self.shards)
+        for i, result in zip(shards, results):
+            stats[i] = result
+
+        # (ShardedDatabase_insert_return) Return load stats
+        rows = sum(len(r) for r in records)
+        seconds = time.perf_counter() - start
+        out = dict(rows=rows, seconds=seconds, rows_per_second=rows / seconds if seconds > 0 else None, shards=stats)
+        return out
+
+    def rows(self, table):
+        """
+        Get the number of rows of a table across all shards.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to count rows for.
+
+        Returns
+        -------
+        int
+            Number of rows.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database, ShardedDatabase
+
+            sqlite = dict(driver='sqlite', user=None, password=None, host=None, port=None, load_env=False)
+            db = ShardedDatabase([Database(database='shard_a.db', **sqlite), Database(database='shard_b.db', **sqlite)])
+            if db.has_table('test_table'):
+                db.drop_table('test_table')
+            db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True)])
+            db.insert('test_table', {'id': [1, 2, 3]})
+            print(db.rows('test_table'))
+        """
+        out = sum(self._map(lambda shard: shard.rows(table)))
+        return out
+
+    def select(
+        self,
+        table,
+        select='*',
+        where=None,
+        group_by=None,
+        aggregate=None,
+        aggregate_func='count',
+        order_by=None,
+        order_by_sort='asc',
+        limit=None,
+        offset=None,
+        where_boolean='AND',
+        having=None,
+        having_boolean='AND',
+        **kwargs):
+        """
+        Query data from a table on the shards that can have matching rows, and combine the results.
+
+        Queries that run on one shard are passed to :meth:`msdss_base_database.core.Database.select` as is. Otherwise:
+
+        * ``order_by`` is run on each shard and the combined rows are sorted again
+        * ``limit`` and ``offset`` are run on each shard as a ``limit`` of ``limit + offset`` rows when ``order_by`` is given, and applied again to the combined rows
+        * aggregates are run on each shard and combined for each group, where ``count`` and ``sum`` are summed, and ``min`` and ``max`` take the minimum and maximum
+        * ``having`` is applied to the combined groups, as the aggregates of each shard are only part of each group
+        * ``window`` is not supported, as window functions need the rows of all shards
+
+        Parameters
+        ----------
+        table : str
+            Name of the database table to query from.
+        select : str or list(str) or None
+            See parameter ``select`` in :meth:`msdss_base_database.core.Database.select`.
+        where : list of list or list of tuple or None
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database.select`.
+        group_by : str or list(str) or None
+            See parameter ``group_by`` in :meth:`msdss_base_database.core.Database.select`.
+        aggregate : str or list(str) or dict or None
+            See parameter ``aggregate`` in :meth:`msdss_base_database.core.Database.select`. Only the functions below can be combined across shards:
+
+            .. jupyter-execute::
+                :hide-code:
+
+                from msdss_base_database.defaults import DEFAULT_SHARD_AGGREGATES
+                for func, combine in DEFAULT_SHARD_AGGREGATES.items():
+                    print(func + ' = ' + combine)
+
+        aggregate_func : str or list(str)
+            See parameter ``aggregate_func`` in :meth:`msdss_base_database.core.Database.select`.
+        order_by : str or list(str) or None
+            See parameter ``order_by`` in :meth:`msdss_base_database.core.Database.select`. Can also be the name of an aggregated column.
+        order_by_sort : str or list(str)
+            See parameter ``order_by_sort`` in :meth:`msdss_base_database.core.Database.select`.
+        limit : int or None
+            See parameter ``limit`` in :meth:`msdss_base_database.core.Database.select`.
+        offset : int or None
+            See parameter ``offset`` in :meth:`msdss_base_database.core.Database.select`.
+        where_boolean : str
+            See parameter ``where_boolean`` in :meth:`msdss_base_database.core.Database.select`.
+        having : list of list or list of tuple or None
+            See parameter ``having`` in :meth:`msdss_base_database.core.Database.select`. Only the operators ``=``, ``!=``, ``>``, ``>=``, ``<``, and ``<=`` are supported across shards.
+        having_boolean : str
+            See parameter ``having_boolean`` in :meth:`msdss_base_database.core.Database.select`.
+        **kwargs
+            Additional arguments passed to :meth:`msdss_base_database.core.Database.select` for each shard, such as ``dtypes`` or ``cache``. Results are combined as :class:`pandas:pandas.DataFrame` objects, so ``output`` is not supported.
+
+        Returns
+        -------
+        :class:`pandas:pandas.DataFrame`
+            The queried data.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database, ShardedDatabase
+
+            sqlite = dict(driver='sqlite', user=None, password=None, host=None, port=None, load_env=False)
+            db = ShardedDatabase([Database(database='shard_a.db', **sqlite), Database(database='shard_b.db', **sqlite)])
+            if db.has_table('test_table'):
+                db.drop_table('test_table')
+            db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True), ('column_one', 'String'), ('column_two', 'Integer')])
+            db.insert('test_table', {'id': [1, 2, 3, 4], 'column_one': ['a', 'b', 'a', 'b'], 'column_two': [2, 4, 6, 8]})
+
+            # Get the top rows across shards
+            print(db.select('test_table', order_by='column_two', order_by_sort='desc', limit=2))
+
+            # Count and sum for each group across shards
+            print(db.select('test_table', select='column_one', group_by='column_one', aggregate=['id', 'column_two'], aggregate_func=['count', 'sum'], order_by='column_one'))
+        """
+        if 'output' in kwargs and kwargs['output'] != 'pandas':
+            raise ValueError(str(kwargs['output']) + ' is not supported')
+        shards = self._get_shards(table, where=where, where_boolean=where_boolean)
+        query = dict(select=select, where=where, group_by=group_by, aggregate=aggregate, aggregate_func=aggregate_func, where_boolean=where_boolean, **kwargs)
+
+        # (ShardedDatabase_select_one) Query one shard as is
+        if len(shards) == 1:
+            out = self.shards[shards[0]].select(table, order_by=order_by, order_by_sort=order_by_sort, limit=limit, offset=offset, having=having, having_boolean=having_boolean, **query)
+            return out
+        if kwargs.get('window') is not None:
+            raise ValueError('window across shards is not supported')
+
+        # (ShardedDatabase_select_aggregates) Get how to combine each aggregated column
+        combine = {}
+        if aggregate is not None:
+            aggregate = [aggregate] if isinstance(aggregate, str) else aggregate
+            if isinstance(aggregate, dict):
+                pairs = [(a, f) for a, funcs in aggregate.items() for f in ([funcs] if isinstance(funcs, str) else funcs)]
+            elif isinstance(aggregate_func, list):
+                pairs = list(zip(aggregate, aggregate_func))
+            else:
+                pairs = [(a, aggregate_func) for a in aggregate]
+            for a, f in pairs:
+                if f.lower() not in DEFAULT_SHARD_AGGREGATES:
+                    raise ValueError(f + ' across shards is not supported')
+                combine[f if a == '*' else a + '_' + f] = DEFAULT_SHARD_AGGREGATES[f.lower()]
+
+        # (ShardedDatabase_select_scatter) Query the shards at the same time, sorting and limiting each shard if possible
+        pushdown = aggregate is None and order_by is not None and limit is not None
+        shard_query = dict(
+            order_by=order_by if aggregate is None else None,
+            order_by_sort=order_by_sort,
+            limit=(limit + (offset or 0)) if pushdown else limit if aggregate is None and order_by is None and offset is None else None,
+            **query
+        )
+        results = self._map(lambda shard: shard.select(table, **shard_query), shards)
+
+        # (ShardedDatabase_select_gather) Combine the results of the shards
+        import pandas
+        out = pandas.concat([r for r in results if len(r) > 0] or results[:1], ignore_index=True)
+        if aggregate is not None:
+            group_by = [group_by] if isinstance(group_by, str) else group_by
+            if group_by is not None and len(out) > 0:
+                out = out.groupby(group_by, as_index=False, sort=False, dropna=False).agg(combine)
+            elif len(out) > 0:
+                out = out.agg(combine).to_frame().T.reset_index(drop=True)
+
+        # (ShardedDatabase_select_having) Filter the combined groups
+        if having is not None and len(out) > 0:
+            having = [having] if not any(isinstance(h, list) or isinstance(h, tuple) for h in having) else having
+            compare = {'=': '__eq__', '==': '__eq__', '!=': '__ne__', '>': '__gt__', '>=': '__ge__', '<': '__lt__', '<=': '__le__'}
+            masks = []
+            for column, operator, value in having:
+                if operator not in compare:
+                    raise ValueError(operator + ' in having across shards is not supported')
+                masks.append(getattr(out[column], compare[operator])(value).fillna(False).astype(bool))
+            mask = masks[0]
+            for m in masks[1:]:
+                mask = mask | m if having_boolean.lower() == 'or' else mask & m
+            out = out[mask].reset_index(drop=True)
+
+        # (ShardedDatabase_select_order) Sort and limit the combined rows
+        if order_by is not None:
+            order_by = [order_by] if isinstance(order_by, str) else order_by
+            sorts = order_by_sort if isinstance(order_by_sort, list) else [order_by_sort] * len(order_by)
+            out = out.sort_values(order_by, ascending=[s.lower() == 'asc' for s in sorts], kind='stable', ignore_index=True)
+        if offset is not None or limit is not None:
+            start = offset or 0
+            out = out.iloc[start:start + limit if limit is not None else None].reset_index(drop=True)
+        return out
+
+    def update(self, table, where, values, where_boolean='AND'):
+        """
+        Update values in a table on the shards that can have matching rows.
+
+        Parameters
+        ----------
+        table : str
+            Name of the table to update.
+        where : list of list or list of tuple
+            See parameter ``where`` in :meth:`msdss_base_database.core.Database.update`.
+        values : dict
+            See parameter ``values`` in :meth:`msdss_base_database.core.Database.update`. The shard key column cannot be updated, as rows are not moved between shards.
+        where_boolean : str
+            See parameter ``where_boolean`` in :meth:`msdss_base_database.core.Database.update`.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database import Database, ShardedDatabase
+
+            sqlite = dict(driver='sqlite', user=None, password=None, host=None, port=None, load_env=False)
+            db = ShardedDatabase([Database(database='shard_a.db', **sqlite), Database(database='shard_b.db', **sqlite)])
+            if db.has_table('test_table'):
+                db.drop_table('test_table')
+            db.create_table('test_table', [dict(name='id', type_='Integer', primary_key=True), ('column_one', 'String')])
+            db.insert('test_table', {'id': [1, 2, 3], 'column_one': ['a', 'b', 'c']})
+            db.update('test_table', where=('id', '>=', 2), values={'column_one': 'AA'})
+            print(db.select('test_table', order_by='id'))
+        """
+        if self._get_key(table) in values:
+            raise ValueError('updating shard key ' + self._get_key(table) + ' is not supported')
+        self._map(lambda shard: shard.update(table, where=where, values=values, where_boolean=where_boolean), self._get_shards(table, where=where, where_boolean=where_boolean))
@@ -0,0 +1,334 @@
+import json
+import logging
+import threading
+
+from collections import deque
+
+from .defaults import *
+
+class QueryStats:
+    """
+    Class for recording the time spent in each phase of database queries.
+
+    Each query record is a dict with keys:
+
+    * ``table``: name of the table queried, or ``None`` if not known
+    * ``operation``: name of the operation, such as ``select``, ``insert``, ``update``, ``delete``, or ``execute``
+    * ``build``: seconds to build the statement or prepare the data
+    * ``compile``: seconds for sqlalchemy to compile the statement
+    * ``execute``: seconds for the database to execute the statement
+    * ``fetch``: seconds to fetch the results
+    * ``frame``: seconds to build the dataframe or arrow table from the results
+    * ``total``: seconds for the whole call
+    * ``rows``: number of rows returned or affected, or ``None`` if not known
+    * ``bytes``: approximate size in bytes of the results, or ``None`` if not known
+    * ``cached``: whether the results were from the result cache
+    * ``error``: whether the call raised an error
+    * ``statement``: statement that was executed, or ``None`` if not known
+
+    Parameters
+    ----------
+    history : int or None
+        Maximum number of the most recent query records to keep. If ``None``, all records are kept.
+    buckets : list(float)
+        Upper bounds in seconds of the buckets for the histogram of the ``total`` time of each table and operation.
+    slow_query_threshold : int or float or None
+        Number of seconds of ``total`` time at or above which a query is written to the slow query log. If ``None``, the slow query log is not used.
+    slow_query_log : str or :class:`logging.Logger` or None
+        Where to write slow queries as JSON records.
+
+        * If ``str``, the path of a file to append one JSON record per line to
+        * If :class:`logging.Logger`, a logger to write each record to as a warning
+        * If ``None``, the ``msdss_base_database.stats`` logger
+
+    Attributes
+    ----------
+    buckets : list(float)
+        Same as parameter ``buckets``.
+    slow_query_threshold : int or float or None
+        Same as parameter ``slow_query_threshold``.
+    slow_query_log : str or :class:`logging.Logger`
+        Same as parameter ``slow_query_log``, except that ``None`` is replaced by the module logger.
+    _aggregates : dict
+        Dictionary of ``(table, operation)`` keys and dicts of summed times, counts, and histogram counts.
+    _history : :class:`collections.deque`
+        The most recent query records.
+    _hooks : list(func)
+        Functions called with each query record. Errors raised by a hook are written to the ``msdss_base_database.stats`` logger instead of being raised.
+    _lock : :class:`threading.Lock`
+        Lock for updating the records across threads.
+
+    Author
+    ------
+    Richard Wen <rrwen.dev@gmail.com>
+
+    Example
+    -------
+    .. jupyter-execute::
+
+        from msdss_base_database.stats import QueryStats
+
+        # Create stats that log queries taking 1 second or longer
+        stats = QueryStats(slow_query_threshold=1)
+
+        # Print each record as it is added
+        stats.add_hook(lambda record: print(record['operation'] + ': ' + str(record['total'])))
+
+        # Add query records
+        stats.record(dict(table='test_table', operation='select', execute=0.002, total=0.004, rows=3))
+        stats.record(dict(table='test_table', operation='select', execute=0.02, total=0.03, rows=30))
+
+        # Display summary
+        print(stats.summary())
+    """
+    def __init__(self, history=DEFAULT_STATS_HISTORY, buckets=DEFAULT_STATS_BUCKETS, slow_query_threshold=None, slow_query_log=None):
+        self.buckets = sorted(buckets)
+        self.slow_query_threshold = slow_query_threshold
+        self.slow_query_log = slow_query_log if slow_query_log is not None else logging.getLogger(__name__)
+        self._aggregates = {}
+        self._history = deque(maxlen=history)
+        self._hooks = []
+        self._lock = threading.Lock()
+
+    def _log_slow_query(self, record):
+        """
+        Write a query record to the slow query log.
+
+        Parameters
+        ----------
+        record : dict
+            Query record to write, where the ``statement`` is converted to ``str``.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.stats import QueryStats
+
+            stats = QueryStats(slow_query_threshold=0)
+            stats._log_slow_query(dict(table='test_table', operation='select', total=2.5, statement='SELECT 1'))
+        """
+        record = {**record, 'statement': str(record['statement']) if record.get('statement') is not None else None}
+        line = json.dumps(record, default=str)
+        if isinstance(self.slow_query_log, str):
+            with self._lock:
+                with open(self.slow_query_log, 'a') as file:
+                    file.write(line + '\n')
+        else:
+            self.slow_query_log.warning(line)
+
+    def add_hook(self, hook):
+        """
+        Add a function to call with each query record.
+
+        Parameters
+        ----------
+        hook : func
+            Function that takes a query record dict as its only argument. Hooks are called in the thread that ran the query, so they should be fast. Errors raised by the hook are logged instead of raised.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.stats import QueryStats
+
+            stats = QueryStats()
+            stats.add_hook(print)
+            stats.record(dict(table='test_table', operation='select', total=0.01))
+        """
+        with self._lock:
+            self._hooks.append(hook)
+
+    def history(self):
+        """
+        Get the most recent query records.
+
+        Returns
+        -------
+        list(dict)
+            List of query records from oldest to newest.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.stats import QueryStats
+
+            stats = QueryStats(history=1)
+            stats.record(dict(table='test_table', operation='select', total=0.01))
+            stats.record(dict(table='test_table', operation='insert', total=0.02))
+            print(stats.history())
+        """
+        with self._lock:
+            out = list(self._history)
+            return out
+
+    def record(self, record):
+        """
+        Add a query record, updating the summary, calling the hooks, and writing to the slow query log if it is slow.
+
+        Parameters
+        ----------
+        record : dict
+            Query record with keys as described in :class:`msdss_base_database.stats.QueryStats`. Missing times default to ``0``.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.stats import QueryStats
+
+            stats = QueryStats()
+            stats.record(dict(table='test_table', operation='select', build=0.001, execute=0.002, total=0.004, rows=3))
+            print(stats.summary())
+        """
+        record = {**dict(table=None, operation=None, rows=None, bytes=None, cached=False, error=False, statement=None), **{k:0.0 for k in DEFAULT_STATS_PHASES}, **record}
+        with self._lock:
+
+            # (QueryStats_record_history) Keep the record
+            self._history.append(record)
+
+            # (QueryStats_record_aggregate) Add the record to the summary of its table and operation
+            key = (record['table'], record['operation'])
+            if key not in self._aggregates:
+                self._aggregates[key] = dict(
+                    count=0,
+                    errors=0,
+                    cached=0,
+                    rows=0,
+                    bytes=0,
+                    **{k:0.0 for k in DEFAULT_STATS_PHASES},
+                    total_min=None,
+                    total_max=None,
+                    histogram=[0] * (len(self.buckets) + 1)
+                )
+            aggregate = self._aggregates[key]
+            aggregate['count'] += 1
+            aggregate['errors'] += int(record['error'])
+            aggregate['cached'] += int(record['cached'])
+            aggregate['rows'] += record['rows'] or 0
+            aggregate['bytes'] += record['bytes'] or 0
+            for k in DEFAULT_STATS_PHASES:
+                aggregate[k] += record[k]
+            aggregate['total_min'] = min(aggregate['total_min'], record['total']) if aggregate['total_min'] is not None else record['total']
+            aggregate['total_max'] = max(aggregate['total_max'], record['total']) if aggregate['total_max'] is not None else record['total']
+            aggregate['histogram'][next((i for i, b in enumerate(self.buckets) if record['total'] <= b), len(self.buckets))] += 1
+            hooks = list(self._hooks)
+
+        # (QueryStats_record_hooks) Call each hook with the record, logging errors so that they do not fail the query
+        for hook in hooks:
+            try:
+                hook(record)
+            except Exception:
+                logging.getLogger(__name__).exception('query hook ' + repr(hook) + ' failed')
+
+        # (QueryStats_record_slow) Write slow queries to the log
+        if self.slow_query_threshold is not None and record['total'] >= self.slow_query_threshold:
+            self._log_slow_query(record)
+
+    def remove_hook(self, hook):
+        """
+        Remove a function added with :meth:`msdss_base_database.stats.QueryStats.add_hook`.
+
+        Parameters
+        ----------
+        hook : func
+            Function to remove.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.stats import QueryStats
+
+            stats = QueryStats()
+            stats.add_hook(print)
+            stats.remove_hook(print)
+            stats.record(dict(table='test_table', operation='select', total=0.01))
+        """
+        with self._lock:
+            self._hooks.remove(hook)
+
+    def reset(self):
+        """
+        Remove all query records and summaries, keeping the hooks.
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.stats import QueryStats
+
+            stats = QueryStats()
+            stats.record(dict(table='test_table', operation='select', total=0.01))
+            stats.reset()
+            print(stats.summary())
+        """
+        with self._lock:
+            self._history.clear()
+            self._aggregates.clear()
+
+    def summary(self):
+        """
+        Get the summary of the query records for each table and operation.
+
+        Returns
+        -------
+        dict
+            Dictionary of ``(table, operation)`` keys and dict values with keys:
+
+            * ``count``, ``errors``, ``cached``: number of calls, calls with errors, and calls using cached results
+            * ``rows``, ``bytes``: total rows and bytes
+            * ``build``, ``compile``, ``execute``, ``fetch``, ``frame``, ``total``: total seconds of each phase
+            * ``total_min``, ``total_max``, ``total_mean``: minimum, maximum, and mean seconds of each call
+            * ``histogram``: dict of bucket upper bounds in seconds and the number of calls with a ``total`` time in that bucket, where the last bound is ``inf``
+
+        Author
+        ------
+        Richard Wen <rrwen.dev@gmail.com>
+
+        Example
+        -------
+        .. jupyter-execute::
+
+            from msdss_base_database.stats import QueryStats
+
+            stats = QueryStats(buckets=[0.01, 0.1])
+            stats.record(dict(table='test_table', operation='select', total=0.004))
+            stats.record(dict(table='test_table', operation='select', total=0.05))
+            print(stats.summary())
+        """
+        with self._lock:
+            bounds = self.buckets + [float('inf')]
+            out = {}
+            for key, aggregate in self._aggregates.items():
+                out[key] = {
+                    **aggregate,
+                    'total_mean': aggregate['total'] / aggregate['count'],
+                    'histogram': dict(zip(bounds, aggregate['histogram']))
+                }
+            return out
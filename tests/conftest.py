@@ -0,0 +1,50 @@
+import pytest
+
+from msdss_base_database import Database
+
+SQLITE_KWARGS = dict(driver='sqlite', user=None, password=None, host=None, port=None, load_env=False)
+
+def make_database(path, **kwargs):
+    """
+    Create a database for a sqlite file.
+
+    Parameters
+    ----------
+    path : str or :class:`pathlib.Path`
+        Path of the sqlite file.
+    **kwargs
+        Additional arguments passed to :class:`msdss_base_database.core.Database`.
+
+    Returns
+    -------
+    :class:`msdss_base_database.core.Database`
+        Database for the sqlite file.
+    """
+    out = Database(database=str(path), **SQLITE_KWARGS, **kwargs)
+    return out
+
+def make_table(db, table='test_table'):
+    """
+    Create a sample table with the rows ``id`` 1 to 3.
+
+    Parameters
+    ----------
+    db : :class:`msdss_base_database.core.Database`
+        Database to create the table in.
+    table : str
+        Name of the table.
+    """
+    columns = [
+        dict(name='id', type_='Integer', primary_key=True),
+        ('column_one', 'String'),
+        ('column_two', 'Integer')
+    ]
+    db.create_table(table, columns)
+    db.insert(table, {'id': [1, 2, 3], 'column_one': ['a', 'b', 'c'], 'column_two': [2, 4, 6]})
+
+@pytest.fixture
+def db(tmp_path):
+    out = make_database(tmp_path / 'test.db')
+    make_table(out)
+    yield out
+    out.dispose()
@@ -0,0 +1,37 @@
+import pytest
+
+@pytest.fixture
+def grouped(db):
+    db.insert('test_table', {'id': [4, 5], 'column_one': ['a', 'a'], 'column_two': [8, 8]})
+    return db
+
+def test_multiple_functions(grouped):
+    df = grouped.select('test_table', select='column_one', group_by='column_one', aggregate={'column_two': ['sum', 'avg', 'count_distinct'], '*': 'count'}, having=[('column_two_sum', '>', 5)], order_by='column_one')
+    assert list(df.columns) == ['column_one', 'column_two_sum', 'column_two_avg', 'column_two_count_distinct', 'count']
+    assert df['column_one'].tolist() == ['a', 'c']
+    assert df['column_two_sum'].tolist() == [18, 6]
+    assert df['column_two_count_distinct'].tolist() == [2, 1]
+
+def test_having_or(grouped):
+    kwargs = dict(select='column_one', group_by='column_one', aggregate='column_two', aggregate_func='sum', having_boolean='OR', order_by='column_one')
+    assert grouped.select('test_table', having=[('column_one', '=', 'b'), ('column_two_sum', '>', 10)], **kwargs)['column_one'].tolist() == ['a', 'b']
+    assert grouped.select('test_table', having=[('column_one', '=', 'c'), ('column_two_sum', '>', 10)], **kwargs)['column_one'].tolist() == ['a', 'c']
+
+def test_window(grouped):
+    window = [
+        dict(func='sum', column='column_two', partition_by='column_one', order_by='id'),
+        dict(func='row_number', order_by='id', order_by_sort='desc', label='rn'),
+        dict(func='lag', column='column_two', args=[1], order_by='id')
+    ]
+    df = grouped.select('test_table', window=window, order_by='id')
+    assert df['column_two_sum_over'].tolist() == [2, 4, 6, 10, 18]
+    assert df['rn'].tolist() == [5, 4, 3, 2, 1]
+    assert df['column_two_lag_over'].isna().tolist()[0]
+
+def test_legacy_aggregate(grouped):
+    df = grouped.select('test_table', select='column_one', group_by='column_one', aggregate=['column_two', 'column_one'], aggregate_func=['sum', 'count'], order_by='column_one')
+    assert list(df.columns) == ['column_one', 'column_two_sum', 'column_one_count']
+
+def test_aggregate_only(grouped):
+    df = grouped.select('test_table', select=None, aggregate={'column_two': ['sum', 'max']})
+    assert df.to_dict('records') == [{'column_two_sum': 28, 'column_two_max': 8}]
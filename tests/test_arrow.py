@@ -0,0 +1,29 @@
+import datetime
+
+import pyarrow
+
+def test_select_arrow_types(db):
+    table = db.select('test_table', output='arrow')
+    assert table.schema.field('id').type == pyarrow.int64()
+    assert table.schema.field('column_one').type == pyarrow.string()
+    assert table.column('column_two').to_pylist() == [2, 4, 6]
+
+def test_select_arrow_empty(db):
+    table = db.select('test_table', where=('id', '>', 100), output='arrow')
+    assert table.num_rows == 0
+    assert table.column_names == ['id', 'column_one', 'column_two']
+
+def test_select_arrow_aggregate(db):
+    table = db.select('test_table', select='column_one', group_by='column_one', aggregate='column_two', aggregate_func='sum', output='arrow')
+    assert table.column_names == ['column_one', 'column_two_sum']
+
+def test_select_pyarrow_backend(db):
+    df = db.select('test_table', dtype_backend='pyarrow')
+    assert all(str(t).endswith('[pyarrow]') for t in df.dtypes)
+
+def test_arrow_nulls_and_dates(db):
+    db.create_table('dates', [dict(name='id', type_='Integer', primary_key=True), ('d', 'DateTime'), ('b', 'Boolean')])
+    db.insert('dates', {'id': [1, 2], 'd': [datetime.datetime(2020, 1, 1), None], 'b': [True, None]})
+    table = db.select('dates', output='arrow')
+    assert table.column('d').to_pylist() == [datetime.datetime(2020, 1, 1), None]
+    assert table.column('b').to_pylist() == [True, None]
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from msdss_base_database import AsyncDatabase, Param
+
+from conftest import SQLITE_KWARGS
+
+def run(func, path):
+    async def main():
+        db = AsyncDatabase(**{**SQLITE_KWARGS, 'database': str(path)})
+        try:
+            await db.create_table('t', [dict(name='id', type_='Integer', primary_key=True), ('a', 'String')])
+            await db.insert('t', {'id': [1, 2, 3], 'a': ['x', 'y', 'z']})
+            return await func(db)
+        finally:
+            await db.dispose()
+    out = asyncio.run(main())
+    return out
+
+def test_crud(tmp_path):
+    async def func(db):
+        await db.update('t', where=[('id', '=', 1), ('id', '=', 3)], values={'a': 'u'}, where_boolean='OR')
+        await db.delete('t', where=('id', '=', 2))
+        df = await db.select('t', order_by='id')
+        return list(df['a']), await db.rows('t'), await db.has_table('t')
+    assert run(func, tmp_path / 'test.db') == (['u', 'u'], 2, True)
+
+def test_select_iter(tmp_path):
+    async def func(db):
+        return [len(chunk) async for chunk in db.select_iter('t', chunksize=2)]
+    assert run(func, tmp_path / 'test.db') == [2, 1]
+
+def test_prepare(tmp_path):
+    async def func(db):
+        lookup = await db.prepare('t', where=[('id', '=', Param('id'))])
+        return list((await lookup(id=2))['a'])
+    assert run(func, tmp_path / 'test.db') == ['y']
+
+def test_transaction_rollback(tmp_path):
+    async def func(db):
+        with pytest.raises(RuntimeError):
+            async with db.transaction():
+                await db.insert('t', {'id': [4], 'a': ['w']})
+                raise RuntimeError('rollback')
+        return await db.rows('t')
+    assert run(func, tmp_path / 'test.db') == 3
+
+@pytest.mark.parametrize('name', ['upsert', 'update_many', 'delete_many', 'select_in', 'paginate', 'explain', 'create_index', 'select_changes', 'select_parallel'])
+def test_unsupported(tmp_path, name):
+    async def func(db):
+        with pytest.raises(NotImplementedError, match=name):
+            getattr(db, name)('t')
+    run(func, tmp_path / 'test.db')
+
+def test_select_output_checked(tmp_path):
+    async def func(db):
+        with pytest.raises(ValueError):
+            await db.select('missing_table', output='unknown')
+        with pytest.raises(ValueError):
+            async for chunk in db.select_iter('missing_table', output='unknown'):
+                pass
+    run(func, tmp_path / 'test.db')
@@ -0,0 +1,24 @@
+import json
+import pathlib
+import subprocess
+import sys
+
+BENCHMARKS = pathlib.Path(__file__).resolve().parent.parent / 'benchmarks'
+
+def run(script, *args):
+    out = subprocess.run([sys.executable, str(BENCHMARKS / script), *args], capture_output=True, text=True)
+    return out
+
+def test_run_and_compare(tmp_path):
+    output = str(tmp_path / 'baseline.json')
+    result = run('run.py', '--targets', 'sqlite_file', 'sqlite_memory', '--sizes', '20', '--repeat', '1', '--output', output)
+    assert result.returncode == 0, result.stderr
+    with open(output) as file:
+        results = json.load(file)['results']
+    assert {r['target'] for r in results} == {'sqlite_file', 'sqlite_memory'}
+    result = run('run.py', '--targets', 'sqlite_memory', '--sizes', '20', '--repeat', '1', '--baseline', output, '--tolerance', '1000')
+    assert result.returncode == 0, result.stderr
+
+def test_import_time():
+    result = run('import_time.py', '--repeat', '1')
+    assert result.returncode == 0, result.stderr
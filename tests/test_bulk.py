@@ -0,0 +1,77 @@
+import pytest
+import sqlalchemy
+
+def test_update_many(db):
+    rows = db.update_many('test_table', {'id': [1, 3], 'column_one': ['AA', 'CC'], 'column_two': [20, 60]})
+    assert rows == 2
+    df = db.select('test_table', order_by='id')
+    assert df['column_one'].tolist() == ['AA', 'b', 'CC']
+    assert df['column_two'].tolist() == [20, 4, 60]
+
+@pytest.mark.parametrize('method', ['executemany', 'staged'])
+def test_update_many_missing_columns(db, method):
+    rows = db.update_many('test_table', [dict(id=1, column_one='AA'), dict(id=2, column_two=40), dict(id=3)], method=method)
+    assert rows == 2
+    df = db.select('test_table', order_by='id')
+    assert df['column_one'].tolist() == ['AA', 'b', 'c']
+    assert df['column_two'].tolist() == [2, 40, 6]
+
+def test_update_many_unsupported(db):
+    with pytest.raises(ValueError):
+        db.update_many('test_table', [dict(id=1, column_one='AA')], method='unknown')
+
+def temp_tables(connection):
+    out = [r[0] for r in connection.exec_driver_sql("SELECT name FROM sqlite_temp_master WHERE type = 'table'")]
+    return out
+
+def test_stage_records_dropped(db):
+    target = db._get_table('test_table')
+    with db._connect() as connection:
+        with db._stage_records(connection, target, [dict(id=1)], index=['id']) as staging:
+            assert temp_tables(connection) == [staging.name]
+        assert temp_tables(connection) == []
+        with pytest.raises(RuntimeError):
+            with db._stage_records(connection, target, [dict(id=1)]):
+                raise RuntimeError('failed')
+        assert temp_tables(connection) == []
+
+def test_update_many_staged_error_drops_staging(db):
+    db.create_index('test_table', 'column_one', unique=True)
+    with db.transaction():
+        with pytest.raises(sqlalchemy.exc.IntegrityError):
+            db.update_many('test_table', [dict(id=1, column_one='x'), dict(id=2, column_one='x')], method='staged')
+        assert temp_tables(db._local.connection) == []
+    assert db.select('test_table', order_by='id')['column_one'].tolist() == ['a', 'b', 'c']
+
+@pytest.mark.parametrize('method', ['executemany', 'staged'])
+def test_delete_many(db, method):
+    assert db.delete_many('test_table', [1, 3], method=method) == 2
+    assert db.select('test_table')['id'].tolist() == [2]
+
+def test_delete_many_records(db):
+    assert db.delete_many('test_table', [dict(id=2, column_one='b')], key=['id', 'column_one']) == 1
+    assert db.rows('test_table') == 2
+
+def test_get_batch_size(db):
+    assert db._get_batch_size(1000, 3) == 333
+    assert db._get_batch_size(1000, 3, reserved=9) == 330
+    assert db._get_batch_size(10, 3) == 10
+    assert db._get_batch_size(1000, 2000) == 1
+
+@pytest.mark.parametrize('method', ['executemany', 'values'])
+def test_upsert(db, method):
+    stats = db.upsert('test_table', [dict(id=1, column_one='AA', column_two=20), dict(id=4, column_one='d', column_two=8)], method=method)
+    assert stats['rows'] == 2
+    df = db.select('test_table', order_by='id')
+    assert df['column_one'].tolist() == ['AA', 'b', 'c', 'd']
+
+def test_upsert_do_nothing(db):
+    db.upsert('test_table', [dict(id=1, column_one='AA', column_two=20)], update_columns=[])
+    assert db.select('test_table', where=('id', '=', 1))['column_one'].tolist() == ['a']
+
+def test_values_over_variable_limit(db):
+    records = [dict(id=i, column_one=str(i), column_two=i) for i in range(4, 1504)]
+    assert db.upsert('test_table', records, method='values', batch_size=1500)['rows'] == 1500
+    records = [dict(id=i, column_one=str(i), column_two=i) for i in range(1504, 3004)]
+    assert db.insert('test_table', records, method='values', batch_size=1500)['rows'] == 1500
+    assert db.rows('test_table') == 3003
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from msdss_base_database.cache import DiskCache, LRUCache
+
+from conftest import make_database, make_table
+
+@pytest.fixture(params=['memory', 'disk'])
+def cached(request, tmp_path):
+    out = make_database(tmp_path / 'test.db', result_cache=request.param)
+    make_table(out)
+    yield out
+    out.dispose()
+
+def test_select_cached(cached):
+    cached.select('test_table')
+    cached.select('test_table')
+    assert cached.cache_info()['result']['hits'] == 1
+
+@pytest.mark.parametrize('write', ['insert', 'update', 'delete', 'update_many', 'upsert', 'delete_many'])
+def test_write_invalidates(cached, write):
+    cached.select('test_table')
+    if write == 'insert':
+        cached.insert('test_table', [dict(id=4, column_one='d', column_two=8)])
+    elif write == 'update':
+        cached.update('test_table', where=('id', '=', 1), values={'column_one': 'AA'})
+    elif write == 'delete':
+        cached.delete('test_table', where=('id', '=', 1))
+    elif write == 'update_many':
+        cached.update_many('test_table', [dict(id=1, column_one='AA')])
+    elif write == 'upsert':
+        cached.upsert('test_table', [dict(id=1, column_one='AA', column_two=2)])
+    else:
+        cached.delete_many('test_table', [1])
+    assert cached.select('test_table').to_dict('records') == cached.select('test_table', cache=False).to_dict('records')
+    assert cached.cache_info()['result']['hits'] == 0
+
+def test_change_log_invalidated(cached):
+    cached.create_change_log('test_table')
+    before = len(cached.select('test_table_changes'))
+    cached.insert('test_table', [dict(id=4, column_one='d', column_two=8)])
+    assert len(cached.select('test_table_changes')) == before + 1
+
+def test_transaction_invalidates(cached):
+    with cached.transaction() as tx:
+        tx.insert('test_table', [dict(id=4, column_one='d', column_two=8)])
+        cached.select('test_table')
+    assert cached.rows('test_table') == 4
+    assert len(cached.select('test_table')) == 4
+
+def test_ttl():
+    cache = LRUCache(ttl=0)
+    cache.set('a', 1)
+    assert cache.get('a') is None
+    assert cache.info()['misses'] == 1
+
+def test_max_bytes():
+    cache = LRUCache(max_size=None, max_bytes=10)
+    cache.set('a', 1, size=6)
+    cache.set('b', 2, size=6)
+    cache.set('c', 3, size=11)
+    assert cache.keys() == ['b']
+
+def test_invalidate_group():
+    cache = LRUCache(max_size=2)
+    cache.set(('t', 1), 1, group='t')
+    cache.set(('u', 1), 2, group='u')
+    cache.set(('t', 2), 3, group='t') # evicts ('t', 1)
+    assert cache._groups == {'t': {('t', 2)}, 'u': {('u', 1)}}
+    cache.invalidate_group('t')
+    assert cache.keys() == [('u', 1)]
+    assert cache._groups == {'u': {('u', 1)}}
+
+def test_disk_cache_temporary_directory():
+    cache = DiskCache()
+    cache.set(('t', 1), {'a': [1]}, group='t')
+    assert cache.get(('t', 1)) == {'a': [1]}
+    assert len(os.listdir(cache.directory)) == 1
+    cache.invalidate_group('t')
+    assert os.listdir(cache.directory) == []
+    cache.close()
+    assert not os.path.exists(cache.directory)
+
+def test_disk_cache_given_directory(tmp_path):
+    cache = DiskCache(directory=str(tmp_path / 'cache'))
+    cache.set('a', 1)
+    cache.close()
+    assert os.listdir(tmp_path / 'cache') == []
+
+def test_dispose_removes_directory(tmp_path):
+    db = make_database(tmp_path / 'test.db', result_cache='disk')
+    directory = db._result_cache.directory
+    db.dispose()
+    assert not os.path.exists(directory)
@@ -0,0 +1,36 @@
+def test_table_cache(db):
+    db.columns('test_table')
+    db.select('test_table')
+    info = db.cache_info()['table']
+    assert info['size'] == 1
+    assert info['hits'] >= 1
+
+def test_drop_table_invalidates(db):
+    db.select('test_table')
+    db.drop_table('test_table')
+    assert not db.has_table('test_table')
+    assert db.cache_info()['table']['size'] == 0
+    db.create_table('test_table', [('id', 'Integer'), ('x', 'String')])
+    assert db.select('test_table').columns.tolist() == ['id', 'x']
+
+def test_invalidate_all(db):
+    db.columns('test_table')
+    db.invalidate_all()
+    assert db.cache_info()['table']['size'] == 0
+    assert db.columns('test_table') == 3
+
+def test_statement_cache(db):
+    for value in (3, 5):
+        db.select('test_table', where=[('column_two', '<', value), ('column_one', '!=', None)], limit=2)
+    info = db.cache_info()['query']
+    assert info['hits'] >= 1
+    size = info['size']
+    db.select('test_table', where=('column_one', 'contains', 'b'))
+    assert db.cache_info()['query']['size'] == size + 1
+
+def test_statement_cache_values(db):
+    assert db.select('test_table', where=('column_two', '<', 3))['id'].tolist() == [1]
+    assert db.select('test_table', where=('column_two', '<', 5))['id'].tolist() == [1, 2]
+    db.update('test_table', where=('id', '>', 1), values={'column_one': 'AA'})
+    db.update('test_table', where=('id', '>', 2), values={'column_one': 'BB'})
+    assert db.select('test_table', order_by='id')['column_one'].tolist() == ['a', 'AA', 'BB']
@@ -0,0 +1,57 @@
+import datetime
+
+import numpy
+import pytest
+
+def test_select_changes_watermark(db):
+    assert db.select_changes('test_table', consumer='c1')['id'].tolist() == [1, 2, 3]
+    assert db.get_watermark('test_table', 'c1') == 3
+    db.insert('test_table', {'id': [4, 5], 'column_one': ['d', 'e'], 'column_two': [8, 10]})
+    df = db.select_changes('test_table', consumer='c1', select='column_one', limit=1)
+    assert df['id'].tolist() == [4]
+    assert list(df.columns) == ['column_one', 'id']
+    assert db.select_changes('test_table', consumer='c1')['id'].tolist() == [5]
+    assert len(db.select_changes('test_table', consumer='c1')) == 0
+
+def test_select_changes_no_commit(db):
+    db.select_changes('test_table', consumer='c1', commit=False)
+    assert db.get_watermark('test_table', 'c1') is None
+
+def test_select_changes_ties(db):
+    db.insert('test_table', {'id': [4, 5], 'column_one': ['x', 'x'], 'column_two': [6, 6]})
+    df = db.select_changes('test_table', watermark_column='column_two', consumer='c1', limit=3)
+    assert df['id'].tolist() == [1, 2] # the rows with 6 are left for the next call
+    df = db.select_changes('test_table', watermark_column='column_two', consumer='c1', limit=2)
+    assert sorted(df['id']) == [3, 4, 5] # a page of tied rows returns all of them
+    assert len(db.select_changes('test_table', watermark_column='column_two', consumer='c1')) == 0
+
+def test_select_changes_ties_or(db):
+    db.insert('test_table', {'id': [4], 'column_one': ['x'], 'column_two': [6]})
+    with pytest.raises(ValueError):
+        db.select_changes('test_table', watermark_column='column_two', since=4, limit=1, where=[('id', '=', 3), ('id', '=', 4)], where_boolean='OR')
+
+@pytest.mark.parametrize('value', [datetime.datetime(2021, 1, 2, 3, 4), datetime.date(2021, 1, 2), numpy.int64(7), 'a'])
+def test_watermark_values(db, value):
+    db.set_watermark('test_table', 'c1', value)
+    assert db.get_watermark('test_table', 'c1') == value
+    db.set_watermark('test_table', 'c1', None)
+    assert db.get_watermark('test_table', 'c1') is None
+
+def test_change_log(db):
+    assert db.create_change_log('test_table', backfill=True) == 'test_table_changes'
+    df = db.select_changes('test_table', consumer='c2', change_log=True)
+    assert df['operation'].tolist() == ['insert'] * 3
+    db.update('test_table', where=('id', '=', 1), values={'column_one': 'aa'})
+    db.delete('test_table', where=('id', '=', 2))
+    db.upsert('test_table', {'id': [4], 'column_one': ['d'], 'column_two': [8]})
+    db.update('test_table', where=('id', '=', 3), values={'id': 30})
+    df = db.select_changes('test_table', consumer='c2', change_log=True)
+    assert dict(zip(df['id'], df['operation'])) == {1: 'update', 2: 'delete', 4: 'insert', 3: 'delete', 30: 'update'}
+    assert df.loc[df['id'] == 1, 'column_one'].iloc[0] == 'aa'
+    db.drop_change_log('test_table')
+    assert not db.has_table('test_table_changes')
+
+def test_change_log_where(db):
+    db.create_change_log('test_table')
+    with pytest.raises(ValueError):
+        db.select_changes('test_table', change_log=True, where=('id', '=', 1))
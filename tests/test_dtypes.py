@@ -0,0 +1,33 @@
+import numpy
+import pandas
+import pytest
+
+@pytest.fixture
+def nullable(db):
+    db.insert('test_table', pandas.DataFrame({'id': [4, 5], 'column_one': ['a', None], 'column_two': [8.0, numpy.nan]}))
+    return db
+
+def test_insert_casts_to_table_types(nullable):
+    with nullable._connect() as connection:
+        types = connection.exec_driver_sql('SELECT DISTINCT typeof(column_two) FROM test_table').fetchall()
+    assert {t[0] for t in types} == {'integer', 'null'}
+
+def test_schema_dtypes(nullable):
+    df = nullable.select('test_table', dtypes='schema', order_by='id')
+    assert str(df['column_two'].dtype) == 'Int64'
+    assert str(df['column_one'].dtype) == 'string'
+    assert df['column_two'].isna().tolist() == [False] * 4 + [True]
+
+def test_schema_dtypes_empty(nullable):
+    df = nullable.select('test_table', dtypes='schema', where=('id', '>', 100))
+    assert len(df) == 0
+    assert str(df['id'].dtype) == 'Int64'
+
+def test_categories(nullable):
+    df = nullable.select('test_table', dtypes={'column_one': 'category'}, select='column_one', group_by='column_one', aggregate={'column_two': ['sum', 'avg']}, order_by='column_one')
+    assert str(df['column_one'].dtype) == 'category'
+    assert str(df['column_two_sum'].dtype) == 'Int64'
+
+def test_unsupported_dtypes(db):
+    with pytest.raises(ValueError):
+        db.select('test_table', dtypes='unknown')
@@ -0,0 +1,57 @@
+import pytest
+
+from msdss_base_database.advisor import IndexAdvisor
+
+from conftest import make_database, make_table
+
+@pytest.fixture
+def advised(tmp_path):
+    out = make_database(tmp_path / 'test.db', index_advisor=True)
+    make_table(out)
+    yield out
+    out.dispose()
+
+def test_advisor_off_by_default(db):
+    assert db._advisor is None
+    db.select('test_table', where=('column_one', '=', 'a'))
+    with pytest.raises(ValueError):
+        db.suggest_indexes()
+
+def test_create_list_drop_index(db):
+    name = db.create_index('test_table', ['column_one', 'column_two'])
+    indexes = {i['name']: i for i in db.list_indexes('test_table')}
+    assert indexes[name]['columns'] == ['column_one', 'column_two']
+    db.drop_index('test_table', name)
+    assert name not in [i['name'] for i in db.list_indexes('test_table')]
+    with pytest.raises(ValueError):
+        db.drop_index('test_table', name)
+
+def test_explain_full_scan(db):
+    plan = db.explain('test_table', where=('column_one', '=', 'a'))
+    assert plan['full_scans'] == ['test_table']
+    db.create_index('test_table', 'column_one')
+    assert db.explain('test_table', where=('column_one', '=', 'a'))['full_scans'] == []
+
+def test_suggest_indexes(advised):
+    advised.select('test_table', where=('column_one', '=', 'a'))
+    advised.select('test_table', where=('column_one', '=', 'b'), order_by='column_two')
+    advised.select('test_table', where=('id', '=', 1))
+    suggested = advised.suggest_indexes()
+    assert [s['columns'] for s in suggested] == [['column_one', 'column_two']]
+    assert suggested[0]['uses'] == 2
+    for s in suggested:
+        advised.create_index(s['table'], s['columns'])
+    assert advised.suggest_indexes() == []
+
+def test_advisor_columns():
+    columns = IndexAdvisor._get_columns(where=[('b', '>', 1), ('a', '=', 2), ('c', 'contains', 'x')], order_by='d')
+    assert columns == ('a', 'b')
+    assert IndexAdvisor._get_columns(where=('a', '!=', 1)) == ()
+
+def test_advisor_max_patterns():
+    advisor = IndexAdvisor(max_patterns=2)
+    for i in range(3):
+        advisor.record('key_' + str(i), 't', where=('c' + str(i), '=', 1))
+    assert sorted(c['columns'] for c in advisor.candidates()) == [('c1',), ('c2',)]
+    advisor.reset('t')
+    assert advisor.candidates() == []
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+
+import pytest
+
+import msdss_base_database
+
+# Names exported by "from msdss_base_database import *" before the package imports were made lazy
+PREVIOUS_NAMES = [
+    'DEFAULT_DOTENV_KWARGS',
+    'DEFAULT_SUPPORTED_OPERATORS',
+    'Database',
+    'DatabaseDotEnv',
+    'DotEnv',
+    'core',
+    'defaults',
+    'env',
+    'get_database_url',
+    'pandas',
+    'sqlalchemy',
+    'tools'
+]
+
+def run(code):
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout.strip()
+    return out
+
+def test_import_is_lazy():
+    assert run("import sys, msdss_base_database; print(sorted(m for m in ('pandas', 'sqlalchemy') if m in sys.modules))") == '[]'
+
+def test_import_star():
+    names = run("ns = {}; exec('from msdss_base_database import *', ns); print(' '.join(sorted(k for k in ns if k != '__builtins__')))").split()
+    assert set(PREVIOUS_NAMES) <= set(names)
+    assert set(names) == set(msdss_base_database.__all__)
+
+@pytest.mark.parametrize('name', PREVIOUS_NAMES)
+def test_previous_names(name):
+    assert getattr(msdss_base_database, name) is not None
+
+def test_modules():
+    from msdss_base_database import core, pandas
+    assert core.Database is msdss_base_database.Database
+    assert pandas.__name__ == 'pandas'
+
+def test_missing_name():
+    with pytest.raises(AttributeError):
+        msdss_base_database.missing_name
+    with pytest.raises(AttributeError):
+        msdss_base_database._private
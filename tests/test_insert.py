@@ -0,0 +1,89 @@
+import pytest
+
+from msdss_base_database import Database
+
+from conftest import SQLITE_KWARGS, make_database, make_table
+
+@pytest.fixture
+def memory():
+    out = Database(**{**SQLITE_KWARGS, 'database': None})
+    make_table(out)
+    yield out
+    out.dispose()
+
+def test_single_connection(memory, db):
+    assert memory._is_single_connection()
+    assert not db._is_single_connection()
+
+@pytest.mark.parametrize('atomic', [False, True])
+def test_insert_parallel_memory(memory, atomic):
+    data = {'id': list(range(4, 24)), 'column_one': ['x'] * 20, 'column_two': list(range(20))}
+    stats = memory.insert('test_table', data, workers=4, chunksize=3, atomic=atomic)
+    assert stats['rows'] == 20
+    assert memory.rows('test_table') == 23
+
+def test_select_parallel_memory(memory):
+    memory.insert('test_table', {'id': list(range(4, 11)), 'column_one': ['x'] * 7, 'column_two': list(range(7))})
+    for executor in ('thread', 'process'):
+        df = memory.select_parallel('test_table', partition_column='id', partitions=3, executor=executor, order_by='id')
+        assert list(df['id']) == list(range(1, 11))
+
+@pytest.mark.parametrize('atomic', [False, True])
+def test_insert_parallel_file(db, atomic):
+    data = {'id': list(range(4, 24)), 'column_one': ['x'] * 20, 'column_two': list(range(20))}
+    stats = db.insert('test_table', data, workers=3, chunksize=4, atomic=atomic)
+    assert stats['rows'] == 20
+    assert db.rows('test_table') == 23
+
+def test_insert_parallel_atomic_error(db):
+    data = {'id': list(range(4, 14)) + [1], 'column_one': ['x'] * 11, 'column_two': list(range(11))}
+    with pytest.raises(Exception):
+        db.insert('test_table', data, workers=2, chunksize=2, atomic=True)
+    assert db.rows('test_table') == 3
+
+@pytest.mark.parametrize('method', ['executemany', 'values'])
+def test_insert_methods(db, method):
+    stats = db.insert('test_table', [dict(id=4, column_one='d', column_two=8), dict(id=5, column_one='e', column_two=10)], method=method)
+    assert stats == {**stats, 'rows': 2, 'method': method}
+    assert db.rows('test_table') == 5
+
+def test_insert_mixed_keys(db):
+    db.insert('test_table', [dict(id=4, column_one='d'), dict(id=5, column_two=10)])
+    df = db.select('test_table', where=('id', '>', 3), order_by='id')
+    assert df['column_one'].tolist() == ['d', None]
+    assert df['column_two'].isna().tolist() == [True, False]
+
+def test_insert_unequal_lengths(db):
+    with pytest.raises(ValueError):
+        db.insert('test_table', {'id': [4, 5], 'column_one': ['d']})
+
+def test_insert_unsupported_method(db):
+    with pytest.raises(ValueError):
+        db.insert('test_table', [dict(id=4)], method='unknown')
+    assert db.rows('test_table') == 3
+
+@pytest.mark.parametrize('method', ['auto', 'pandas'])
+def test_insert_invalidates_results(tmp_path, method):
+    cached = make_database(tmp_path / 'cached.db', result_cache='memory')
+    if method == 'auto': # the table does not exist, so it is written with pandas
+        cached.insert('new_table', {'id': [1], 'column_one': ['a']})
+    else:
+        make_table(cached, 'new_table')
+    before = len(cached.select('new_table'))
+    cached.insert('new_table', {'id': [4], 'column_one': ['d']}, method=method)
+    assert len(cached.select('new_table')) == before + 1
+    cached.dispose()
+
+def test_copy_records_encoding(memory):
+    class Cursor:
+        def copy_expert(self, sql, buffer):
+            self.sql, self.data = sql, buffer.read()
+        def close(self):
+            pass
+    class Connection:
+        dialect = memory._connection.dialect
+        connection = type('Raw', (), {'cursor': lambda self: cursor})()
+    cursor = Cursor()
+    records = [dict(id=1, data=b'\x00"ab', text='say "hi"'), dict(id=2, data=None, text='')]
+    memory._copy_records(Connection(), type('Table', (), {'name': 't', 'schema': None})(), records)
+    assert cursor.data == '"1","\\x00226162","say ""hi"""\n"2",,""\n'
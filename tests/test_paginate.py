@@ -0,0 +1,27 @@
+import pytest
+
+from msdss_base_database.tools import decode_cursor
+
+@pytest.fixture
+def paged(db):
+    db.insert('test_table', {'id': [4, 5, 6, 7], 'column_one': ['a', 'b', 'a', 'b'], 'column_two': [1, 1, 2, 2]})
+    return db
+
+def test_paginate(paged):
+    pages = list(paged.paginate('test_table', page_size=3))
+    assert [df['id'].tolist() for df, cursor in pages] == [[1, 2, 3], [4, 5, 6], [7]]
+    assert pages[-1][1] is None
+
+def test_paginate_multiple_columns(paged):
+    pages = [df['id'].tolist() for df, cursor in paged.paginate('test_table', order_by=['column_one', 'id'], order_by_sort=['desc', 'asc'], page_size=2, where=('id', '>', 1))]
+    assert pages == [[3, 2], [5, 7], [4, 6], []] # the last full page is followed by an empty page
+
+def test_paginate_cursor(paged):
+    df, cursor = next(paged.paginate('test_table', page_size=2))
+    assert decode_cursor(cursor) == {'id': 2}
+    df, cursor = next(paged.paginate('test_table', page_size=2, cursor=cursor))
+    assert df['id'].tolist() == [3, 4]
+
+def test_select_after(paged):
+    df = paged.select('test_table', order_by=['column_one', 'id'], after={'column_one': 'a', 'id': 4}, limit=2)
+    assert df['id'].tolist() == [6, 2]
@@ -0,0 +1,37 @@
+import pytest
+import sqlalchemy
+
+from msdss_base_database.tools import get_pool_kwargs
+
+from conftest import make_database, make_table
+
+def test_get_pool_kwargs():
+    assert get_pool_kwargs('default', load_env=False) == {}
+    assert get_pool_kwargs('small', load_env=False)['pool_size'] == 2
+    assert get_pool_kwargs('large', load_env=False, pool_size=10)['pool_size'] == 10
+    assert get_pool_kwargs(dict(pool_size=3), load_env=False) == dict(pool_size=3)
+
+def test_get_pool_kwargs_unsupported():
+    with pytest.raises(ValueError):
+        get_pool_kwargs('unknown', load_env=False)
+
+def test_pool_stats(db):
+    db.select('test_table')
+    stats = db.pool_stats()
+    assert stats['pool'] == 'NullPool'
+    assert stats['waits'] > 0
+    assert stats['checkouts'] == stats['checkins']
+    assert stats['checked_out'] == 0
+    assert stats['wait_seconds_mean'] is not None
+    assert 'replicas' not in stats
+
+def test_queue_pool(tmp_path):
+    db = make_database(tmp_path / 'test.db', pool='small', poolclass=sqlalchemy.pool.QueuePool)
+    make_table(db)
+    with db._connect():
+        stats = db.pool_stats()
+        assert stats['pool'] == 'QueuePool'
+        assert stats['size'] == 2
+        assert stats['checked_out'] == 1
+    assert db.pool_stats()['idle'] == 1
+    db.dispose()
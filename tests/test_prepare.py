@@ -0,0 +1,28 @@
+import pytest
+
+from msdss_base_database import Param
+
+def test_prepare_lookup(db):
+    lookup = db.prepare('test_table', select=['id', 'column_one'], where=[('id', '=', Param('id'))])
+    assert [lookup(id=i)['column_one'].tolist() for i in (1, 3, 5)] == [['a'], ['c'], []]
+
+def test_prepare_fixed_and_limit(db):
+    top = db.prepare('test_table', where=[('column_two', '>', 2)], order_by='column_two', order_by_sort='desc', limit=Param('n'), output='rows')
+    assert [r[0] for r in top(n=1)] == [3]
+    assert [r[0] for r in top(n=5)] == [3, 2]
+
+def test_prepare_missing_param(db):
+    lookup = db.prepare('test_table', where=[('id', '=', Param('id'))])
+    with pytest.raises((KeyError, ValueError)):
+        lookup()
+
+def test_prepare_having(db):
+    db.insert('test_table', {'id': [4, 5], 'column_one': ['a', 'a'], 'column_two': [8, 8]})
+    query = db.prepare('test_table', select='column_one', group_by='column_one', aggregate={'*': 'count'}, having=[('count', '>=', Param('n'))], order_by='column_one')
+    assert query(n=3)['column_one'].tolist() == ['a']
+    assert query(n=1)['column_one'].tolist() == ['a', 'b', 'c']
+
+def test_prepare_reads_writes(db):
+    lookup = db.prepare('test_table', where=[('id', '=', Param('id'))])
+    db.update('test_table', where=('id', '=', 1), values={'column_one': 'AA'})
+    assert lookup(id=1)['column_one'].tolist() == ['AA']
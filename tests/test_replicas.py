@@ -0,0 +1,81 @@
+import time
+
+import pytest
+import sqlalchemy
+
+from conftest import make_database
+
+@pytest.fixture
+def urls(tmp_path):
+    out = []
+    for name in ['r1', 'r2']:
+        url = 'sqlite:///' + str(tmp_path / (name + '.db'))
+        engine = sqlalchemy.create_engine(url)
+        with engine.begin() as connection:
+            connection.exec_driver_sql('CREATE TABLE test_table (id INTEGER PRIMARY KEY, column_one VARCHAR, column_two INTEGER)')
+            connection.exec_driver_sql("INSERT INTO test_table VALUES (1, '" + name + "', 0)")
+        engine.dispose()
+        out.append(url)
+    return out
+
+@pytest.fixture
+def replicated(db, urls, tmp_path):
+    out = make_database(tmp_path / 'test.db', replicas=urls)
+    yield out
+    out.dispose()
+
+def test_reads_from_replicas(replicated):
+    values = replicated.select('test_table')['column_one'].tolist() + replicated.select('test_table')['column_one'].tolist()
+    assert sorted(values) == ['r1', 'r2']
+    assert [r['reads'] for r in replicated.pool_stats()['replicas']] == [1, 1]
+
+def test_writes_to_primary(replicated):
+    replicated.insert('test_table', [dict(id=4, column_one='d', column_two=8)])
+    assert replicated.rows('test_table') == 1
+    with replicated.transaction():
+        assert replicated.rows('test_table') == 4
+
+def test_waits_per_engine(replicated):
+    replicated._get_table('test_table') # reflect the table on the primary first
+    primary = replicated.pool_stats()['waits']
+    replicated.select('test_table')
+    replicated.select('test_table')
+    stats = replicated.pool_stats()
+    assert stats['waits'] == primary
+    assert [r['waits'] for r in stats['replicas']] == [1, 1]
+    assert all(r['wait_seconds_mean'] is not None for r in stats['replicas'])
+    replicated.insert('test_table', [dict(id=4, column_one='d', column_two=8)])
+    assert replicated.pool_stats()['waits'] == primary + 1
+
+def test_read_your_writes(db, urls, tmp_path):
+    pinned = make_database(tmp_path / 'test.db', replicas=urls[:1], read_your_writes=0.3)
+    assert pinned.rows('test_table') == 1
+    pinned.update('test_table', where=('id', '=', 1), values={'column_two': 20})
+    assert pinned.rows('test_table') == 3
+    time.sleep(0.35)
+    assert pinned.rows('test_table') == 1
+    pinned.dispose()
+
+def test_least_loaded(db, urls, tmp_path):
+    balanced = make_database(tmp_path / 'test.db', replicas=urls, replica_balance='least_loaded')
+    with balanced._connect(read=True):
+        with balanced._connect(read=True):
+            assert [c['in_flight'] for c in balanced._replica_counters] == [1, 1]
+    assert [c['in_flight'] for c in balanced._replica_counters] == [0, 0]
+    balanced.dispose()
+
+def test_failing_replica(db, tmp_path):
+    failing = make_database(tmp_path / 'test.db', replicas=['sqlite:///' + str(tmp_path / 'missing' / 'r.db')])
+    failing._get_table('test_table')
+    waits = failing.pool_stats()['waits']
+    assert failing.rows('test_table') == 3
+    stats = failing.pool_stats()
+    assert stats['replicas'][0]['errors'] == 1
+    assert stats['replicas'][0]['in_flight'] == 0
+    assert stats['replicas'][0]['waits'] == 0
+    assert stats['waits'] == waits + 1
+    failing.dispose()
+
+def test_unsupported_balance(tmp_path):
+    with pytest.raises(ValueError):
+        make_database(tmp_path / 'test.db', replica_balance='unknown')
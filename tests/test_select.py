@@ -0,0 +1,36 @@
+import pytest
+
+def test_select_iter_chunks(db):
+    chunks = list(db.select_iter('test_table', chunksize=2, order_by='id'))
+    assert [len(c) for c in chunks] == [2, 1]
+    assert chunks[1]['id'].tolist() == [3]
+
+def test_select_iter_rows(db):
+    chunks = list(db.select_iter('test_table', chunksize=2, output='rows', where=('id', '>', 1), order_by='id'))
+    assert [[r.id for r in c] for c in chunks] == [[2, 3]]
+
+def test_select_iter_dtypes(db):
+    chunks = list(db.select_iter('test_table', chunksize=2, dtypes='schema'))
+    assert all(str(c['column_two'].dtype) == 'Int64' for c in chunks)
+
+def test_select_iter_arrow(db):
+    batches = list(db.select_iter('test_table', chunksize=2, output='arrow'))
+    assert sum(b.num_rows for b in batches) == 3
+
+def test_select_iter_empty(db):
+    assert list(db.select_iter('test_table', where=('id', '>', 10))) == []
+
+@pytest.mark.parametrize('method', ['select', 'select_iter', 'select_in'])
+def test_output_checked_before_query(db, method):
+    with pytest.raises(ValueError, match='not supported'):
+        if method == 'select':
+            db.select('missing_table', output='unknown')
+        elif method == 'select_iter':
+            next(db.select_iter('missing_table', output='unknown'))
+        else:
+            db.select_in('missing_table', 'id', [1], output='unknown')
+
+def test_select_arrow(db):
+    table = db.select('test_table', output='arrow')
+    assert table.num_rows == 3
+    assert table.column_names == ['id', 'column_one', 'column_two']
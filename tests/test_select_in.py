@@ -0,0 +1,26 @@
+import pytest
+
+@pytest.mark.parametrize('method', ['in', 'staged'])
+def test_select_in(db, method):
+    df = db.select_in('test_table', 'id', [3, 1, 5], method=method, order_by='id')
+    assert df['id'].tolist() == [1, 3]
+
+def test_select_in_batches(db):
+    df = db.select_in('test_table', 'id', [1, 2, 3], method='in', batch_size=1, order_by='id', order_by_sort='desc')
+    assert df['id'].tolist() == [3, 2, 1]
+
+def test_select_in_where(db):
+    df = db.select_in('test_table', 'id', [1, 2, 3], where=('column_two', '>', 2), order_by='id')
+    assert df['id'].tolist() == [2, 3]
+
+def test_select_in_empty(db):
+    assert len(db.select_in('test_table', 'id', [])) == 0
+
+def test_select_in_staged_dropped(db):
+    db.select_in('test_table', 'id', [1], method='staged')
+    with db._connect() as connection:
+        assert connection.exec_driver_sql("SELECT count(*) FROM sqlite_temp_master WHERE type = 'table'").scalar() == 0
+
+def test_select_in_unsupported(db):
+    with pytest.raises(ValueError):
+        db.select_in('test_table', 'id', [1], method='unknown')
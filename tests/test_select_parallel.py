@@ -0,0 +1,36 @@
+import pytest
+
+from conftest import make_database
+
+@pytest.fixture
+def signed(tmp_path):
+    out = make_database(tmp_path / 'test.db')
+    out.create_table('t', [dict(name='id', type_='Integer', primary_key=True), ('v', 'Integer')])
+    ids = list(range(-7, 8))
+    out.insert('t', {'id': ids, 'v': [i * 2 for i in ids]})
+    yield out
+    out.dispose()
+
+@pytest.mark.parametrize('method', ['range', 'modulo'])
+def test_select_parallel_all_rows(signed, method):
+    df = signed.select_parallel('t', partition_column='id', partitions=4, method=method, order_by='id')
+    assert sorted(df['id']) == list(range(-7, 8))
+
+def test_modulo_partitions_negative_keys(signed):
+    partitions = signed._get_partitions('t', 'id', partitions=4, method='modulo')
+    ids = [i for p in partitions for i in signed.select('t', partition=p)['id']]
+    assert sorted(ids) == list(range(-7, 8))
+    assert list(signed.select('t', partition=partitions[1], order_by='id')['id']) == [-7, -3, 1, 5]
+
+def test_select_parallel_stream(signed):
+    results = list(signed.select_parallel('t', partition_column='id', partitions=3, stream=True))
+    assert len(results) == 3
+    assert sum(len(r) for r in results) == 15
+
+def test_select_parallel_where(signed):
+    df = signed.select_parallel('t', partition_column='id', partitions=3, where=('v', '>', 0), order_by='id')
+    assert list(df['id']) == list(range(1, 8))
+
+def test_modulo_requires_integer(db):
+    with pytest.raises(ValueError):
+        db._get_partitions('test_table', 'column_one', partitions=2, method='modulo')
@@ -0,0 +1,75 @@
+import pytest
+
+from msdss_base_database import ShardedDatabase
+
+from conftest import make_database
+
+@pytest.fixture(params=['hash', 'range'])
+def sharded(request, tmp_path):
+    shards = [make_database(tmp_path / ('shard_' + str(i) + '.db')) for i in range(3)]
+    ranges = [4, 8] if request.param == 'range' else None
+    out = ShardedDatabase(shards, method=request.param, ranges=ranges)
+    columns = [
+        dict(name='id', type_='Integer', primary_key=True),
+        ('g', 'String'),
+        ('v', 'Integer')
+    ]
+    out.create_table('t', columns)
+    out.insert('t', {'id': list(range(12)), 'g': ['a', 'b', 'c'] * 4, 'v': [i * 2 for i in range(12)]})
+    yield out
+    for shard in shards:
+        shard.dispose()
+
+def test_insert_splits_rows(sharded):
+    counts = [shard.rows('t') for shard in sharded.shards]
+    assert sum(counts) == 12
+    assert sharded.rows('t') == 12
+    for i, shard in enumerate(sharded.shards):
+        assert all(sharded._get_shard(k) == i for k in shard.select('t')['id'])
+
+def test_select_order_limit_offset(sharded):
+    df = sharded.select('t', order_by='v', order_by_sort='desc', limit=3, offset=1)
+    assert list(df['id']) == [10, 9, 8]
+
+def test_select_routes_equal_key(sharded):
+    assert sharded._get_shards('t', where=('id', '=', 5)) == [sharded._get_shard(5)]
+    assert list(sharded.select('t', where=('id', '=', 5))['v']) == [10]
+
+def test_select_aggregates(sharded):
+    df = sharded.select('t', select='g', group_by='g', aggregate={'v': ['sum', 'min', 'max'], '*': 'count'}, order_by='g')
+    assert list(df['v_sum']) == [36, 44, 52]
+    assert list(df['v_min']) == [0, 2, 4]
+    assert list(df['v_max']) == [18, 20, 22]
+    assert list(df['count']) == [4, 4, 4]
+
+def test_select_having_after_merge(sharded):
+    df = sharded.select('t', select='g', group_by='g', aggregate='v', aggregate_func='sum', having=[('v_sum', '>', 40)], order_by='g')
+    assert list(df['g']) == ['b', 'c']
+
+def test_select_unsupported(sharded):
+    with pytest.raises(ValueError):
+        sharded.select('t', aggregate='v', aggregate_func='avg')
+    with pytest.raises(ValueError):
+        sharded.select('t', window=dict(func='sum', column='v', order_by='id'))
+
+def test_update_or(sharded):
+    sharded.update('t', where=[('id', '=', 1), ('id', '=', 10)], values={'g': 'z'}, where_boolean='OR')
+    assert sorted(sharded.select('t', where=('g', '=', 'z'))['id']) == [1, 10]
+
+def test_update_shard_key(sharded):
+    with pytest.raises(ValueError):
+        sharded.update('t', where=('id', '=', 1), values={'id': 100})
+
+def test_delete(sharded):
+    sharded.delete('t', where=[('id', '<', 2), ('id', '>', 10)], where_boolean='OR')
+    assert sharded.rows('t') == 9
+
+def test_range_shards(tmp_path):
+    shards = [make_database(tmp_path / ('shard_' + str(i) + '.db')) for i in range(3)]
+    db = ShardedDatabase(shards, method='range', ranges=[4, 8])
+    assert db._get_shards('t', where=('id', '>=', 8)) == [2]
+    assert db._get_shards('t', where=('id', '<', 4)) == [0]
+    assert db._get_shards('t', where=('id', '<=', 4)) == [0, 1]
+    assert db._get_shards('t', where=[('id', '<', 4), ('id', '>', 8)], where_boolean='OR') == [0, 1, 2]
+    with pytest.raises(ValueError):
+        ShardedDatabase(shards, method='range', ranges=[4])
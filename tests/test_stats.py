@@ -0,0 +1,65 @@
+import logging
+
+import pytest
+
+from msdss_base_database.stats import QueryStats
+
+from conftest import make_database, make_table
+
+@pytest.fixture
+def stats_db(tmp_path):
+    out = make_database(tmp_path / 'test.db', stats=True, slow_query_threshold=0, slow_query_log=str(tmp_path / 'slow.log'))
+    make_table(out)
+    yield out
+    out.dispose()
+
+def test_stats_off_by_default(db):
+    assert db._stats is None
+    with pytest.raises(ValueError):
+        db.query_stats()
+    with pytest.raises(ValueError):
+        db.add_query_hook(print)
+
+def test_query_stats(stats_db):
+    stats_db.select('test_table')
+    summary = stats_db.query_stats()
+    assert summary[('test_table', 'select')]['count'] == 1
+    assert summary[('test_table', 'insert')]['rows'] == 3
+    record = stats_db.query_stats(history=True)[-1]
+    assert record['operation'] == 'select' and record['rows'] == 3 and not record['error']
+    stats_db.reset_query_stats()
+    assert stats_db.query_stats() == {}
+
+def test_slow_query_log(stats_db, tmp_path):
+    stats_db.select('test_table')
+    assert len((tmp_path / 'slow.log').read_text().splitlines()) >= 2
+
+def test_hooks(stats_db):
+    records = []
+    stats_db.add_query_hook(records.append)
+    stats_db.select('test_table')
+    stats_db.remove_query_hook(records.append)
+    stats_db.select('test_table')
+    assert [r['operation'] for r in records] == ['select']
+
+def test_hook_error_logged(stats_db, caplog):
+    def hook(record):
+        raise RuntimeError('hook failed')
+    stats_db.add_query_hook(hook)
+    with caplog.at_level(logging.ERROR, logger='msdss_base_database.stats'):
+        df = stats_db.select('test_table')
+    assert len(df) == 3
+    assert 'hook failed' in caplog.text
+
+def test_error_recorded(stats_db):
+    with pytest.raises(Exception):
+        stats_db.insert('test_table', {'id': [1], 'column_one': ['a'], 'column_two': [1]})
+    assert stats_db.query_stats()[('test_table', 'insert')]['errors'] == 1
+
+def test_histogram():
+    stats = QueryStats(buckets=[0.01, 0.1])
+    for total in (0.005, 0.05, 0.5):
+        stats.record(dict(table='t', operation='select', total=total))
+    summary = stats.summary()[('t', 'select')]
+    assert summary['histogram'] == {0.01: 1, 0.1: 1, float('inf'): 1}
+    assert summary['total_min'] == 0.005 and summary['total_max'] == 0.5
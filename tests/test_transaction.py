@@ -0,0 +1,35 @@
+import pytest
+
+def test_commit(db):
+    with db.transaction() as tx:
+        for i in range(4, 8):
+            tx.insert('test_table', [dict(id=i, column_one=str(i), column_two=i)])
+        tx.update('test_table', where=('id', '>', 5), values={'column_one': 'AA'})
+        assert tx.rows('test_table') == 7
+    assert db.rows('test_table') == 7
+    assert db.select('test_table', where=('column_one', '=', 'AA'))['id'].tolist() == [6, 7]
+
+def test_rollback(db):
+    with pytest.raises(RuntimeError):
+        with db.transaction() as tx:
+            tx.insert('test_table', [dict(id=4, column_one='d', column_two=8)])
+            raise RuntimeError('failed')
+    assert db.rows('test_table') == 3
+
+def test_nested_rollback(db):
+    with db.transaction() as tx:
+        tx.insert('test_table', [dict(id=4, column_one='d', column_two=8)])
+        with pytest.raises(ValueError):
+            with tx.transaction():
+                tx.delete('test_table', where=('id', '<', 4))
+                raise ValueError('undo')
+        assert tx.rows('test_table') == 4
+    assert db.rows('test_table') == 4
+
+def test_one_connection(db):
+    waits = db.pool_stats()['waits']
+    with db.transaction() as tx:
+        tx.insert('test_table', [dict(id=4, column_one='d', column_two=8)])
+        tx.select('test_table')
+        tx.delete('test_table', where=('id', '=', 4))
+    assert db.pool_stats()['waits'] == waits + 1